@@ -33,16 +33,25 @@ def create_app():
     load_dotenv(os.path.join(base_dir, '.env'))
     app.config.from_object("config.Config")
 
+    # Connection pool settings; SQLite PRAGMAs are applied per connection below
+    from . import perf, sqlite_profile
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = sqlite_profile.engine_options(app.config)
+
     # Extensions
+    from .search import include_object
     db.init_app(app)
-    migrate.init_app(app, db)
+    migrate.init_app(app, db, include_object=include_object)
+    with app.app_context():
+        sqlite_profile.install(db.engine, app.config)
+        perf.init_app(app, db.engine)
     login_manager.init_app(app)
+    from . import user_cache  # registers the User listeners that invalidate cached logins
     
     # Initialize mail only if available
     if mail:
         mail.init_app(app)
 
-    # Safety: ensure maintenance approval columns exist for SQLite deployments
+    # Safety: ensure maintenance approval columns, the user-employee link, newer tables, hot-path indexes, the search index and the expiry calendar exist for SQLite deployments
     with app.app_context():
         try:
             engine = db.get_engine()
@@ -59,6 +68,23 @@ def create_app():
                         to_add.append("ALTER TABLE maintenance ADD COLUMN approved_at DATETIME")
                     for stmt in to_add:
                         conn.exec_driver_sql(stmt)
+                    user_cols = [r[1] for r in conn.exec_driver_sql('PRAGMA table_info(user)').fetchall()]
+                    if 'employee_id' not in user_cols:
+                        conn.exec_driver_sql("ALTER TABLE user ADD COLUMN employee_id INTEGER REFERENCES employee(id)")
+                from .models import KpiSnapshot, ExportJob, SchedulerLease, IdCounter, ExpiryEvent, NotificationDelivery, Asset, SoftwareLicense, Maintenance, User
+                for model in (KpiSnapshot, ExportJob, SchedulerLease, IdCounter, ExpiryEvent, NotificationDelivery):
+                    model.__table__.create(bind=engine, checkfirst=True)
+                with engine.begin() as conn:
+                    job_cols = [r[1] for r in conn.exec_driver_sql('PRAGMA table_info(export_job)').fetchall()]
+                    if 'heartbeat_at' not in job_cols:
+                        conn.exec_driver_sql("ALTER TABLE export_job ADD COLUMN heartbeat_at DATETIME")
+                for model in (Asset, SoftwareLicense, Maintenance, User):
+                    for index in model.__table__.indexes:
+                        index.create(bind=engine, checkfirst=True)
+                from . import expiries, search
+                with engine.begin() as conn:
+                    search.ensure_index(conn)
+                    expiries.ensure_index(conn)
         except Exception:
             # Non-fatal: migrations are still the canonical path
             pass
@@ -73,6 +99,10 @@ def create_app():
     # Blueprint registration
     from .routes import main as main_bp
     app.register_blueprint(main_bp)
+
+    # CLI commands
+    from .cli import register as register_cli
+    register_cli(app)
     
     def format_ghs(value):
         try:
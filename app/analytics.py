@@ -0,0 +1,58 @@
+from datetime import MAXYEAR, MINYEAR, date
+
+from sqlalchemy import extract, func
+
+from . import db
+from .models import Maintenance
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def maintenance_cost_years():
+    """Years that have dated maintenance records, newest first."""
+    year = extract('year', Maintenance.date)
+    rows = (
+        db.session.query(year)
+        .filter(Maintenance.date.isnot(None))
+        .distinct()
+        .order_by(year.desc())
+        .all()
+    )
+    return [int(y) for (y,) in rows if y is not None]
+
+
+def monthly_maintenance_costs(year):
+    """Total maintenance cost per month of ``year`` as a 12-item list (Jan..Dec).
+
+    One GROUP BY query; only the per-month sums leave the database. The year is
+    matched as a date range so ``ix_maintenance_date`` can be used.
+    """
+    if not MINYEAR <= year < MAXYEAR:
+        return [0] * 12
+    month = extract('month', Maintenance.date)
+    rows = (
+        db.session.query(month, func.coalesce(func.sum(Maintenance.cost), 0))
+        .filter(Maintenance.date >= date(year, 1, 1), Maintenance.date < date(year + 1, 1, 1))
+        .group_by(month)
+        .all()
+    )
+    costs = [0] * 12
+    for m, total in rows:
+        if m:
+            costs[int(m) - 1] = float(total or 0)
+    return costs
+
+
+def selected_cost_year(value, years):
+    """Resolve the ``?year=`` selector, defaulting to the latest year with data.
+
+    Years without data (other than the current one) fall back to the default.
+    """
+    default = years[0] if years else date.today().year
+    try:
+        year = int(value)
+    except (TypeError, ValueError):
+        return default
+    if year not in years and year != date.today().year:
+        return default
+    return year
@@ -0,0 +1,124 @@
+"""Asset tag allocation (``AST-00042``, ``LAP-00007``, ...).
+
+Tags come from per-prefix counters in the ``id_counter`` table instead of the
+asset's primary key, so an asset is written once and the tag is known before
+the INSERT. Each process reserves a block of ``ASSET_ID_BLOCK_SIZE`` numbers
+with a single atomic ``UPDATE ... SET last_value = last_value + n`` and hands
+them out from memory; bulk paths reserve exactly what they need in one go.
+Numbers left in a block when a process exits are skipped, so tags are unique
+and increasing per process but may have gaps.
+
+The prefix is chosen by asset type from ``ASSET_ID_PREFIXES`` (e.g.
+``"Laptop:LAP,Monitor:MON"``), falling back to ``ASSET_ID_PREFIX``. A new
+counter starts after the highest existing tag with its prefix.
+"""
+import threading
+from collections import Counter
+
+from flask import current_app
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from . import db
+from .models import Asset, IdCounter
+
+_table = IdCounter.__table__
+
+
+def _prefix_map(config):
+    mapping = {}
+    for item in (config.get("ASSET_ID_PREFIXES") or "").split(","):
+        asset_type, _, prefix = item.partition(":")
+        if asset_type.strip() and prefix.strip():
+            mapping[asset_type.strip().lower()] = prefix.strip()
+    return mapping
+
+
+def _highest_existing(conn, prefix):
+    """Largest numeric suffix among existing ``<prefix>-<n>`` tags (read once, when seeding)."""
+    suffixes = conn.execute(
+        select(func.substr(Asset.asset_id, len(prefix) + 2)).where(Asset.asset_id.like(f"{prefix}-%"))
+    ).scalars()
+    return max((int(value) for value in suffixes if value and value.isdigit()), default=0)
+
+
+def reserve(prefix, count):
+    """Atomically take ``count`` numbers for ``prefix``; returns ``range`` of them."""
+    name = f"asset:{prefix}"
+    for _ in range(3):
+        with db.engine.begin() as conn:
+            stmt = _table.update().where(_table.c.name == name).values(last_value=_table.c.last_value + count)
+            if conn.dialect.update_returning:
+                last = conn.execute(stmt.returning(_table.c.last_value)).scalar()
+            elif conn.execute(stmt).rowcount:
+                # Same transaction, so the row is still locked against other writers
+                last = conn.execute(select(_table.c.last_value).where(_table.c.name == name)).scalar()
+            else:
+                last = None
+            if last is not None:
+                return range(last - count + 1, last + 1)
+        # First use of this prefix: seed the counter past existing tags
+        try:
+            with db.engine.begin() as conn:
+                start = _highest_existing(conn, prefix)
+                conn.execute(_table.insert().values(name=name, last_value=start + count))
+            return range(start + 1, start + count + 1)
+        except IntegrityError:
+            # Another process created it first; retry the UPDATE
+            continue
+    raise RuntimeError(f"Could not reserve asset ids for prefix {prefix}")
+
+
+class AssetIdAllocator:
+    """Per-process allocator: hands out tags from reserved blocks, one prefix at a time."""
+
+    def __init__(self, config):
+        self.default_prefix = config.get("ASSET_ID_PREFIX", "AST")
+        self.digits = config.get("ASSET_ID_DIGITS", 5)
+        self.block_size = max(1, config.get("ASSET_ID_BLOCK_SIZE", 20))
+        self.prefixes = _prefix_map(config)
+        self._blocks = {}
+        self._lock = threading.Lock()
+
+    def prefix_for(self, asset_type):
+        return self.prefixes.get((asset_type or "").strip().lower(), self.default_prefix)
+
+    def format(self, prefix, number):
+        return f"{prefix}-{number:0{self.digits}d}"
+
+    def next(self, asset_type=None):
+        """One new tag for an asset of ``asset_type``."""
+        prefix = self.prefix_for(asset_type)
+        with self._lock:
+            number = next(self._blocks.get(prefix, iter(())), None)
+            if number is None:
+                block = iter(reserve(prefix, self.block_size))
+                self._blocks[prefix] = block
+                number = next(block)
+        return self.format(prefix, number)
+
+    def many(self, asset_types):
+        """Tags for a list of asset types, in order, with one reservation per prefix."""
+        wanted = [self.prefix_for(t) for t in asset_types]
+        numbers = {prefix: iter(reserve(prefix, count)) for prefix, count in Counter(wanted).items()}
+        return [self.format(prefix, next(numbers[prefix])) for prefix in wanted]
+
+
+def allocator():
+    """The allocator for the current app (created on first use)."""
+    ext = current_app.extensions
+    if "asset_ids" not in ext:
+        ext["asset_ids"] = AssetIdAllocator(current_app.config)
+    return ext["asset_ids"]
+
+
+def next_asset_id(asset_type=None):
+    """A new tag for one asset, skipping any that was already typed in by hand."""
+    while True:
+        tag = allocator().next(asset_type)
+        if db.session.query(Asset.id).filter_by(asset_id=tag).first() is None:
+            return tag
+
+
+def asset_ids_for(asset_types):
+    return allocator().many(asset_types)
@@ -0,0 +1,218 @@
+"""Micro-benchmarks for the hot request paths.
+
+Each case is one GET through the Flask test client: the dashboards, the list
+pages, every CSV/Excel export and the two notification runs. A case is timed
+from request to the last byte of the body (streamed exports included), after
+``warmup`` untimed calls, and reported as min/median/p95/max over ``repeat``
+runs together with the SQL statement count from the ``Server-Timing`` header
+(switched on for the run) when :mod:`app.perf` is enabled (for streamed exports that only covers the
+statements issued before the body starts).
+
+Requests run as a dedicated Admin user (every route allows Admin) whose
+session is set directly, so login hashing is not part of any timing. The user
+has no usable password and is deleted again when the run ends. Mail is
+suppressed for the notification cases, which pass ``resend=1`` so every run
+still queries, renders and queues every message instead of the delivery
+ledger skipping them; with mail suppressed the ledger records nothing.
+``run`` returns a plain dict that is written as JSON; ``compare`` lines two
+such results up so runs can be compared between commits.
+"""
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from . import db, kpis
+from .exports import OPENPYXL_AVAILABLE
+from .models import User
+
+BENCH_USER = "bench-admin"
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    path: str
+    group: str
+    needs: str | None = None  # "openpyxl" or "mail"
+
+
+CASES = [
+    Case("dashboard.admin", "/admin/dashboard", "dashboards"),
+    Case("dashboard.it", "/it/dashboard", "dashboards"),
+    Case("dashboard.manager", "/manager/dashboard", "dashboards"),
+    Case("dashboard.employee", "/employee/dashboard", "dashboards"),
+    Case("reports", "/reports", "dashboards"),
+    Case("notifications.center", "/notifications", "dashboards"),
+    Case("list.assets", "/assets", "lists"),
+    Case("list.assets.filtered", "/assets?status=In+Use&asset_type=Laptop", "lists"),
+    Case("api.assets", "/api/assets", "lists"),
+    Case("list.employees", "/employees", "lists"),
+    Case("list.maintenance", "/maintenance", "lists"),
+    Case("list.licenses", "/licenses", "lists"),
+    Case("search", "/search?q=dell", "lists"),
+    Case("export.assets.csv", "/export/assets/csv", "exports"),
+    Case("export.employees.csv", "/export/employees/csv", "exports"),
+    Case("export.maintenance.csv", "/export/maintenance/csv", "exports"),
+    Case("export.licenses.csv", "/export/licenses/csv", "exports"),
+    Case("export.assets.excel", "/export/assets/excel", "exports", "openpyxl"),
+    Case("export.employees.excel", "/export/employees/excel", "exports", "openpyxl"),
+    Case("export.maintenance.excel", "/export/maintenance/excel", "exports", "openpyxl"),
+    Case("export.licenses.excel", "/export/licenses/excel", "exports", "openpyxl"),
+    Case("export.all.excel", "/export/all/excel", "exports", "openpyxl"),
+    Case("notify.licenses", "/notifications/test-license?resend=1", "notifications", "mail"),
+    Case("notify.warranties", "/notifications/test-warranty?resend=1", "notifications", "mail"),
+]
+GROUPS = sorted({case.group for case in CASES})
+
+
+def _percentile(sorted_values, pct):
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _bench_user():
+    user = User.query.filter_by(username=BENCH_USER).first()
+    if user is None:
+        user = User(username=BENCH_USER, email=f"{BENCH_USER}@example.invalid", role="Admin")
+        # Never used to log in: the session is set directly
+        user.password_hash = "!"
+        db.session.add(user)
+        db.session.commit()
+    return user.id
+
+
+def _drop_bench_user(user_id):
+    user = db.session.get(User, user_id)
+    # Only the account _bench_user made; a real user who took the name is left alone
+    if user is not None and user.password_hash == "!":
+        db.session.delete(user)
+        db.session.commit()
+
+
+def _dataset_counts():
+    snapshot = kpis.snapshot()
+    return {
+        "assets": snapshot.count(kpis.ASSETS_TOTAL),
+        "employees": snapshot.count(kpis.EMPLOYEES_TOTAL),
+        "licenses": snapshot.count(kpis.LICENSES_TOTAL),
+        "maintenance": snapshot.count(kpis.MAINTENANCE_TOTAL),
+    }
+
+
+def _skip_reason(app, case):
+    if case.needs == "openpyxl" and not OPENPYXL_AVAILABLE:
+        return "openpyxl not installed"
+    if case.needs == "mail" and "mail" not in app.extensions:
+        return "Flask-Mail not installed"
+    return None
+
+
+def _timed_get(client, path):
+    start = time.perf_counter()
+    response = client.get(path)
+    size = len(response.get_data())
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    timing = response.headers.get("Server-Timing", "")
+    response.close()
+    return elapsed_ms, response.status_code, size, timing
+
+
+def _sql_count(server_timing):
+    # db;dur=1.2;desc="7 queries"
+    marker = 'desc="'
+    at = server_timing.find(marker)
+    if at < 0:
+        return None
+    return int(server_timing[at + len(marker):].split(" ", 1)[0])
+
+
+def run(app, repeat=5, warmup=1, groups=None, progress=None):
+    """Time every case (optionally only ``groups``) and return the results dict."""
+    progress = progress or (lambda case, row: None)
+    with app.app_context():
+        user_id = _bench_user()
+        counts = _dataset_counts()
+        database = db.engine.url.render_as_string(hide_password=True)
+    mail_state = app.extensions.get("mail")
+    suppress = getattr(mail_state, "suppress", None)
+    if mail_state is not None:
+        mail_state.suppress = True
+    server_timing = app.config.get("PERF_SERVER_TIMING", False)
+    app.config["PERF_SERVER_TIMING"] = True
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user_id)
+        session["_fresh"] = True
+
+    results = []
+    try:
+        for case in CASES:
+            if groups and case.group not in groups:
+                continue
+            row = {"name": case.name, "group": case.group, "path": case.path}
+            reason = _skip_reason(app, case)
+            if reason:
+                row["skipped"] = reason
+            else:
+                for _ in range(warmup):
+                    _timed_get(client, case.path)
+                runs, status, size, timing = [], None, 0, ""
+                for _ in range(repeat):
+                    elapsed_ms, status, size, timing = _timed_get(client, case.path)
+                    runs.append(elapsed_ms)
+                ordered = sorted(runs)
+                row.update({
+                    "status": status,
+                    "bytes": size,
+                    "sql_count": _sql_count(timing),
+                    "runs_ms": [round(ms, 2) for ms in runs],
+                    "min_ms": round(ordered[0], 2),
+                    "median_ms": round(statistics.median(ordered), 2),
+                    "p95_ms": round(_percentile(ordered, 95), 2),
+                    "max_ms": round(ordered[-1], 2),
+                })
+            results.append(row)
+            progress(case, row)
+    finally:
+        if mail_state is not None:
+            mail_state.suppress = suppress
+        app.config["PERF_SERVER_TIMING"] = server_timing
+        with app.app_context():
+            _drop_bench_user(user_id)
+
+    return {
+        "revision": _git_revision(),
+        "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "database": database,
+        "dataset": counts,
+        "repeat": repeat,
+        "warmup": warmup,
+        "cases": results,
+    }
+
+
+def compare(current, baseline):
+    """``(name, baseline_median, current_median, change_pct)`` for cases timed in both runs."""
+    before = {row["name"]: row for row in baseline.get("cases", []) if "median_ms" in row}
+    rows = []
+    for row in current.get("cases", []):
+        old = before.get(row["name"])
+        if old is None or "median_ms" not in row:
+            continue
+        change = (row["median_ms"] - old["median_ms"]) / old["median_ms"] * 100 if old["median_ms"] else 0.0
+        rows.append((row["name"], old["median_ms"], row["median_ms"], round(change, 1)))
+    return rows
@@ -0,0 +1,87 @@
+"""Bulk actions (reassign, status change, retire) on assets picked by id or by the list filters."""
+from dataclasses import dataclass
+
+from sqlalchemy import and_, func, or_, select, update
+
+from . import db, employee_dashboard, kpis
+from .models import Asset, Employee
+from .queries import asset_filter_clauses, parse_int
+
+ACTIONS = ("reassign", "status", "retire")
+RETIRED_STATUS = "Retired"
+# Stay well under SQLite's bound-parameter limit for IN (...) lists
+ID_CHUNK = 900
+
+
+class BulkActionError(ValueError):
+    """Raised for a bulk request that cannot be applied."""
+
+
+@dataclass
+class BulkResult:
+    action: str
+    matched: int = 0
+    updated: int = 0
+
+
+def _chunks(ids):
+    for start in range(0, len(ids), ID_CHUNK):
+        yield ids[start:start + ID_CHUNK]
+
+
+def _changes(action, status=None, assigned_to=None):
+    """``{column: value}`` to set for ``action``."""
+    if action == "status":
+        status = (status or "").strip()
+        if not status:
+            raise BulkActionError("Enter the new status")
+        if len(status) > 50:
+            raise BulkActionError("Status is longer than 50 characters")
+        return {"status": status}
+    if action == "reassign":
+        if assigned_to in (None, "", "none"):
+            return {"assigned_to": None}
+        emp_id = parse_int(assigned_to)
+        if emp_id is None or db.session.get(Employee, emp_id) is None:
+            raise BulkActionError("Choose an existing employee")
+        return {"assigned_to": emp_id}
+    if action == "retire":
+        return {"status": RETIRED_STATUS, "assigned_to": None}
+    raise BulkActionError(f"Unknown bulk action: {action}")
+
+
+def _differs(changes):
+    """Match only rows where at least one target column would change."""
+    return or_(*[getattr(Asset, column).is_distinct_from(value) for column, value in changes.items()])
+
+
+def apply(action, ids=None, filters=None, status=None, assigned_to=None):
+    """Run ``action`` on the assets in ``ids`` (when given) or else matching ``filters``; one commit."""
+    changes = _changes(action, status=status, assigned_to=assigned_to)
+    if ids is not None:
+        ids = sorted({i for i in (parse_int(v) for v in ids) if i is not None})
+        if not ids:
+            raise BulkActionError("No assets selected")
+        scopes = [Asset.id.in_(chunk) for chunk in _chunks(ids)]
+    else:
+        clauses = asset_filter_clauses(filters or {})
+        if not clauses:
+            raise BulkActionError("Select assets or give at least one filter")
+        scopes = [and_(*clauses)]
+
+    result = BulkResult(action=action)
+    try:
+        for scope in scopes:
+            result.matched += db.session.execute(select(func.count(Asset.id)).where(scope)).scalar() or 0
+            result.updated += db.session.execute(
+                update(Asset).where(scope, _differs(changes)).values(**changes)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        if result.updated:
+            kpis.mark_stale()
+            employee_dashboard.mark_stale()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return result
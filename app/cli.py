@@ -0,0 +1,103 @@
+"""Flask CLI commands (``flask --app wsgi <command>``)."""
+import json
+
+import click
+from flask import current_app
+
+from . import benchmarks, importer, synthetic
+
+
+@click.command("import-data")
+@click.argument("dataset", type=click.Choice(sorted(importer.IMPORTS)))
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--dry-run", is_flag=True, help="Validate only; insert nothing.")
+@click.option("--batch-size", default=importer.IMPORT_BATCH_SIZE, show_default=True, help="Rows per insert transaction.")
+@click.option("--errors", "errors_path", type=click.Path(dir_okay=False), help="Write the per-row error report to this CSV file.")
+def import_data(dataset, path, dry_run, batch_size, errors_path):
+    """Bulk-import DATASET rows from a CSV or XLSX file at PATH."""
+    fmt = importer.format_for(path)
+    try:
+        with open(path, "rb") as fh:
+            result = importer.import_file(dataset, fh, fmt, dry_run=dry_run, batch_size=batch_size)
+    except importer.ImportFileError as e:
+        raise click.ClickException(str(e))
+
+    outcome = "nothing inserted (dry run)" if dry_run else f"{result.inserted} inserted"
+    click.echo(f"{result.total} rows read, {result.total - result.rejected_rows} valid, "
+               f"{outcome}, {result.rejected_rows} rejected.")
+    if result.errors:
+        if errors_path:
+            with open(errors_path, "w", newline="", encoding="utf-8") as fh:
+                fh.write(result.errors_csv())
+            click.echo(f"Error report written to {errors_path}")
+        else:
+            for e in result.errors[:20]:
+                click.echo(f"  row {e.row} {e.column}: {e.message} ({e.value!r})")
+            if len(result.errors) > 20:
+                click.echo(f"  ... {len(result.errors) - 20} more; use --errors to write them all")
+
+
+@click.command("generate-data")
+@click.option("--size", type=click.Choice(sorted(synthetic.SIZES)), default="10k", show_default=True, help="Number of assets.")
+@click.option("--assets", type=int, help="Exact number of assets (overrides --size).")
+@click.option("--employees", type=int, help="Number of employees [default: assets / 3].")
+@click.option("--maintenance-per-asset", default=1.5, show_default=True, help="Average maintenance records per asset.")
+@click.option("--licenses-per-employee", default=1.2, show_default=True, help="Average software licenses per employee.")
+@click.option("--assigned-ratio", default=0.95, show_default=True, help="Share of in-use/repair assets with an assignee.")
+@click.option("--seed", default=42, show_default=True, help="Random seed; the same seed gives the same data.")
+@click.option("--yes", is_flag=True, help="Do not ask for confirmation.")
+def generate_data(size, assets, employees, maintenance_per_asset, licenses_per_employee, assigned_ratio, seed, yes):
+    """Fill the database with a synthetic dataset for load testing."""
+    profile = synthetic.Profile(
+        assets=assets if assets is not None else synthetic.SIZES[size],
+        employees=employees,
+        assigned_ratio=assigned_ratio,
+        maintenance_per_asset=maintenance_per_asset,
+        licenses_per_employee=licenses_per_employee,
+        seed=seed,
+    )
+    database = current_app.config["SQLALCHEMY_DATABASE_URI"]
+    if not yes:
+        click.confirm(f"Add {profile.assets} assets and {profile.employee_count} employees to {database}?", abort=True)
+
+    def progress(label, done, total):
+        if done == total or done % (synthetic.BATCH_SIZE * 20) == 0:
+            click.echo(f"  {label}: {done}/{total}")
+
+    result = synthetic.generate(profile, progress=progress)
+    click.echo(f"Inserted {result.employees} employees, {result.assets} assets, "
+               f"{result.maintenance} maintenance records and {result.licenses} licenses.")
+
+
+@click.command("bench")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), help="Write the results as JSON to this file.")
+@click.option("--repeat", default=5, show_default=True, help="Timed runs per case.")
+@click.option("--warmup", default=1, show_default=True, help="Untimed runs per case before timing.")
+@click.option("--group", "groups", multiple=True, type=click.Choice(benchmarks.GROUPS), help="Only run these groups (repeatable).")
+@click.option("--compare", "baseline_path", type=click.Path(exists=True, dir_okay=False), help="Earlier results JSON to compare medians against.")
+def bench(output, repeat, warmup, groups, baseline_path):
+    """Time dashboards, list pages, exports and notification runs."""
+    def progress(case, row):
+        if "skipped" in row:
+            click.echo(f"  {case.name:<28} skipped ({row['skipped']})")
+        else:
+            click.echo(f"  {case.name:<28} median {row['median_ms']:>9.1f} ms  p95 {row['p95_ms']:>9.1f} ms  "
+                       f"[{row['status']}, {row['sql_count'] if row['sql_count'] is not None else '?'} queries]")
+
+    results = benchmarks.run(current_app._get_current_object(), repeat=repeat, warmup=warmup, groups=groups, progress=progress)
+    if output:
+        with open(output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+        click.echo(f"Results written to {output}")
+    if baseline_path:
+        with open(baseline_path, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        click.echo(f"Compared with {baseline.get('revision') or baseline_path}:")
+        for name, before, after, change in benchmarks.compare(results, baseline):
+            click.echo(f"  {name:<28} {before:>9.1f} -> {after:>9.1f} ms  ({change:+.1f}%)")
+
+
+def register(app):
+    app.cli.add_command(import_data)
+    app.cli.add_command(generate_data)
+    app.cli.add_command(bench)
@@ -0,0 +1,64 @@
+"""Rendering for expiry notification mails.
+
+Email templates are compiled once per process by a dedicated Jinja
+environment (they need nothing from the request context), so repeated runs
+reuse the compiled code. Within a run, ``ExpiryMailRenderer`` renders each
+distinct item list once with a placeholder greeting and only substitutes the
+recipient's name per message, so cost follows the number of distinct bodies
+rather than the number of recipients.
+"""
+import os
+import threading
+import uuid
+from datetime import date, datetime
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup, escape
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+_env = None
+_env_lock = threading.Lock()
+
+
+def email_environment():
+    """Process-wide Jinja environment for mail templates (compiled templates are cached)."""
+    global _env
+    with _env_lock:
+        if _env is None:
+            _env = Environment(
+                loader=FileSystemLoader(TEMPLATES_DIR),
+                autoescape=select_autoescape(["html"]),
+            )
+        return _env
+
+
+class ExpiryMailRenderer:
+    """Render one expiry template for many recipients within a notification run."""
+
+    def __init__(self, template_name, items_arg, days):
+        self.template = email_environment().get_template(template_name)
+        self.items_arg = items_arg
+        self.days = days
+        self.renders = 0
+        self._bodies = {}
+        self._placeholder = f"@@recipient-{uuid.uuid4().hex}@@"
+
+    def _body(self, items):
+        key = tuple(item.id for item in items)
+        body = self._bodies.get(key)
+        if body is None:
+            body = self.template.render({
+                self.items_arg: items,
+                "user": {"name": Markup(self._placeholder)},
+                "days": self.days,
+                "now": datetime.now,
+                "today": date.today(),
+            })
+            self._bodies[key] = body
+            self.renders += 1
+        return body
+
+    def render(self, items, recipient_name):
+        """HTML for ``items`` addressed to ``recipient_name``."""
+        return self._body(items).replace(self._placeholder, str(escape(recipient_name or "")))
@@ -0,0 +1,167 @@
+"""Precomputed data for the employee dashboard.
+
+A login sees the assets of the employee record linked through
+``User.employee_id``. ``for_employee`` returns an ``EmployeeDashboard`` of
+plain tuples, so the template never touches the ORM: the employee's assets
+from one indexed query on ``asset.assigned_to`` and the ten most recent
+maintenance records across all of them from one query joined back to
+``asset`` (no per-asset queries).
+
+Results are cached per process by employee id (at most
+``EMPLOYEE_DASHBOARD_CACHE_SIZE`` entries, each kept for
+``EMPLOYEE_DASHBOARD_TTL`` seconds). Mapper events on ``Asset`` (only for
+changes to the assignee or a column the dashboard shows), ``Maintenance`` and
+``Employee`` evict the affected employees in this process and bump the
+``dashboards:employee`` stamp; other processes check the stamp at
+most every ``EMPLOYEE_DASHBOARD_CHECK_INTERVAL`` seconds and drop their cache
+when it moved. Bulk paths that bypass the mapper (bulk actions, imports)
+call ``mark_stale``.
+"""
+from collections import namedtuple
+from dataclasses import dataclass, field
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect, select
+
+from . import db, stamps
+from .models import Asset, Employee, Maintenance
+
+VERSION_KEY = "dashboards:employee"
+RECENT_MAINTENANCE = 10
+
+AssetRow = namedtuple("AssetRow", "id asset_id asset_type brand model status purchase_date warranty_expiry")
+# Asset columns an update must touch to change anyone's dashboard
+ASSET_FIELDS = ("assigned_to",) + AssetRow._fields[1:]
+MaintenanceRow = namedtuple("MaintenanceRow", "date asset_tag description status")
+
+
+@dataclass
+class EmployeeDashboard:
+    employee_name: str | None = None
+    assets: list = field(default_factory=list)
+    maintenance: list = field(default_factory=list)
+
+    @property
+    def active_count(self):
+        return sum(1 for a in self.assets if a.status == "Active")
+
+    @property
+    def repair_count(self):
+        return sum(1 for a in self.assets if a.status == "Repair")
+
+    @property
+    def warranty_count(self):
+        return sum(1 for a in self.assets if a.warranty_expiry)
+
+
+def build(employee_id):
+    """Query the dashboard for ``employee_id``: name, assets, recent maintenance."""
+    name = db.session.execute(select(Employee.name).where(Employee.id == employee_id)).scalar()
+    if name is None:
+        return EmployeeDashboard()
+    assets = [AssetRow(*row) for row in db.session.execute(
+        select(Asset.id, Asset.asset_id, Asset.asset_type, Asset.brand, Asset.model, Asset.status,
+               Asset.purchase_date, Asset.warranty_expiry)
+        .where(Asset.assigned_to == employee_id)
+        .order_by(Asset.asset_id)
+    )]
+    maintenance = []
+    if assets:
+        maintenance = [MaintenanceRow(*row) for row in db.session.execute(
+            select(Maintenance.date, Asset.asset_id, Maintenance.description, Maintenance.status)
+            .join(Asset, Asset.id == Maintenance.asset_id)
+            .where(Asset.assigned_to == employee_id)
+            .order_by(Maintenance.date.desc(), Maintenance.id.desc())
+            .limit(RECENT_MAINTENANCE)
+        )]
+    return EmployeeDashboard(employee_name=name, assets=assets, maintenance=maintenance)
+
+
+def cache():
+    """The dashboard cache for the current app (created on first use): ``employee id -> EmployeeDashboard``."""
+    ext = current_app.extensions
+    if "employee_dashboard" not in ext:
+        config = current_app.config
+        ext["employee_dashboard"] = stamps.StampedLRU(
+            VERSION_KEY,
+            size=config.get("EMPLOYEE_DASHBOARD_CACHE_SIZE", 1024),
+            ttl=config.get("EMPLOYEE_DASHBOARD_TTL", 60),
+            check_interval=config.get("EMPLOYEE_DASHBOARD_CHECK_INTERVAL", 5),
+        )
+    return ext["employee_dashboard"]
+
+
+def for_employee(employee_id):
+    if employee_id is None:
+        return EmployeeDashboard()
+    dashboards = cache()
+    dashboard = dashboards.get(employee_id)
+    if dashboard is None:
+        dashboard = build(employee_id)
+        dashboards.put(employee_id, dashboard)
+    return dashboard
+
+
+def mark_stale(connection=None):
+    """Invalidate every cached dashboard (for bulk SQL that skips mapper events)."""
+    stamps.bump(VERSION_KEY, connection)
+    if has_app_context():
+        cache().clear()
+
+
+# -------------------- Invalidation --------------------
+def _invalidate(connection, employee_ids):
+    employee_ids = {e for e in employee_ids if e is not None}
+    if not employee_ids:
+        return
+    stamps.bump(VERSION_KEY, connection)
+    if has_app_context():
+        cache().evict(*employee_ids)
+
+
+def _assignees(target):
+    """Current and previous ``assigned_to`` of an asset."""
+    history = inspect(target).attrs.assigned_to.history
+    return {target.assigned_to, *history.deleted}
+
+
+def _asset_owner(connection, asset_id):
+    if asset_id is None:
+        return None
+    return connection.execute(select(Asset.assigned_to).where(Asset.id == asset_id)).scalar()
+
+
+@event.listens_for(Asset.assigned_to, "set", active_history=True)
+@event.listens_for(Maintenance.asset_id, "set", active_history=True)
+def _load_previous_owner(target, value, oldvalue, initiator):
+    # active_history loads the old value even when the row was expired by a
+    # commit, so the employee an asset (or record) moved away from is evicted too
+    pass
+
+
+@event.listens_for(Asset, "after_insert")
+@event.listens_for(Asset, "after_delete")
+def _asset_added_or_removed(mapper, connection, target):
+    _invalidate(connection, _assignees(target))
+
+
+@event.listens_for(Asset, "after_update")
+def _asset_changed(mapper, connection, target):
+    state = inspect(target)
+    # Edits to notes, serial numbers and the like leave every dashboard as it was
+    if any(state.attrs[name].history.has_changes() for name in ASSET_FIELDS):
+        _invalidate(connection, _assignees(target))
+
+
+@event.listens_for(Employee, "after_update")
+@event.listens_for(Employee, "after_delete")
+def _employee_changed(mapper, connection, target):
+    _invalidate(connection, {target.id})
+
+
+@event.listens_for(Maintenance, "after_insert")
+@event.listens_for(Maintenance, "after_update")
+@event.listens_for(Maintenance, "after_delete")
+def _maintenance_changed(mapper, connection, target):
+    asset_ids = {target.asset_id, *inspect(target).attrs.asset_id.history.deleted}
+    _invalidate(connection, {_asset_owner(connection, asset_id) for asset_id in asset_ids})
@@ -0,0 +1,255 @@
+"""Expiry calendar for licenses and warranties.
+
+``expiry_event`` holds one ``(kind, ref_id, expires_on)`` row per license with
+an ``expiry_date`` and per asset with a ``warranty_expiry``, indexed on
+``(expires_on, kind, ref_id)`` for both kinds together and on
+``(kind, expires_on, ref_id)`` for one kind. On SQLite, triggers on ``software_license``
+and ``asset`` keep it current for ORM writes and bulk SQL alike, so the
+dashboards, the notifications center and the expiry mails all answer "what
+expires between A and B", "how many per month" and "the next N" with one
+indexed range read over a single table. Pages are keyset-paginated on the
+index order; ``resolve`` turns a page of events back into the licenses and
+assets (assignee joined in) in a query per kind.
+
+Other databases, or a database whose triggers are not installed yet, read the
+same shape from a ``UNION ALL`` over the two source columns, which carry their
+own indexes.
+"""
+from collections import namedtuple
+from dataclasses import dataclass, field
+from datetime import date
+
+from sqlalchemy import and_, case, func, literal, select, text, tuple_
+
+from . import db
+from .models import Asset, ExpiryEvent, SoftwareLicense
+from .queries import DEFAULT_PAGE_SIZE, asset_query, license_query
+
+LICENSE = "license"
+WARRANTY = "warranty"
+KINDS = (LICENSE, WARRANTY)
+
+# Ids per IN (...) when loading the rows behind a list of events
+RESOLVE_CHUNK = 500
+
+ExpiryRow = namedtuple("ExpiryRow", "kind ref_id expires_on")
+
+TRIGGERS = {
+    "license_expiry_ai": (
+        "AFTER INSERT ON software_license WHEN new.expiry_date IS NOT NULL BEGIN "
+        "INSERT INTO expiry_event(kind, ref_id, expires_on) VALUES ('license', new.id, new.expiry_date); END"
+    ),
+    "license_expiry_au": (
+        "AFTER UPDATE OF expiry_date ON software_license BEGIN "
+        "DELETE FROM expiry_event WHERE kind = 'license' AND ref_id = old.id; "
+        "INSERT INTO expiry_event(kind, ref_id, expires_on) "
+        "SELECT 'license', new.id, new.expiry_date WHERE new.expiry_date IS NOT NULL; END"
+    ),
+    "license_expiry_ad": (
+        "AFTER DELETE ON software_license BEGIN "
+        "DELETE FROM expiry_event WHERE kind = 'license' AND ref_id = old.id; END"
+    ),
+    "warranty_expiry_ai": (
+        "AFTER INSERT ON asset WHEN new.warranty_expiry IS NOT NULL BEGIN "
+        "INSERT INTO expiry_event(kind, ref_id, expires_on) VALUES ('warranty', new.id, new.warranty_expiry); END"
+    ),
+    "warranty_expiry_au": (
+        "AFTER UPDATE OF warranty_expiry ON asset BEGIN "
+        "DELETE FROM expiry_event WHERE kind = 'warranty' AND ref_id = old.id; "
+        "INSERT INTO expiry_event(kind, ref_id, expires_on) "
+        "SELECT 'warranty', new.id, new.warranty_expiry WHERE new.warranty_expiry IS NOT NULL; END"
+    ),
+    "warranty_expiry_ad": (
+        "AFTER DELETE ON asset BEGIN "
+        "DELETE FROM expiry_event WHERE kind = 'warranty' AND ref_id = old.id; END"
+    ),
+}
+
+REBUILD = [
+    "DELETE FROM expiry_event",
+    "INSERT INTO expiry_event(kind, ref_id, expires_on) "
+    "SELECT 'license', id, expiry_date FROM software_license WHERE expiry_date IS NOT NULL",
+    "INSERT INTO expiry_event(kind, ref_id, expires_on) "
+    "SELECT 'warranty', id, warranty_expiry FROM asset WHERE warranty_expiry IS NOT NULL",
+]
+
+
+@dataclass
+class ExpiryPage:
+    """One keyset page of expiry events, in ``(expires_on, kind, ref_id)`` order."""
+    items: list = field(default_factory=list)
+    next_cursor: str | None = None
+    per_page: int = DEFAULT_PAGE_SIZE
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def index_available(connection=None):
+    """True when the ``expiry_event`` triggers are installed on this database."""
+    conn = connection if connection is not None else db.session.connection()
+    if conn.dialect.name != "sqlite":
+        return False
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+        {"name": "license_expiry_ai"},
+    ).first() is not None
+
+
+def ensure_index(connection):
+    """Create the triggers if missing, filling ``expiry_event`` when they are first installed.
+
+    Returns False where the table cannot be maintained (not SQLite, or tables missing).
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+    tables = {row[0] for row in connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if not {"asset", "software_license", "expiry_event"} <= tables:
+        return False
+    installed = index_available(connection)
+    for name, body in TRIGGERS.items():
+        connection.exec_driver_sql(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    if not installed:
+        rebuild(connection)
+    return True
+
+
+def rebuild(connection):
+    """Refill ``expiry_event`` from the source tables."""
+    for statement in REBUILD:
+        connection.exec_driver_sql(statement)
+
+
+def _events():
+    if index_available():
+        return ExpiryEvent.__table__
+    return (
+        select(
+            literal(LICENSE).label("kind"),
+            SoftwareLicense.id.label("ref_id"),
+            SoftwareLicense.expiry_date.label("expires_on"),
+        ).where(SoftwareLicense.expiry_date.isnot(None))
+        .union_all(
+            select(
+                literal(WARRANTY).label("kind"),
+                Asset.id.label("ref_id"),
+                Asset.warranty_expiry.label("expires_on"),
+            ).where(Asset.warranty_expiry.isnot(None))
+        )
+        .subquery("expiry_event")
+    )
+
+
+def _range(events, start, end, kinds):
+    clauses = []
+    if start is not None:
+        clauses.append(events.c.expires_on >= start)
+    if end is not None:
+        clauses.append(events.c.expires_on <= end)
+    kinds = tuple(kinds)
+    if len(kinds) == 1:
+        clauses.append(events.c.kind == kinds[0])
+    elif kinds != KINDS:
+        clauses.append(events.c.kind.in_(kinds))
+    return clauses
+
+
+def between(start, end, kinds=KINDS, limit=None):
+    """Events expiring from ``start`` to ``end`` inclusive (either may be None), soonest first."""
+    events = _events()
+    query = (
+        select(events.c.kind, events.c.ref_id, events.c.expires_on)
+        .where(*_range(events, start, end, kinds))
+        .order_by(events.c.expires_on, events.c.kind, events.c.ref_id)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return [ExpiryRow(*row) for row in db.session.execute(query)]
+
+
+def upcoming(limit, kinds=KINDS, start=None):
+    """The next ``limit`` events from ``start`` (default today)."""
+    return between(start or date.today(), None, kinds, limit)
+
+
+def encode_cursor(row):
+    return f"{row.expires_on.isoformat()}.{row.kind}.{row.ref_id}"
+
+
+def decode_cursor(cursor):
+    """``(expires_on, kind, ref_id)`` from ``encode_cursor``, or None for a malformed value."""
+    try:
+        day, kind, ref_id = (cursor or "").split(".")
+        return date.fromisoformat(day), kind, int(ref_id)
+    except ValueError:
+        return None
+
+
+def page(start, end, kinds=KINDS, after=None, per_page=DEFAULT_PAGE_SIZE):
+    """Keyset page of ``between(start, end, kinds)``; pass ``next_cursor`` back as ``after``."""
+    events = _events()
+    clauses = _range(events, start, end, kinds)
+    position = decode_cursor(after)
+    if position is not None:
+        day, kind, ref_id = position
+        if len(tuple(kinds)) == 1:
+            # Seek within the one kind so the (kind, expires_on, ref_id) index serves it
+            clauses.append(tuple_(events.c.expires_on, events.c.ref_id) > tuple_(day, ref_id))
+        else:
+            clauses.append(tuple_(events.c.expires_on, events.c.kind, events.c.ref_id) > tuple_(day, kind, ref_id))
+    rows = [ExpiryRow(*row) for row in db.session.execute(
+        select(events.c.kind, events.c.ref_id, events.c.expires_on)
+        .where(*clauses)
+        .order_by(events.c.expires_on, events.c.kind, events.c.ref_id)
+        .limit(per_page + 1)
+    )]
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    return ExpiryPage(
+        items=rows,
+        next_cursor=encode_cursor(rows[-1]) if rows and more else None,
+        per_page=per_page,
+    )
+
+
+def _add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def monthly_counts(start, months=12, kinds=KINDS):
+    """``[(first day of month, count)]`` for ``months`` calendar months, counting from ``start``.
+
+    The first month only counts from ``start`` itself. One range read over the
+    whole span, bucketed with a ``SUM(CASE ...)`` per month.
+    """
+    first = start.replace(day=1)
+    bounds = [start] + [_add_months(first, n) for n in range(1, months + 1)]
+    events = _events()
+    buckets = [
+        func.coalesce(func.sum(case((and_(events.c.expires_on >= lo, events.c.expires_on < hi), 1), else_=0)), 0)
+        for lo, hi in zip(bounds, bounds[1:])
+    ]
+    counts = db.session.execute(
+        select(*buckets).where(
+            events.c.expires_on >= bounds[0],
+            events.c.expires_on < bounds[-1],
+            *_range(events, None, None, kinds),
+        )
+    ).one()
+    return list(zip([first] + bounds[1:-1], counts))
+
+
+def resolve(rows):
+    """The licenses and assets behind ``rows``, in the same order (assignees joined in)."""
+    ids = {LICENSE: [], WARRANTY: []}
+    for row in rows:
+        ids[row.kind].append(row.ref_id)
+    loaded = {}
+    for kind, query, model in ((LICENSE, license_query, SoftwareLicense), (WARRANTY, asset_query, Asset)):
+        wanted = ids[kind]
+        for at in range(0, len(wanted), RESOLVE_CHUNK):
+            for obj in query().filter(model.id.in_(wanted[at:at + RESOLVE_CHUNK])):
+                loaded[kind, obj.id] = obj
+    return [loaded[row.kind, row.ref_id] for row in rows if (row.kind, row.ref_id) in loaded]
@@ -0,0 +1,205 @@
+"""Background export jobs.
+
+Exports are queued as ``ExportJob`` rows and run on a bounded thread pool,
+outside the request that asked for them. Progress and the artifact path are
+kept in the database so any worker can report on or serve a job. Artifacts
+live under ``EXPORT_DIR`` until ``expires_at``; an identical request made
+within ``EXPORT_REUSE_SECONDS`` gets the existing job instead of a new run.
+The worker stamps ``heartbeat_at`` as it makes progress; a Running job with no
+heartbeat for ``EXPORT_STALE_SECONDS`` (or a job still Queued that long after
+it was created) was orphaned, for example by a worker restart. It is marked
+Failed and never handed out or started again.
+"""
+import csv
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func
+
+from . import db
+from .exports import EXPORTS, export_header, export_row_count, iter_export_batches, write_workbook
+from .models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "xlsx")
+ACTIVE_STATUSES = ("Queued", "Running", "Done")
+IN_PROGRESS_STATUSES = ("Queued", "Running")
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class ExportJobError(ValueError):
+    """Raised for an export request that cannot be queued."""
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=current_app.config.get("EXPORT_JOB_WORKERS", 2),
+                thread_name_prefix="export-job",
+            )
+        return _executor
+
+
+def _export_dir():
+    path = current_app.config["EXPORT_DIR"]
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def download_name(job):
+    names = job.datasets.split(",")
+    stem = names[0] if len(names) == 1 else "it-assets"
+    return f"{stem}.{job.fmt}"
+
+
+def purge_expired():
+    """Delete expired jobs and their files."""
+    now = datetime.utcnow()
+    expired = ExportJob.query.filter(ExportJob.expires_at < now).all()
+    for job in expired:
+        if job.path and os.path.exists(job.path):
+            try:
+                os.remove(job.path)
+            except OSError:
+                logger.warning("Could not remove export artifact %s", job.path)
+        db.session.delete(job)
+    if expired:
+        db.session.commit()
+
+
+def fail_stale():
+    """Mark Queued/Running jobs whose heartbeat stopped ``EXPORT_STALE_SECONDS`` ago as Failed."""
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=current_app.config.get("EXPORT_STALE_SECONDS", 1800))
+    stale = ExportJob.query.filter(
+        ExportJob.status.in_(IN_PROGRESS_STATUSES),
+        func.coalesce(ExportJob.heartbeat_at, ExportJob.created_at) < cutoff,
+    ).all()
+    for job in stale:
+        job.status = "Failed"
+        job.error = "Export was interrupted before it finished"
+        job.finished_at = now
+    if stale:
+        db.session.commit()
+
+
+def recent_jobs(limit=10):
+    purge_expired()
+    fail_stale()
+    return ExportJob.query.order_by(ExportJob.created_at.desc()).limit(limit).all()
+
+
+def submit(fmt, datasets, user_id=None):
+    """Queue an export, or return a recent identical job. Returns ``(job, reused)``."""
+    datasets = [d for d in datasets if d]
+    if fmt not in FORMATS:
+        raise ExportJobError(f"Unsupported export format: {fmt}")
+    if not datasets or any(d not in EXPORTS for d in datasets):
+        raise ExportJobError("Choose at least one valid dataset")
+    if fmt == "csv" and len(datasets) != 1:
+        raise ExportJobError("CSV exports hold a single dataset; use Excel for several")
+
+    purge_expired()
+    fail_stale()
+    key = ",".join(datasets)
+    reuse_after = datetime.utcnow() - timedelta(seconds=current_app.config.get("EXPORT_REUSE_SECONDS", 0))
+    existing = (
+        ExportJob.query
+        .filter_by(fmt=fmt, datasets=key)
+        .filter(ExportJob.status.in_(ACTIVE_STATUSES), ExportJob.created_at >= reuse_after)
+        .order_by(ExportJob.created_at.desc())
+        .first()
+    )
+    if existing and (existing.status != "Done" or (existing.path and os.path.exists(existing.path))):
+        return existing, True
+
+    now = datetime.utcnow()
+    job = ExportJob(
+        id=uuid.uuid4().hex,
+        fmt=fmt,
+        datasets=key,
+        status="Queued",
+        rows_total=0,
+        rows_done=0,
+        requested_by=user_id,
+        created_at=now,
+        expires_at=now + timedelta(seconds=current_app.config.get("EXPORT_ARTIFACT_TTL", 86400)),
+    )
+    db.session.add(job)
+    db.session.commit()
+    _get_executor().submit(run_job, current_app._get_current_object(), job.id)
+    return job, False
+
+
+def run_job(app, job_id):
+    """Write the artifact for ``job_id``; runs on the export thread pool."""
+    with app.app_context():
+        job = db.session.get(ExportJob, job_id)
+        if job is None or job.status != "Queued":
+            # Gone, or given up on by fail_stale while it waited
+            return
+        names = job.datasets.split(",")
+        job.status = "Running"
+        job.heartbeat_at = datetime.utcnow()
+        db.session.commit()
+        partial = None
+
+        def rows_for(name):
+            for batch in iter_export_batches(name):
+                yield from batch
+                job.rows_done = (job.rows_done or 0) + len(batch)
+                job.heartbeat_at = datetime.utcnow()
+                db.session.commit()
+
+        try:
+            job.rows_total = sum(export_row_count(name) for name in names)
+            job.heartbeat_at = datetime.utcnow()
+            db.session.commit()
+            path = os.path.join(_export_dir(), f"{job.id}.{job.fmt}")
+            partial = path + ".part"
+            if job.fmt == "csv":
+                with open(partial, "w", newline="", encoding="utf-8") as fh:
+                    writer = csv.writer(fh)
+                    writer.writerow(export_header(names[0]))
+                    writer.writerows(rows_for(names[0]))
+            else:
+                with open(partial, "wb") as fh:
+                    write_workbook(names, fh, rows_for=rows_for)
+            os.replace(partial, path)
+            job.path = path
+            job.status = "Done"
+        except Exception as e:
+            db.session.rollback()
+            logger.exception("Export job %s failed", job_id)
+            if partial and os.path.exists(partial):
+                os.remove(partial)
+            job.status = "Failed"
+            job.error = str(e)
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+
+def job_to_dict(job):
+    return {
+        "id": job.id,
+        "format": job.fmt,
+        "datasets": job.datasets.split(","),
+        "status": job.status,
+        "progress": job.progress,
+        "rows_done": job.rows_done,
+        "rows_total": job.rows_total,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "expires_at": job.expires_at.isoformat() if job.expires_at else None,
+    }
@@ -0,0 +1,165 @@
+"""Row sources and streaming writers for the CSV/Excel exports.
+
+Exports select plain columns (no ORM entities, so nothing lands in the
+session identity map) and read them in ``yield_per`` batches from a
+server-side cursor. Writers consume the rows lazily, so memory stays flat:
+CSV goes out chunk by chunk, and xlsx is written by openpyxl in write-only
+mode to a temporary file that is then streamed back.
+"""
+import csv
+import tempfile
+from collections import namedtuple
+from datetime import date
+from io import StringIO
+
+from flask import Response, send_file, stream_with_context
+from sqlalchemy import func, select
+
+from . import db
+from .models import Asset, Employee, Maintenance, SoftwareLicense
+
+# Optional openpyxl import
+try:
+    from openpyxl import Workbook
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+    Workbook = None
+
+EXPORT_BATCH_SIZE = 1000
+CSV_CHUNK_ROWS = 500
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+ExportSpec = namedtuple("ExportSpec", "filename columns order_by")
+
+EXPORTS = {
+    "assets": ExportSpec("assets", [
+        ("Asset ID", Asset.asset_id),
+        ("Type", Asset.asset_type),
+        ("Brand", Asset.brand),
+        ("Model", Asset.model),
+        ("Serial No", Asset.serial_no),
+        ("Purchase Date", Asset.purchase_date),
+        ("Warranty Expiry", Asset.warranty_expiry),
+        ("Status", Asset.status),
+        ("Assigned To", Asset.assigned_to),
+    ], Asset.id),
+    "employees": ExportSpec("employees", [
+        ("ID", Employee.id),
+        ("Name", Employee.name),
+        ("Department", Employee.department),
+        ("Contact", Employee.contact),
+    ], Employee.id),
+    "maintenance": ExportSpec("maintenance", [
+        ("ID", Maintenance.id),
+        ("Asset ID", Maintenance.asset_id),
+        ("Date", Maintenance.date),
+        ("Description", Maintenance.description),
+        ("Cost", Maintenance.cost),
+    ], Maintenance.id),
+    "licenses": ExportSpec("licenses", [
+        ("ID", SoftwareLicense.id),
+        ("Software Name", SoftwareLicense.software_name),
+        ("License Key", SoftwareLicense.license_key),
+        ("Expiry Date", SoftwareLicense.expiry_date),
+        ("Assigned To", SoftwareLicense.assigned_to),
+    ], SoftwareLicense.id),
+}
+
+
+def _cell(value):
+    if isinstance(value, date):
+        return value.strftime('%Y-%m-%d')
+    return value
+
+
+def export_header(name):
+    return [label for label, _ in EXPORTS[name].columns]
+
+
+def iter_export_rows(name, batch_size=EXPORT_BATCH_SIZE):
+    """Yield formatted rows for export ``name``, fetched ``batch_size`` at a time."""
+    spec = EXPORTS[name]
+    stmt = (
+        select(*[column for _, column in spec.columns])
+        .order_by(spec.order_by)
+        .execution_options(yield_per=batch_size)
+    )
+    for row in db.session.execute(stmt):
+        yield [_cell(value) for value in row]
+
+
+def iter_export_batches(name, batch_size=EXPORT_BATCH_SIZE):
+    """Yield lists of formatted rows for export ``name``, one keyset-paged query per batch.
+
+    Unlike ``iter_export_rows`` no cursor stays open between batches, so a
+    background job can commit progress updates while it writes.
+    """
+    spec = EXPORTS[name]
+    stmt = (
+        select(spec.order_by, *[column for _, column in spec.columns])
+        .order_by(spec.order_by)
+        .limit(batch_size)
+    )
+    last_key = None
+    while True:
+        page = stmt if last_key is None else stmt.where(spec.order_by > last_key)
+        rows = db.session.execute(page).all()
+        if not rows:
+            return
+        last_key = rows[-1][0]
+        yield [[_cell(value) for value in row[1:]] for row in rows]
+        if len(rows) < batch_size:
+            return
+
+
+def export_row_count(name):
+    spec = EXPORTS[name]
+    return db.session.execute(select(func.count(spec.order_by))).scalar() or 0
+
+
+def iter_csv(header, rows, chunk_rows=CSV_CHUNK_ROWS):
+    """Encode rows as CSV text, yielding one chunk per ``chunk_rows`` rows."""
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue()
+
+
+def csv_response(name):
+    """Streaming CSV download for export ``name``."""
+    spec = EXPORTS[name]
+    return Response(
+        stream_with_context(iter_csv(export_header(name), iter_export_rows(name))),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={spec.filename}.csv'}
+    )
+
+
+def write_workbook(names, fileobj, rows_for=iter_export_rows):
+    """Write one worksheet per export in ``names`` to ``fileobj`` as xlsx."""
+    workbook = Workbook(write_only=True)
+    for name in names:
+        sheet = workbook.create_sheet(title=EXPORTS[name].filename.title())
+        sheet.append(export_header(name))
+        for row in rows_for(name):
+            sheet.append(row)
+    workbook.save(fileobj)
+
+
+def excel_response(names, filename):
+    """xlsx download for one or more exports, spooled through a temp file."""
+    spool = tempfile.TemporaryFile(suffix='.xlsx')
+    try:
+        write_workbook(names, spool)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return send_file(spool, mimetype=XLSX_MIMETYPE, as_attachment=True, download_name=filename)
@@ -0,0 +1,388 @@
+"""Bulk CSV/XLSX import for assets, employees, licenses and maintenance, with a per-row error report."""
+import csv
+import io
+import zipfile
+from collections import namedtuple
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from sqlalchemy import select
+
+from . import db, employee_dashboard, kpis
+from .asset_ids import asset_ids_for
+from .models import Asset, Employee, Maintenance, SoftwareLicense
+
+# Optional openpyxl import
+try:
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+    load_workbook = None
+    InvalidFileException = zipfile.BadZipFile
+
+IMPORT_BATCH_SIZE = 5000
+# Stay well under SQLite's bound-parameter limit for IN (...) lookups
+LOOKUP_CHUNK = 900
+FORMATS = ("csv", "xlsx")
+
+ImportField = namedtuple("ImportField", "column labels parse required")
+
+
+@dataclass
+class RowError:
+    row: int
+    column: str
+    value: str
+    message: str
+
+
+@dataclass
+class ImportResult:
+    """Outcome of one import: counts plus every rejected row."""
+    dataset: str
+    total: int = 0
+    inserted: int = 0
+    dry_run: bool = False
+    errors: list = field(default_factory=list)
+
+    @property
+    def rejected_rows(self):
+        return len({e.row for e in self.errors})
+
+    def errors_csv(self):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["Row", "Column", "Value", "Error"])
+        for e in self.errors:
+            writer.writerow([e.row, e.column, e.value, e.message])
+        return buffer.getvalue()
+
+
+class ImportFileError(ValueError):
+    """Raised when a file cannot be imported at all (format, headers)."""
+
+
+# -------------------- Value parsers --------------------
+# Each takes one raw cell and returns the parsed value or raises ValueError.
+def _text(max_length):
+    def parse(value):
+        value = str(value).strip()
+        if len(value) > max_length:
+            raise ValueError(f"longer than {max_length} characters")
+        return value
+    return parse
+
+
+def _long_text(value):
+    return str(value).strip()
+
+
+def _date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%Y/%m/%d"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError("not a date (use YYYY-MM-DD)")
+
+
+def _float(value):
+    try:
+        return float(str(value).replace(",", "").strip())
+    except ValueError:
+        raise ValueError("not a number")
+
+
+def _int(value):
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        raise ValueError("not a whole number")
+
+
+def _ref(value):
+    """Reference cell: an integer id, or text (asset tag) resolved later."""
+    try:
+        return _int(value)
+    except ValueError:
+        return str(value).strip()
+
+
+IMPORTS = {
+    "assets": (Asset, [
+        ImportField("asset_id", ("asset id", "asset tag"), _text(64), False),
+        ImportField("asset_type", ("type", "asset type"), _text(120), False),
+        ImportField("brand", ("brand",), _text(120), False),
+        ImportField("model", ("model",), _text(120), False),
+        ImportField("serial_no", ("serial no", "serial number", "serial"), _text(120), False),
+        ImportField("purchase_date", ("purchase date",), _date, False),
+        ImportField("warranty_expiry", ("warranty expiry",), _date, False),
+        ImportField("status", ("status",), _text(50), False),
+        ImportField("notes", ("notes",), _long_text, False),
+        ImportField("assigned_to", ("assigned to", "employee id"), _int, False),
+    ]),
+    "employees": (Employee, [
+        ImportField("name", ("name",), _text(120), True),
+        ImportField("department", ("department",), _text(120), False),
+        ImportField("contact", ("contact",), _text(120), False),
+    ]),
+    "licenses": (SoftwareLicense, [
+        ImportField("software_name", ("software name", "software"), _text(120), True),
+        ImportField("license_key", ("license key",), _text(120), False),
+        ImportField("expiry_date", ("expiry date",), _date, False),
+        ImportField("assigned_to", ("assigned to", "employee id"), _int, False),
+    ]),
+    "maintenance": (Maintenance, [
+        ImportField("asset_id", ("asset id", "asset", "asset tag"), _ref, True),
+        ImportField("date", ("date",), _date, False),
+        ImportField("description", ("description",), _long_text, False),
+        ImportField("cost", ("cost",), _float, False),
+        ImportField("status", ("status",), _text(20), False),
+    ]),
+}
+
+
+def _normalize(label):
+    return " ".join(str(label or "").replace("_", " ").lower().split())
+
+
+def _chunks(values, size=LOOKUP_CHUNK):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+# -------------------- Reading --------------------
+def _read_csv(stream):
+    if isinstance(stream, (bytes, bytearray)):
+        stream = io.BytesIO(stream)
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        return list(csv.reader(stream))
+    except UnicodeDecodeError:
+        raise ImportFileError("The CSV file is not UTF-8 encoded. Save it as UTF-8 CSV and try again.")
+    except csv.Error as e:
+        raise ImportFileError(f"The CSV file could not be read: {e}")
+
+
+def _read_xlsx(stream):
+    if not OPENPYXL_AVAILABLE:
+        raise ImportFileError("Excel import is not available. Please install openpyxl.")
+    try:
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, InvalidFileException, KeyError, OSError):
+        raise ImportFileError("The file is not a valid Excel workbook (.xlsx).")
+    try:
+        return [list(row) for row in workbook.worksheets[0].iter_rows(values_only=True)]
+    finally:
+        workbook.close()
+
+
+def read_table(stream, fmt):
+    """Header and data rows from a CSV or XLSX file object."""
+    if fmt not in FORMATS:
+        raise ImportFileError(f"Unsupported file type: {fmt}")
+    rows = _read_csv(stream) if fmt == "csv" else _read_xlsx(stream)
+    if not rows:
+        raise ImportFileError("The file is empty")
+    return rows[0], rows[1:]
+
+
+def format_for(filename):
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    return "xlsx" if ext in ("xlsx", "xlsm") else ext
+
+
+# -------------------- Column validation --------------------
+def _map_headers(header, fields):
+    """``{column: index}`` for the recognised headers; unknown headers are ignored."""
+    wanted = {}
+    for f in fields:
+        for label in (f.column,) + f.labels:
+            wanted.setdefault(_normalize(label), f.column)
+    positions = {}
+    for index, label in enumerate(header):
+        column = wanted.get(_normalize(label))
+        if column and column not in positions:
+            positions[column] = index
+    missing = [f.column for f in fields if f.required and f.column not in positions]
+    if missing:
+        raise ImportFileError(f"Missing required column(s): {', '.join(missing)}")
+    if not positions:
+        raise ImportFileError("No recognised columns in the header row")
+    return positions
+
+
+def _parse_column(f, raw, bad, errors):
+    """Parse one column for every row; ``None`` marks a blank cell."""
+    values = []
+    for row_index, value in enumerate(raw):
+        if value is None or (isinstance(value, str) and not value.strip()):
+            if f.required:
+                bad.add(row_index)
+                errors.append(RowError(row_index + 2, f.column, "", "required"))
+            values.append(None)
+            continue
+        try:
+            values.append(f.parse(value))
+        except ValueError as e:
+            bad.add(row_index)
+            errors.append(RowError(row_index + 2, f.column, str(value), str(e)))
+            values.append(None)
+    return values
+
+
+def _existing_ids(column, ids):
+    found = set()
+    for chunk in _chunks(ids):
+        found.update(db.session.execute(select(column).where(column.in_(chunk))).scalars())
+    return found
+
+
+def _check_employee_refs(values, bad, errors):
+    known = _existing_ids(Employee.id, {v for v in values if v is not None})
+    for row_index, value in enumerate(values):
+        if value is not None and value not in known:
+            bad.add(row_index)
+            errors.append(RowError(row_index + 2, "assigned_to", str(value), "no employee with this id"))
+
+
+def _resolve_asset_refs(values, bad, errors):
+    """Maintenance ``asset_id`` cells may be an asset tag or an asset primary key."""
+    tags = {v for v in values if isinstance(v, str)}
+    ids = {v for v in values if isinstance(v, int)}
+    by_tag = {}
+    for chunk in _chunks(tags):
+        by_tag.update(db.session.execute(select(Asset.asset_id, Asset.id).where(Asset.asset_id.in_(chunk))).all())
+    # Numeric cells can also be tags made of digits
+    for chunk in _chunks({str(i) for i in ids}):
+        by_tag.update(db.session.execute(select(Asset.asset_id, Asset.id).where(Asset.asset_id.in_(chunk))).all())
+    known_ids = _existing_ids(Asset.id, ids)
+    for row_index, value in enumerate(values):
+        if value is None:
+            continue
+        if isinstance(value, int) and value in known_ids:
+            continue
+        resolved = by_tag.get(str(value))
+        if resolved is None:
+            bad.add(row_index)
+            errors.append(RowError(row_index + 2, "asset_id", str(value), "no asset with this id or tag"))
+        values[row_index] = resolved
+
+
+def _check_asset_tags(values, bad, errors):
+    seen = {}
+    for row_index, value in enumerate(values):
+        if value is None:
+            continue
+        if value in seen:
+            bad.add(row_index)
+            errors.append(RowError(row_index + 2, "asset_id", value, f"duplicate of row {seen[value] + 2}"))
+        else:
+            seen[value] = row_index
+    taken = _existing_ids(Asset.asset_id, set(seen))
+    for row_index, value in enumerate(values):
+        if value in taken:
+            bad.add(row_index)
+            errors.append(RowError(row_index + 2, "asset_id", value, "asset id already exists"))
+
+
+def validate(dataset, header, rows):
+    """Parsed row dicts that passed validation, and the errors for the rest."""
+    if dataset not in IMPORTS:
+        raise ImportFileError(f"Unknown dataset: {dataset}")
+    _, fields = IMPORTS[dataset]
+    positions = _map_headers(header, fields)
+    errors, bad = [], set()
+    columns = {}
+    for f in fields:
+        if f.column not in positions:
+            continue
+        index = positions[f.column]
+        raw = [row[index] if index < len(row) else None for row in rows]
+        columns[f.column] = _parse_column(f, raw, bad, errors)
+
+    if "assigned_to" in columns:
+        _check_employee_refs(columns["assigned_to"], bad, errors)
+    if dataset == "assets" and "asset_id" in columns:
+        _check_asset_tags(columns["asset_id"], bad, errors)
+    if dataset == "maintenance":
+        _resolve_asset_refs(columns["asset_id"], bad, errors)
+
+    names = list(columns)
+    records = [
+        dict(zip(names, values))
+        for row_index, values in enumerate(zip(*columns.values()))
+        if row_index not in bad
+    ]
+    errors.sort(key=lambda e: e.row)
+    return records, errors
+
+
+# -------------------- Inserting --------------------
+def _assign_asset_tags(batch):
+    """Tag every asset that came without an asset_id, one counter reservation per prefix.
+
+    Generated tags that are already in use (e.g. typed in by hand) are
+    replaced from a further reservation.
+    """
+    supplied = {record["asset_id"] for record in batch if record.get("asset_id")}
+    untagged = [record for record in batch if not record.get("asset_id")]
+    while untagged:
+        for record, tag in zip(untagged, asset_ids_for([r.get("asset_type") for r in untagged])):
+            record["asset_id"] = tag
+        taken = supplied | _existing_ids(Asset.asset_id, [r["asset_id"] for r in untagged])
+        untagged = [record for record in untagged if record["asset_id"] in taken]
+
+
+def insert_records(dataset, records, batch_size=IMPORT_BATCH_SIZE):
+    """executemany the validated records, committing once per batch."""
+    model, fields = IMPORTS[dataset]
+    table = model.__table__
+    keys = {f.column for f in fields}
+    inserted = 0
+    for start in range(0, len(records), batch_size):
+        # Same keys on every dict, so each batch is a single executemany
+        batch = [{key: record.get(key) for key in keys} for record in records[start:start + batch_size]]
+        if dataset == "assets":
+            _assign_asset_tags(batch)
+        if dataset == "maintenance":
+            for record in batch:
+                record["status"] = record["status"] or "Pending"
+                record["date"] = record["date"] or date.today()
+        try:
+            db.session.execute(table.insert(), batch)
+            kpis.mark_stale()
+            if dataset in ("assets", "maintenance"):
+                employee_dashboard.mark_stale()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        inserted += len(batch)
+    return inserted
+
+
+def import_table(dataset, header, rows, dry_run=False, batch_size=IMPORT_BATCH_SIZE):
+    """Validate and (unless ``dry_run``) insert already-read rows."""
+    records, errors = validate(dataset, header, rows)
+    result = ImportResult(dataset=dataset, total=len(rows), dry_run=dry_run, errors=errors)
+    if not dry_run and records:
+        result.inserted = insert_records(dataset, records, batch_size=batch_size)
+    return result
+
+
+def import_file(dataset, stream, fmt, dry_run=False, batch_size=IMPORT_BATCH_SIZE):
+    """Import a CSV/XLSX file object into ``dataset``."""
+    header, rows = read_table(stream, fmt)
+    return import_table(dataset, header, rows, dry_run=dry_run, batch_size=batch_size)
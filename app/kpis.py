@@ -0,0 +1,208 @@
+"""Materialized dashboard KPIs.
+
+Counters live in the ``kpi_snapshot`` table, one row per key. Mapper events on
+the source models apply +/- deltas inside the same transaction as the write, so
+every worker reads the same numbers and a dashboard needs one SELECT. When a
+delta cannot be derived (unknown previous value, bulk SQL that bypasses the
+ORM) the snapshot is marked stale and rebuilt from the source tables on the
+next read. ``KPI_SNAPSHOT_TTL`` forces a periodic rebuild as a safety net.
+"""
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import event, func, inspect, select
+
+from . import db
+from .models import Asset, Employee, KpiSnapshot, Maintenance, SoftwareLicense
+
+BUILT_AT = "_built_at"
+
+ASSETS_TOTAL = "assets.total"
+ASSETS_BY_TYPE = "assets.by_type:"
+ASSETS_BY_STATUS = "assets.by_status:"
+EMPLOYEES_TOTAL = "employees.total"
+LICENSES_TOTAL = "licenses.total"
+MAINTENANCE_TOTAL = "maintenance.total"
+MAINTENANCE_COST = "maintenance.cost_total"
+
+_table = KpiSnapshot.__table__
+
+
+class Kpis(dict):
+    """A snapshot read: plain ``key -> value`` plus helpers for grouped keys."""
+
+    def count(self, key):
+        return int(self.get(key, 0))
+
+    def group(self, prefix):
+        """``(label, count)`` pairs for a grouped KPI, largest first; blank labels become 'Unknown'."""
+        merged = {}
+        for key, value in self.items():
+            if key.startswith(prefix) and value:
+                label = key[len(prefix):] or 'Unknown'
+                merged[label] = merged.get(label, 0) + int(value)
+        return sorted(merged.items(), key=lambda item: (-item[1], item[0]))
+
+
+def _num(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _label(value):
+    return "" if value is None else str(value)
+
+
+def _bump(connection, deltas):
+    """Apply ``{key: delta}`` increments, creating missing rows."""
+    now = datetime.utcnow()
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        result = connection.execute(
+            _table.update()
+            .where(_table.c.key == key)
+            .values(value=_table.c.value + delta, updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(_table.insert().values(key=key, value=delta, updated_at=now))
+
+
+def mark_stale(connection=None):
+    """Force a rebuild on the next read (for bulk SQL that skips mapper events)."""
+    stmt = _table.delete().where(_table.c.key == BUILT_AT)
+    if connection is not None:
+        connection.execute(stmt)
+    else:
+        db.session.execute(stmt)
+
+
+def _previous(target, attr):
+    """``(changed, old_value)`` for an updated attribute; old is ``...`` when unknown."""
+    history = inspect(target).attrs[attr].history
+    if not history.has_changes():
+        return False, None
+    if history.deleted:
+        return True, history.deleted[0]
+    return True, ...
+
+
+# -------------------- Source aggregation --------------------
+def compute(connection):
+    """Aggregate every KPI straight from the source tables."""
+    values = {
+        ASSETS_TOTAL: connection.execute(select(func.count(Asset.id))).scalar() or 0,
+        EMPLOYEES_TOTAL: connection.execute(select(func.count(Employee.id))).scalar() or 0,
+        LICENSES_TOTAL: connection.execute(select(func.count(SoftwareLicense.id))).scalar() or 0,
+        MAINTENANCE_TOTAL: connection.execute(select(func.count(Maintenance.id))).scalar() or 0,
+        MAINTENANCE_COST: connection.execute(select(func.sum(Maintenance.cost))).scalar() or 0,
+    }
+    for column, prefix in ((Asset.asset_type, ASSETS_BY_TYPE), (Asset.status, ASSETS_BY_STATUS)):
+        for label, count in connection.execute(select(column, func.count(Asset.id)).group_by(column)):
+            key = prefix + _label(label)
+            values[key] = values.get(key, 0) + count
+    return values
+
+
+def rebuild():
+    """Replace the whole snapshot with freshly aggregated values."""
+    with db.engine.begin() as connection:
+        values = compute(connection)
+        values[BUILT_AT] = time.time()
+        now = datetime.utcnow()
+        connection.execute(_table.delete())
+        connection.execute(
+            _table.insert(),
+            [{"key": key, "value": value, "updated_at": now} for key, value in values.items()],
+        )
+    return Kpis((k, v) for k, v in values.items() if k != BUILT_AT)
+
+
+def snapshot():
+    """Current KPIs in a single keyed read, rebuilding first if stale or expired."""
+    rows = dict(db.session.execute(select(_table.c.key, _table.c.value)).all())
+    built_at = rows.pop(BUILT_AT, None)
+    ttl = current_app.config.get("KPI_SNAPSHOT_TTL", 0)
+    if built_at is None or (ttl and time.time() - built_at > ttl):
+        return rebuild()
+    return Kpis(rows)
+
+
+# -------------------- Write-through listeners --------------------
+def _asset_deltas(asset, sign):
+    return {
+        ASSETS_TOTAL: sign,
+        ASSETS_BY_TYPE + _label(asset.asset_type): sign,
+        ASSETS_BY_STATUS + _label(asset.status): sign,
+    }
+
+
+@event.listens_for(Asset, "after_insert")
+def _asset_inserted(mapper, connection, target):
+    _bump(connection, _asset_deltas(target, 1))
+
+
+@event.listens_for(Asset, "after_delete")
+def _asset_deleted(mapper, connection, target):
+    _bump(connection, _asset_deltas(target, -1))
+
+
+@event.listens_for(Asset, "after_update")
+def _asset_updated(mapper, connection, target):
+    deltas = {}
+    for attr, prefix in (("asset_type", ASSETS_BY_TYPE), ("status", ASSETS_BY_STATUS)):
+        changed, old = _previous(target, attr)
+        if not changed:
+            continue
+        if old is ...:
+            mark_stale(connection)
+            return
+        new_key, old_key = prefix + _label(getattr(target, attr)), prefix + _label(old)
+        if new_key != old_key:
+            deltas[old_key] = deltas.get(old_key, 0) - 1
+            deltas[new_key] = deltas.get(new_key, 0) + 1
+    _bump(connection, deltas)
+
+
+@event.listens_for(Employee, "after_insert")
+def _employee_inserted(mapper, connection, target):
+    _bump(connection, {EMPLOYEES_TOTAL: 1})
+
+
+@event.listens_for(Employee, "after_delete")
+def _employee_deleted(mapper, connection, target):
+    _bump(connection, {EMPLOYEES_TOTAL: -1})
+
+
+@event.listens_for(SoftwareLicense, "after_insert")
+def _license_inserted(mapper, connection, target):
+    _bump(connection, {LICENSES_TOTAL: 1})
+
+
+@event.listens_for(SoftwareLicense, "after_delete")
+def _license_deleted(mapper, connection, target):
+    _bump(connection, {LICENSES_TOTAL: -1})
+
+
+@event.listens_for(Maintenance, "after_insert")
+def _maintenance_inserted(mapper, connection, target):
+    _bump(connection, {MAINTENANCE_TOTAL: 1, MAINTENANCE_COST: _num(target.cost)})
+
+
+@event.listens_for(Maintenance, "after_delete")
+def _maintenance_deleted(mapper, connection, target):
+    _bump(connection, {MAINTENANCE_TOTAL: -1, MAINTENANCE_COST: -_num(target.cost)})
+
+
+@event.listens_for(Maintenance, "after_update")
+def _maintenance_updated(mapper, connection, target):
+    changed, old = _previous(target, "cost")
+    if not changed:
+        return
+    if old is ...:
+        mark_stale(connection)
+        return
+    _bump(connection, {MAINTENANCE_COST: _num(target.cost) - _num(old)})
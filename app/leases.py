@@ -0,0 +1,81 @@
+"""Database leases for work that must run in exactly one process.
+
+A lease is one ``scheduler_lease`` row naming its holder and an expiry time.
+The holder renews it on every heartbeat; any other process may take it over
+once it has expired. Acquiring and renewing are a single conditional UPDATE,
+so two processes (or hosts sharing the database) can never both succeed.
+"""
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, or_, select
+from sqlalchemy.exc import IntegrityError
+
+from . import db
+from .models import SchedulerLease
+
+_table = SchedulerLease.__table__
+
+
+def holder_id():
+    """Identity of this process: ``host:pid:random``."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class Lease:
+    """A named lease held (or wanted) by this process."""
+
+    def __init__(self, name, ttl, holder=None):
+        self.name = name
+        self.ttl = ttl
+        self.holder = holder or holder_id()
+
+    def acquire(self):
+        """Take or renew the lease; True if this process holds it afterwards."""
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.ttl)
+        with db.engine.begin() as conn:
+            result = conn.execute(
+                _table.update()
+                .where(_table.c.name == self.name)
+                .where(or_(_table.c.holder == self.holder, _table.c.expires_at < now))
+                .values(
+                    holder=self.holder,
+                    acquired_at=case((_table.c.holder == self.holder, _table.c.acquired_at), else_=now),
+                    heartbeat_at=now,
+                    expires_at=expires_at,
+                )
+            )
+            if result.rowcount:
+                return True
+            exists = conn.execute(select(_table.c.name).where(_table.c.name == self.name)).first()
+        if exists:
+            return False
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(_table.insert().values(
+                    name=self.name, holder=self.holder,
+                    acquired_at=now, heartbeat_at=now, expires_at=expires_at,
+                ))
+            return True
+        except IntegrityError:
+            # Another process created it first
+            return False
+
+    def release(self):
+        """Give the lease up early so another process can take over without waiting for expiry."""
+        with db.engine.begin() as conn:
+            conn.execute(
+                _table.update()
+                .where(_table.c.name == self.name, _table.c.holder == self.holder)
+                .values(expires_at=datetime.utcnow())
+            )
+
+    def current(self):
+        """``(holder, expires_at)`` of the row, or None."""
+        with db.engine.connect() as conn:
+            return conn.execute(
+                select(_table.c.holder, _table.c.expires_at).where(_table.c.name == self.name)
+            ).first()
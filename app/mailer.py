@@ -0,0 +1,119 @@
+"""Pooled, parallel SMTP delivery for notification mails.
+
+``deliver`` fans a batch of messages out over a bounded thread pool. Each
+worker opens one SMTP connection (``mail.connect()``) and reuses it for every
+message it sends, reconnecting only after a connection-level failure.
+Transient failures (4xx replies, dropped connections) are retried with
+exponential backoff and 5xx replies fail at once; the outcome for each
+recipient is returned so callers can report it.
+
+To try it locally, run a debugging SMTP server such as
+``python -m aiosmtpd -n -l localhost:1025`` and set ``MAIL_SERVER=localhost``,
+``MAIL_PORT=1025`` and ``MAIL_USE_TLS=false``.
+"""
+import logging
+import queue
+import smtplib
+import threading
+import time
+
+from flask import current_app
+
+from . import mail
+
+logger = logging.getLogger(__name__)
+
+def is_permanent(error):
+    """True for SMTP 5xx replies; 4xx replies (421, 451, ...) and connection errors are retried."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return bool(codes) and all(code >= 500 for code in codes)
+    code = getattr(error, "smtp_code", None)
+    return isinstance(code, int) and code >= 500
+
+
+class _Worker:
+    """One SMTP connection, reused across messages and reopened after failures."""
+
+    def __init__(self):
+        self.conn = None
+
+    def send(self, msg):
+        if self.conn is None:
+            conn = mail.connect()
+            conn.__enter__()
+            self.conn = conn
+        self.conn.send(msg)
+
+    def reset(self):
+        if self.conn is not None:
+            try:
+                self.conn.__exit__(None, None, None)
+            except Exception:
+                pass
+            self.conn = None
+
+
+def _send_with_retry(worker, msg, retries, backoff):
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            worker.send(msg)
+            return {'status': 'sent', 'attempts': attempts, 'error': None}
+        except Exception as e:
+            if is_permanent(e):
+                return {'status': 'failed', 'attempts': attempts, 'error': str(e)}
+            # Connection may be unusable now; start fresh on the next attempt
+            worker.reset()
+            if attempts > retries:
+                return {'status': 'failed', 'attempts': attempts, 'error': str(e)}
+            time.sleep(backoff * (2 ** (attempts - 1)))
+
+
+def _run_worker(app, pending, results, retries, backoff):
+    with app.app_context():
+        worker = _Worker()
+        try:
+            while True:
+                try:
+                    index, msg = pending.get_nowait()
+                except queue.Empty:
+                    return
+                results[index] = _send_with_retry(worker, msg, retries, backoff)
+        finally:
+            worker.reset()
+
+
+def deliver(messages):
+    """Send ``messages`` in parallel; returns one result dict per message, in order.
+
+    Each result has ``recipients``, ``status`` ('sent' or 'failed'),
+    ``attempts`` and ``error``.
+    """
+    if not messages:
+        return []
+    app = current_app._get_current_object()
+    workers = max(1, min(app.config.get('MAIL_MAX_WORKERS', 4), len(messages)))
+    retries = app.config.get('MAIL_SEND_RETRIES', 2)
+    backoff = app.config.get('MAIL_RETRY_BACKOFF', 1.0)
+
+    pending = queue.Queue()
+    for item in enumerate(messages):
+        pending.put(item)
+    results = [None] * len(messages)
+
+    threads = [
+        threading.Thread(target=_run_worker, args=(app, pending, results, retries, backoff), name=f"mailer-{n}")
+        for n in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for msg, result in zip(messages, results):
+        result['recipients'] = list(msg.recipients)
+        if result['status'] == 'failed':
+            logger.warning("Failed to send email to %s: %s", ", ".join(msg.recipients), result['error'])
+    return results
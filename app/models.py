@@ -1,27 +1,33 @@
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
-from . import db, login_manager
+from . import db, login_manager, passwords
 
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(120), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
-    role = db.Column(db.String(20), nullable=False, default="Employee")
+    password_hash = db.Column(db.String(256), nullable=False)
+    role = db.Column(db.String(20), nullable=False, default="Employee", index=True)
+    # The staff record whose assets this login sees on the employee dashboard
+    employee_id = db.Column(db.Integer, db.ForeignKey("employee.id"), nullable=True, unique=True, index=True)
+    employee = db.relationship("Employee", backref=db.backref("user", uselist=False))
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = passwords.hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return passwords.verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return passwords.needs_rehash(self.password_hash)
 
     def __repr__(self):
         return f"<User {self.username}>"
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    from .user_cache import load
+    return load(int(user_id))
 
 class Employee(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -33,21 +39,27 @@ class Employee(db.Model):
 class Asset(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     asset_id = db.Column(db.String(64), unique=True, nullable=False)
-    asset_type = db.Column(db.String(120))
-    brand = db.Column(db.String(120))
+    asset_type = db.Column(db.String(120), index=True)
+    brand = db.Column(db.String(120), index=True)
     model = db.Column(db.String(120))
     serial_no = db.Column(db.String(120))
     purchase_date = db.Column(db.Date)
-    warranty_expiry = db.Column(db.Date)
-    status = db.Column(db.String(50))
+    warranty_expiry = db.Column(db.Date, index=True)
+    status = db.Column(db.String(50), index=True)
     notes = db.Column(db.Text)
-    assigned_to = db.Column(db.Integer, db.ForeignKey("employee.id"))
+    assigned_to = db.Column(db.Integer, db.ForeignKey("employee.id"), index=True)
     maintenances = db.relationship("Maintenance", backref="asset", lazy=True)
 
 class Maintenance(db.Model):
+    __table_args__ = (
+        # Pending list: status='Pending' ORDER BY date DESC
+        db.Index("ix_maintenance_status_date", "status", "date"),
+        # Recently approved: status='Approved' ORDER BY approved_at DESC
+        db.Index("ix_maintenance_status_approved_at", "status", "approved_at"),
+    )
     id = db.Column(db.Integer, primary_key=True)
-    asset_id = db.Column(db.Integer, db.ForeignKey("asset.id"))
-    date = db.Column(db.Date, default=datetime.utcnow)
+    asset_id = db.Column(db.Integer, db.ForeignKey("asset.id"), index=True)
+    date = db.Column(db.Date, default=datetime.utcnow, index=True)
     description = db.Column(db.Text)
     cost = db.Column(db.Float)
     status = db.Column(db.String(20), default="Pending")
@@ -58,5 +70,75 @@ class SoftwareLicense(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     software_name = db.Column(db.String(120))
     license_key = db.Column(db.String(120))
-    expiry_date = db.Column(db.Date)
-    assigned_to = db.Column(db.Integer, db.ForeignKey("employee.id"))
+    expiry_date = db.Column(db.Date, index=True)
+    assigned_to = db.Column(db.Integer, db.ForeignKey("employee.id"), index=True)
+    employee = db.relationship("Employee", backref="licenses")
+
+class KpiSnapshot(db.Model):
+    """Materialized dashboard counters, kept current by the listeners in app/kpis.py."""
+    __tablename__ = "kpi_snapshot"
+    key = db.Column(db.String(190), primary_key=True)
+    value = db.Column(db.Float, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ExportJob(db.Model):
+    """A background export run and its on-disk artifact (see app/export_jobs.py)."""
+    __tablename__ = "export_job"
+    id = db.Column(db.String(32), primary_key=True)
+    fmt = db.Column(db.String(10), nullable=False)
+    datasets = db.Column(db.String(120), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default="Queued")
+    rows_total = db.Column(db.Integer, default=0)
+    rows_done = db.Column(db.Integer, default=0)
+    path = db.Column(db.String(255))
+    error = db.Column(db.Text)
+    requested_by = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    heartbeat_at = db.Column(db.DateTime)  # last progress written by the worker
+    finished_at = db.Column(db.DateTime)
+    expires_at = db.Column(db.DateTime, index=True)
+
+    @property
+    def progress(self):
+        if self.status == "Done":
+            return 100
+        if not self.rows_total:
+            return 0
+        return min(99, int(100 * (self.rows_done or 0) / self.rows_total))
+
+class SchedulerLease(db.Model):
+    """Leader lease for a singleton background task (see app/leases.py)."""
+    __tablename__ = "scheduler_lease"
+    name = db.Column(db.String(64), primary_key=True)
+    holder = db.Column(db.String(190), nullable=False)
+    acquired_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+class IdCounter(db.Model):
+    """Named counters handed out in blocks (see app/asset_ids.py)."""
+    __tablename__ = "id_counter"
+    name = db.Column(db.String(64), primary_key=True)
+    last_value = db.Column(db.Integer, nullable=False, default=0)
+
+class ExpiryEvent(db.Model):
+    """One license or warranty expiry date, kept in step with its source row (see app/expiries.py)."""
+    __tablename__ = "expiry_event"
+    kind = db.Column(db.String(16), primary_key=True)
+    ref_id = db.Column(db.Integer, primary_key=True)
+    expires_on = db.Column(db.Date, nullable=False)
+    __table_args__ = (
+        db.Index("ix_expiry_event_expires_on", "expires_on", "kind", "ref_id"),
+        db.Index("ix_expiry_event_kind_expires_on", "kind", "expires_on", "ref_id"),
+    )
+
+class NotificationDelivery(db.Model):
+    """An expiry notice already sent for one item, recipient and threshold (see app/notification_ledger.py)."""
+    __tablename__ = "notification_delivery"
+    kind = db.Column(db.String(16), primary_key=True)
+    ref_id = db.Column(db.Integer, primary_key=True)
+    expires_on = db.Column(db.Date, primary_key=True)
+    recipient = db.Column(db.String(120), primary_key=True)
+    bucket = db.Column(db.Integer, primary_key=True)
+    sent_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (db.Index("ix_notification_delivery_kind_expires_on", "kind", "expires_on"),)
@@ -0,0 +1,131 @@
+"""Delivery ledger for expiry notifications.
+
+The daily runs would otherwise mail every assignee about every item in the
+window each day. Instead each item falls into a threshold bucket by days left
+(``NOTIFICATION_THRESHOLDS``, default 30/14/7/1: 20 days left is the 30 bucket,
+5 days left the 7 bucket; items further out than every threshold use the run's
+window), and ``notification_delivery`` records one row per
+``(item, expiry date, recipient, bucket)`` that was sent. A recipient only gets
+a mail for items that reached a bucket not yet recorded for them, so a re-run
+on the same day sends nothing and an item mails each recipient about four
+times in total. A renewed item (new expiry date) starts over.
+
+A run reads the ledger for its kind and window in one indexed range query
+and keeps only reads in its session until the mail has gone out, so no write
+lock is held during SMTP delivery. ``save`` then records rows for the messages
+the mailer reports as sent (failed ones go again next run) and prunes rows
+whose items have already expired, in one short transaction. While Flask-Mail
+is suppressed (tests, benchmarks) nothing is actually delivered, so nothing is
+recorded.
+"""
+from datetime import datetime
+
+from flask import current_app, has_app_context
+from sqlalchemy import delete, insert, select
+
+from . import db
+from .expiries import LICENSE, WARRANTY
+from .models import NotificationDelivery
+
+DEFAULT_THRESHOLDS = (30, 14, 7, 1)
+
+EXPIRY_ATTRS = {LICENSE: "expiry_date", WARRANTY: "warranty_expiry"}
+
+
+def thresholds():
+    """Configured day thresholds, largest first."""
+    raw = current_app.config.get("NOTIFICATION_THRESHOLDS", DEFAULT_THRESHOLDS)
+    if isinstance(raw, str):
+        raw = [part for part in raw.split(",") if part.strip()]
+    return sorted({int(days) for days in raw}, reverse=True)
+
+
+def _mail_suppressed():
+    state = current_app.extensions.get("mail") if has_app_context() else None
+    return bool(getattr(state, "suppress", False))
+
+
+def bucket_for(days_left, window_days, steps):
+    """The smallest threshold that still covers ``days_left`` (``window_days`` beyond them all)."""
+    covering = [days for days in steps if days >= days_left]
+    return min(covering) if covering else window_days
+
+
+class Ledger:
+    """Ledger state for one notification run of one kind."""
+
+    def __init__(self, kind, today, window_days, resend=False):
+        self.kind = kind
+        self.today = today
+        self.window_days = window_days
+        self.resend = resend
+        self.steps = thresholds()
+        self._attr = EXPIRY_ATTRS[kind]
+        self._sent = set()
+        self._pending = []
+
+    def load(self, window_end):
+        """Read what was already sent for items expiring in this run's window."""
+        rows = db.session.execute(
+            select(
+                NotificationDelivery.ref_id,
+                NotificationDelivery.expires_on,
+                NotificationDelivery.recipient,
+                NotificationDelivery.bucket,
+            ).where(
+                NotificationDelivery.kind == self.kind,
+                NotificationDelivery.expires_on >= self.today,
+                NotificationDelivery.expires_on <= window_end,
+            )
+        )
+        self._sent = {tuple(row) for row in rows}
+        return self
+
+    def _key(self, item, recipient):
+        expires_on = getattr(item, self._attr)
+        days_left = (expires_on - self.today).days
+        return item.id, expires_on, recipient.lower(), bucket_for(days_left, self.window_days, self.steps)
+
+    def unsent(self, items, recipient):
+        """The ``items`` whose current bucket has not been sent to ``recipient`` yet (all with ``resend``)."""
+        if self.resend:
+            return list(items)
+        return [item for item in items if self._key(item, recipient) not in self._sent]
+
+    def mark_sent(self, items, recipient):
+        for item in items:
+            key = self._key(item, recipient)
+            if key not in self._sent:
+                self._sent.add(key)
+                self._pending.append(key)
+
+    def save(self):
+        """Prune expired rows, insert the ones recorded by ``mark_sent`` and commit."""
+        if _mail_suppressed():
+            self._pending = []
+            db.session.rollback()
+            return
+        db.session.execute(
+            delete(NotificationDelivery).where(
+                NotificationDelivery.kind == self.kind,
+                NotificationDelivery.expires_on < self.today,
+            )
+        )
+        if self._pending:
+            now = datetime.utcnow()
+            db.session.execute(
+                insert(NotificationDelivery).prefix_with("OR IGNORE", dialect="sqlite"),
+                [
+                    {
+                        "kind": self.kind,
+                        "ref_id": ref_id,
+                        "expires_on": expires_on,
+                        "recipient": recipient,
+                        "bucket": bucket,
+                        "sent_at": now,
+                    }
+                    for ref_id, expires_on, recipient, bucket in self._pending
+                ],
+            )
+            self._pending = []
+        db.session.commit()
@@ -0,0 +1,102 @@
+"""Password hashing off the request path.
+
+Hashes use werkzeug's format with the method and salt length from
+``PASSWORD_HASH_METHOD`` / ``PASSWORD_SALT_LENGTH``. The work runs on a small
+per-process thread pool of ``PASSWORD_HASH_WORKERS`` threads; hashlib's scrypt
+and PBKDF2 release the GIL, so hashing uses at most that many cores per
+worker process however many logins arrive, and other request threads keep
+running while one waits.
+
+Verifications (logins, current-password checks) are also limited to
+``LOGIN_CONCURRENCY`` in flight per process. A caller that cannot get a slot
+within ``LOGIN_QUEUE_TIMEOUT`` seconds gets ``HashingBusy`` and the view asks
+the user to retry, instead of queueing unbounded CPU work.
+
+``needs_rehash`` compares a stored hash's parameters with the configured ones;
+the login view uses it to upgrade old hashes with the password it has just
+verified. Outside an app context (scripts) hashing runs inline with the
+defaults.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+DEFAULT_SALT_LENGTH = 16
+
+
+class HashingBusy(RuntimeError):
+    """Raised when no login slot frees up within ``LOGIN_QUEUE_TIMEOUT``."""
+
+
+class PasswordHasher:
+    """Bounded executor plus the configured hash parameters for one app."""
+
+    def __init__(self, method=DEFAULT_METHOD, salt_length=DEFAULT_SALT_LENGTH, workers=2,
+                 concurrency=8, queue_timeout=5.0):
+        self.method = method
+        self.salt_length = salt_length
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(max(1, concurrency))
+        self._prefix = None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            method=config.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD),
+            salt_length=config.get("PASSWORD_SALT_LENGTH", DEFAULT_SALT_LENGTH),
+            workers=config.get("PASSWORD_HASH_WORKERS", 2),
+            concurrency=config.get("LOGIN_CONCURRENCY", 8),
+            queue_timeout=config.get("LOGIN_QUEUE_TIMEOUT", 5.0),
+        )
+
+    def hash(self, password):
+        return self._executor.submit(generate_password_hash, password, self.method, self.salt_length).result()
+
+    def verify(self, stored, password):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise HashingBusy("Too many sign-ins in progress")
+        try:
+            return self._executor.submit(check_password_hash, stored, password).result()
+        finally:
+            self._slots.release()
+
+    @property
+    def prefix(self):
+        """Method string as werkzeug writes it (``pbkdf2`` expands to ``pbkdf2:sha256:<n>``)."""
+        if self._prefix is None:
+            # Let werkzeug expand short names; done once per process
+            self._prefix = generate_password_hash("", self.method, 1).split("$", 1)[0]
+        return self._prefix
+
+    def needs_rehash(self, stored):
+        method, _, rest = (stored or "").partition("$")
+        salt = rest.partition("$")[0]
+        return method != self.prefix or len(salt) != self.salt_length
+
+
+def hasher():
+    """The hasher for the current app (created on first use)."""
+    ext = current_app.extensions
+    if "passwords" not in ext:
+        ext["passwords"] = PasswordHasher.from_config(current_app.config)
+    return ext["passwords"]
+
+
+def hash_password(password):
+    if not has_app_context():
+        return generate_password_hash(password, DEFAULT_METHOD, DEFAULT_SALT_LENGTH)
+    return hasher().hash(password)
+
+
+def verify_password(stored, password):
+    if not has_app_context():
+        return check_password_hash(stored, password)
+    return hasher().verify(stored, password)
+
+
+def needs_rehash(stored):
+    return hasher().needs_rehash(stored)
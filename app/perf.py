@@ -0,0 +1,202 @@
+"""Per-request performance instrumentation.
+
+For every request this records wall time, the number of SQL statements and
+the time spent in them, and template render time, keyed by endpoint. Each
+endpoint keeps totals plus a rolling window of the last ``PERF_WINDOW``
+requests, from which p50/p95/p99 are computed on read. With
+``PERF_SERVER_TIMING`` on, responses to Admin sessions also carry a
+``Server-Timing`` header so the numbers show up in browser dev tools.
+
+Statements are timed with engine ``before/after_cursor_execute`` events and
+attributed to the request running on the same app context; statements from
+background threads (exports, mail, scheduler) are not counted against any
+endpoint. Every statement is also handed to :mod:`app.slow_queries` for
+per-fingerprint totals and the slow-query log. Stats are in-memory and per
+process.
+"""
+import threading
+import time
+from collections import deque
+
+from flask import before_render_template, current_app, g, has_app_context, has_request_context, request, template_rendered
+from flask_login import current_user
+from sqlalchemy import event
+
+from .slow_queries import SlowQueryLog
+
+PERCENTILES = (50, 95, 99)
+METRICS = ("wall_ms", "sql_count", "sql_ms", "template_ms")
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
+
+
+class EndpointStats:
+    """Totals and a rolling window of recent samples for one endpoint."""
+
+    def __init__(self, window):
+        self.count = 0
+        self.errors = 0
+        self.totals = dict.fromkeys(METRICS, 0)
+        self.maxima = dict.fromkeys(METRICS, 0)
+        self.recent = deque(maxlen=window)
+
+    def add(self, sample, status_code):
+        self.count += 1
+        if status_code >= 500:
+            self.errors += 1
+        for metric in METRICS:
+            self.totals[metric] += sample[metric]
+            self.maxima[metric] = max(self.maxima[metric], sample[metric])
+        self.recent.append(sample)
+
+    def summary(self, endpoint):
+        row = {"endpoint": endpoint, "count": self.count, "errors": self.errors, "window": len(self.recent)}
+        for metric in METRICS:
+            values = sorted(sample[metric] for sample in self.recent)
+            row[metric] = {
+                "avg": round(self.totals[metric] / self.count, 2) if self.count else 0,
+                "max": round(self.maxima[metric], 2),
+                "total": round(self.totals[metric], 2),
+            }
+            for pct in PERCENTILES:
+                row[metric][f"p{pct}"] = round(_percentile(values, pct), 2)
+        return row
+
+
+class PerfRegistry:
+    """All endpoint stats for this process."""
+
+    def __init__(self, window):
+        self.window = window
+        self.started_at = time.time()
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, sample, status_code):
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = EndpointStats(self.window)
+            stats.add(sample, status_code)
+
+    def snapshot(self):
+        """Per-endpoint summaries, slowest total wall time first."""
+        with self._lock:
+            rows = [stats.summary(endpoint) for endpoint, stats in self._stats.items()]
+        return sorted(rows, key=lambda row: -row["wall_ms"]["total"])
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.started_at = time.time()
+
+
+def registry(app):
+    return app.extensions["perf"]
+
+
+def _current():
+    """The sample being collected for the request on this context, if any."""
+    if not has_app_context():
+        return None
+    return g.get("_perf")
+
+
+# -------------------- Hooks --------------------
+def _before_request():
+    g._perf = {
+        "start": time.perf_counter(),
+        "sql_count": 0,
+        "sql_ms": 0.0,
+        "template_ms": 0.0,
+        "template_depth": 0,
+        "template_start": 0.0,
+    }
+
+
+def _after_request(response):
+    sample = g.pop("_perf", None)
+    if sample is None or request.endpoint == "static":
+        return response
+    wall_ms = (time.perf_counter() - sample["start"]) * 1000
+    record = {
+        "wall_ms": wall_ms,
+        "sql_count": sample["sql_count"],
+        "sql_ms": sample["sql_ms"],
+        "template_ms": sample["template_ms"],
+    }
+    registry(current_app).record(request.endpoint or "<unmatched>", record, response.status_code)
+    if not _server_timing_allowed():
+        return response
+    response.headers.add(
+        "Server-Timing",
+        f'app;dur={wall_ms:.1f}, db;dur={sample["sql_ms"]:.1f};desc="{sample["sql_count"]} queries", '
+        f'tpl;dur={sample["template_ms"]:.1f}',
+    )
+    return response
+
+
+def _server_timing_allowed():
+    # Backend timings are for admins only; everyone else gets no header
+    if not current_app.config.get("PERF_SERVER_TIMING", False):
+        return False
+    return current_user.is_authenticated and current_user.role == "Admin"
+
+
+def _before_render(sender, template, context, **extra):
+    sample = _current()
+    if sample is None:
+        return
+    if sample["template_depth"] == 0:
+        sample["template_start"] = time.perf_counter()
+    sample["template_depth"] += 1
+
+
+def _rendered(sender, template, context, **extra):
+    sample = _current()
+    if sample is None or sample["template_depth"] == 0:
+        return
+    sample["template_depth"] -= 1
+    if sample["template_depth"] == 0:
+        sample["template_ms"] += (time.perf_counter() - sample["template_start"]) * 1000
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("perf_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(statements, conn, statement, parameters, executemany):
+    starts = conn.info.get("perf_start")
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+    sample = _current()
+    if sample is not None:
+        sample["sql_count"] += 1
+        sample["sql_ms"] += elapsed_ms
+    endpoint = request.endpoint if has_request_context() else None
+    statements.observe(conn, statement, parameters, executemany, elapsed_ms, endpoint)
+
+
+def init_app(app, engine):
+    """Install the request, template and SQL hooks on ``app`` and ``engine``."""
+    if not app.config.get("PERF_ENABLED", True):
+        return
+    app.extensions["perf"] = PerfRegistry(app.config.get("PERF_WINDOW", 1000))
+    statements = app.extensions["slow_queries"] = SlowQueryLog.from_config(app.config)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_rendered, app)
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _after_cursor_execute(statements, conn, statement, parameters, executemany)
+
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
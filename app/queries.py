@@ -0,0 +1,144 @@
+from dataclasses import dataclass, field
+
+from flask import current_app
+from sqlalchemy.orm import joinedload, raiseload
+
+from .models import Asset, Employee, Maintenance, SoftwareLicense
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+ASSET_FILTER_FIELDS = ("status", "asset_type", "brand", "assigned_to")
+
+
+@dataclass
+class KeysetPage:
+    """One page of a keyset (seek) paginated query."""
+    items: list = field(default_factory=list)
+    next_cursor: int | None = None
+    prev_cursor: int | None = None
+    per_page: int = DEFAULT_PAGE_SIZE
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+
+def parse_int(value, default=None):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def page_size(value):
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE."""
+    size = parse_int(value, DEFAULT_PAGE_SIZE)
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def _eager(query, *relationships):
+    """Join-load ``relationships`` and, in strict mode, forbid every other lazy load.
+
+    With ``RAISE_ON_LAZY_LOAD`` on, touching a relationship the view did not ask
+    for (for example from a template loop) raises instead of quietly issuing one
+    SELECT per row.
+    """
+    options = [joinedload(rel) for rel in relationships]
+    if current_app.config.get("RAISE_ON_LAZY_LOAD"):
+        options = [opt.raiseload("*") for opt in options]
+        options.append(raiseload("*"))
+    return query.options(*options) if options else query
+
+
+def asset_query():
+    """Assets with their assignee joined in (assets list, exports, warranty mails)."""
+    return _eager(Asset.query, Asset.employee)
+
+
+def maintenance_query():
+    """Maintenance records with their asset joined in (maintenance list, dashboards)."""
+    return _eager(Maintenance.query, Maintenance.asset)
+
+
+def license_query():
+    """Licenses with their assignee joined in (licenses list, exports, license mails)."""
+    return _eager(SoftwareLicense.query, SoftwareLicense.employee)
+
+
+def employee_query():
+    """Employees on their own; the list and exports only read scalar columns."""
+    return _eager(Employee.query)
+
+
+def asset_filters_from_args(args):
+    """Pick the supported asset filters out of request args, dropping blanks."""
+    filters = {}
+    for name in ASSET_FILTER_FIELDS:
+        value = str(args.get(name) or "").strip()
+        if value:
+            filters[name] = value
+    return filters
+
+
+def asset_filter_clauses(filters):
+    """WHERE clauses for the asset list filters (shared by the list and bulk updates).
+
+    ``assigned_to`` accepts an Employee id or ``"none"`` for unassigned assets.
+    """
+    clauses = []
+    if filters.get("status"):
+        clauses.append(Asset.status == filters["status"])
+    if filters.get("asset_type"):
+        clauses.append(Asset.asset_type == filters["asset_type"])
+    if filters.get("brand"):
+        clauses.append(Asset.brand == filters["brand"])
+    assignee = filters.get("assigned_to")
+    if assignee == "none":
+        clauses.append(Asset.assigned_to.is_(None))
+    elif assignee is not None:
+        emp_id = parse_int(assignee)
+        if emp_id is not None:
+            clauses.append(Asset.assigned_to == emp_id)
+    return clauses
+
+
+def filtered_assets(filters):
+    """Asset query with the server-side list filters applied."""
+    return asset_query().filter(*asset_filter_clauses(filters))
+
+
+def keyset_page(query, column, after=None, before=None, per_page=DEFAULT_PAGE_SIZE):
+    """Seek-paginate ``query`` on a unique, indexed ``column``.
+
+    Each page is a single ``WHERE column > :cursor ORDER BY column LIMIT n+1``
+    (or the reverse for ``before``), so the cost does not depend on how deep
+    the page is. The extra row only tells us whether another page exists.
+    """
+    key = column.key
+    if before is not None:
+        rows = query.filter(column < before).order_by(column.desc()).limit(per_page + 1).all()
+        more_before = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        return KeysetPage(
+            items=rows,
+            next_cursor=getattr(rows[-1], key) if rows else None,
+            prev_cursor=getattr(rows[0], key) if rows and more_before else None,
+            per_page=per_page,
+        )
+
+    if after is not None:
+        query = query.filter(column > after)
+    rows = query.order_by(column.asc()).limit(per_page + 1).all()
+    more_after = len(rows) > per_page
+    rows = rows[:per_page]
+    return KeysetPage(
+        items=rows,
+        next_cursor=getattr(rows[-1], key) if rows and more_after else None,
+        prev_cursor=getattr(rows[0], key) if rows and after is not None else None,
+        per_page=per_page,
+    )
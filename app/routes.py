@@ -1,19 +1,24 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from functools import wraps
-from flask import Blueprint, render_template, redirect, url_for, flash, request, Response, current_app
+from contextlib import nullcontext
+from flask import Blueprint, Response, render_template, redirect, url_for, flash, request, current_app, jsonify, send_file, abort, has_app_context
 from flask_login import login_user, logout_user, login_required, current_user
-from .models import User, Asset, Employee, Maintenance, SoftwareLicense
-from . import db, mail, MAIL_AVAILABLE
-import csv
-from io import StringIO, BytesIO
-
-# Optional imports
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-    pd = None
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, load_only
+from .models import User, Asset, Employee, Maintenance, SoftwareLicense, ExportJob
+from . import db, MAIL_AVAILABLE
+from . import kpis, bulk_ops, expiries, export_jobs, importer, mailer, notification_ledger, sqlite_profile
+from . import employee_dashboard as employee_dashboards
+from .email_render import ExpiryMailRenderer
+from .exports import OPENPYXL_AVAILABLE, csv_response, excel_response
+from .search import search_assets
+from .asset_ids import next_asset_id
+from .passwords import HashingBusy
+from .analytics import MONTHS, maintenance_cost_years, monthly_maintenance_costs, selected_cost_year
+from .queries import (
+    asset_filters_from_args, filtered_assets, keyset_page, page_size, parse_int,
+    asset_query, employee_query, license_query, maintenance_query,
+)
 
 if MAIL_AVAILABLE:
     from flask_mail import Message
@@ -82,6 +87,10 @@ def register():
             role = "Admin"
         user = User(username=username, email=email, role=role)
         user.set_password(password)
+        # Link to the staff record with the same email, if it is not taken yet
+        employee = Employee.query.filter(db.func.lower(Employee.contact) == email.lower(), ~Employee.user.has()).first()
+        if employee is not None:
+            user.employee_id = employee.id
         db.session.add(user)
         db.session.commit()
         flash("Registered successfully, please login", "success")
@@ -96,12 +105,21 @@ def login():
         username = request.form["username"]
         password = request.form["password"]
         user = User.query.filter_by(username=username).first()
-        
+
+        try:
+            valid = user is not None and user.check_password(password)
+        except HashingBusy:
+            flash("Too many sign-ins right now - please try again in a moment", "warning")
+            return redirect(url_for("main.login"))
         if not user:
             flash("Invalid username - User not found", "danger")
-        elif not user.check_password(password):
+        elif not valid:
             flash("Invalid password - Please try again", "danger")
         else:
+            if user.password_needs_rehash():
+                # Upgrade hashes made with older parameters while we have the password
+                user.set_password(password)
+                db.session.commit()
             login_user(user)
             return redirect(url_for("main.dashboard"))
             
@@ -124,7 +142,12 @@ def change_password():
         new_password = request.form.get("new_password", "")
         confirm_password = request.form.get("confirm_password", "")
 
-        if not current_user.check_password(current_password):
+        try:
+            valid = current_user.check_password(current_password)
+        except HashingBusy:
+            flash("Server is busy - please try again in a moment", "warning")
+            return redirect(url_for("main.change_password"))
+        if not valid:
             flash("Current password is incorrect", "danger")
             return redirect(url_for("main.change_password"))
 
@@ -148,30 +171,26 @@ def change_password():
 @login_required
 @role_required("Admin")
 def admin_dashboard():
-    total_assets = Asset.query.count()
-    total_employees = Employee.query.count()
-    total_licenses = SoftwareLicense.query.count()
-    maintenance_count = Maintenance.query.count()
-    pending_maintenances = Maintenance.query.filter_by(status='Pending').order_by(Maintenance.date.desc()).limit(5).all()
-    recent_approved = Maintenance.query.filter_by(status='Approved').order_by(Maintenance.approved_at.desc()).limit(5).all()
+    snapshot = kpis.snapshot()
+    total_assets = snapshot.count(kpis.ASSETS_TOTAL)
+    total_employees = snapshot.count(kpis.EMPLOYEES_TOTAL)
+    total_licenses = snapshot.count(kpis.LICENSES_TOTAL)
+    maintenance_count = snapshot.count(kpis.MAINTENANCE_TOTAL)
+    pending_maintenances = maintenance_query().filter_by(status='Pending').order_by(Maintenance.date.desc()).limit(5).all()
+    recent_approved = maintenance_query().filter_by(status='Approved').order_by(Maintenance.approved_at.desc()).limit(5).all()
     
     # Asset distribution by type
     asset_types = []
     asset_counts = []
-    from sqlalchemy import func
-    asset_data = db.session.query(Asset.asset_type, func.count(Asset.id)).group_by(Asset.asset_type).all()
-    for asset_type, count in asset_data:
-        asset_types.append(asset_type or 'Unknown')
+    for asset_type, count in snapshot.group(kpis.ASSETS_BY_TYPE):
+        asset_types.append(asset_type)
         asset_counts.append(count)
     
-    # Monthly maintenance cost
-    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    monthly_costs = [0] * 12
-    maintenance_records = Maintenance.query.all()
-    for record in maintenance_records:
-        if record.date:
-            month = record.date.month - 1  # 0-indexed
-            monthly_costs[month] += record.cost or 0
+    # Monthly maintenance cost for the selected year
+    months = MONTHS
+    cost_years = maintenance_cost_years()
+    cost_year = selected_cost_year(request.args.get("year"), cost_years)
+    monthly_costs = monthly_maintenance_costs(cost_year)
     
     return render_template("dashboards/admin.html", **locals())
 
@@ -179,9 +198,60 @@ def admin_dashboard():
 @login_required
 @role_required("Admin")
 def admin_users():
-    users = User.query.order_by(User.id.asc()).all()
+    users = User.query.options(joinedload(User.employee)).order_by(User.id.asc()).all()
     return render_template("users/manage.html", users=users)
 
+@main.route("/admin/diagnostics")
+@login_required
+@role_required("Admin")
+def admin_diagnostics():
+    info = sqlite_profile.diagnostics(db.engine, current_app.config)
+    return render_template("admin/diagnostics.html", info=info)
+
+@main.route("/admin/perf")
+@login_required
+@role_required("Admin")
+def admin_perf():
+    perf_registry = current_app.extensions.get("perf")
+    rows = perf_registry.snapshot() if perf_registry else []
+    since = datetime.utcfromtimestamp(perf_registry.started_at) if perf_registry else None
+    slow_log = current_app.extensions.get("slow_queries")
+    statements, slow = slow_log.snapshot() if slow_log else ([], [])
+    slow = [dict(entry, at=datetime.utcfromtimestamp(entry["at"])) for entry in slow]
+    return render_template(
+        "admin/perf.html", rows=rows, perf_registry=perf_registry, since=since,
+        slow_log=slow_log, statements=statements, slow=slow,
+    )
+
+@main.route("/admin/perf.json")
+@login_required
+@role_required("Admin")
+def admin_perf_json():
+    perf_registry = current_app.extensions.get("perf")
+    if perf_registry is None:
+        return jsonify({"enabled": False, "endpoints": [], "statements": [], "slow": []})
+    statements, slow = current_app.extensions["slow_queries"].snapshot()
+    slow = [dict(entry, at=datetime.utcfromtimestamp(entry["at"]).isoformat()) for entry in slow]
+    return jsonify({
+        "enabled": True,
+        "since": datetime.utcfromtimestamp(perf_registry.started_at).isoformat(),
+        "window": perf_registry.window,
+        "endpoints": perf_registry.snapshot(),
+        "statements": statements,
+        "slow": slow,
+    })
+
+@main.route("/admin/perf/reset", methods=["POST"])
+@login_required
+@role_required("Admin")
+def admin_perf_reset():
+    perf_registry = current_app.extensions.get("perf")
+    if perf_registry:
+        perf_registry.reset()
+        current_app.extensions["slow_queries"].reset()
+    flash("Performance stats reset", "info")
+    return redirect(url_for("main.admin_perf"))
+
 @main.route("/admin/users/<int:user_id>/role", methods=["POST"])
 @login_required
 @role_required("Admin")
@@ -210,6 +280,35 @@ def admin_user_reset_password(user_id):
     flash("Password reset successfully", "success")
     return redirect(url_for("main.admin_users"))
 
+@main.route("/admin/users/<int:user_id>/employee", methods=["POST"])
+@login_required
+@role_required("Admin")
+def admin_user_link_employee(user_id):
+    """Link a login to its employee record by id, or by matching email when left blank."""
+    user = User.query.get_or_404(user_id)
+    if request.form.get("unlink"):
+        user.employee_id = None
+        db.session.commit()
+        flash("Employee link removed", "info")
+        return redirect(url_for("main.admin_users"))
+    raw = request.form.get("employee_id", "").strip()
+    if raw:
+        employee_id = parse_int(raw)
+        employee = db.session.get(Employee, employee_id) if employee_id else None
+    else:
+        employee = Employee.query.filter(db.func.lower(Employee.contact) == user.email.lower()).first()
+    if employee is None:
+        flash("No matching employee found", "warning")
+        return redirect(url_for("main.admin_users"))
+    taken = User.query.filter(User.employee_id == employee.id, User.id != user.id).first()
+    if taken:
+        flash(f"Employee {employee.name} is already linked to {taken.username}", "danger")
+        return redirect(url_for("main.admin_users"))
+    user.employee_id = employee.id
+    db.session.commit()
+    flash(f"{user.username} linked to {employee.name}", "success")
+    return redirect(url_for("main.admin_users"))
+
 @main.route("/admin/users/<int:user_id>/delete", methods=["POST"])
 @login_required
 @role_required("Admin")
@@ -227,28 +326,23 @@ def admin_user_delete(user_id):
 @login_required
 @role_required("Admin", "IT")
 def it_dashboard():
-    pending_maintenance = Maintenance.query.order_by(Maintenance.date.desc()).limit(5).all()
-    assets_repair = Asset.query.filter_by(status="Repair").count()
-    licenses_expiring = SoftwareLicense.query.order_by(SoftwareLicense.expiry_date).limit(5).all()
+    pending_maintenance = maintenance_query().order_by(Maintenance.date.desc()).limit(5).all()
+    assets_repair = kpis.snapshot().count(kpis.ASSETS_BY_STATUS + "Repair")
+    licenses_expiring = expiries.resolve(expiries.upcoming(5, [expiries.LICENSE]))
+    warranties_expiring = expiries.resolve(expiries.upcoming(5, [expiries.WARRANTY]))
     
-    # License expiry by month
-    expiry_months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    expiry_counts = [0] * 12
-    from datetime import date
-    licenses = SoftwareLicense.query.filter(SoftwareLicense.expiry_date >= date.today()).all()
-    for lic in licenses:
-        if lic.expiry_date:
-            month = lic.expiry_date.month - 1  # 0-indexed
-            expiry_counts[month] += 1
+    # License expiries per month over the next twelve months
+    expiry_months = []
+    expiry_counts = []
+    for month, count in expiries.monthly_counts(date.today(), 12, [expiries.LICENSE]):
+        expiry_months.append(month.strftime('%b %Y'))
+        expiry_counts.append(count)
     
-    # Monthly maintenance cost
-    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    monthly_costs = [0] * 12
-    maintenance_records = Maintenance.query.all()
-    for record in maintenance_records:
-        if record.date:
-            month = record.date.month - 1  # 0-indexed
-            monthly_costs[month] += record.cost or 0
+    # Monthly maintenance cost for the selected year
+    months = MONTHS
+    cost_years = maintenance_cost_years()
+    cost_year = selected_cost_year(request.args.get("year"), cost_years)
+    monthly_costs = monthly_maintenance_costs(cost_year)
     
     return render_template("dashboards/it.html", **locals())
 
@@ -256,19 +350,19 @@ def it_dashboard():
 @login_required
 @role_required("Admin", "Manager")
 def manager_dashboard():
-    total_assets = Asset.query.count()
-    maintenance_cost = db.session.query(db.func.sum(Maintenance.cost)).scalar() or 0
-    licenses_expiring = SoftwareLicense.query.order_by(SoftwareLicense.expiry_date).limit(5).all()
-    warranties_expiring = Asset.query.order_by(Asset.warranty_expiry).limit(5).all()
-    active_licenses = SoftwareLicense.query.count()
+    snapshot = kpis.snapshot()
+    total_assets = snapshot.count(kpis.ASSETS_TOTAL)
+    maintenance_cost = snapshot.get(kpis.MAINTENANCE_COST, 0)
+    licenses_expiring = expiries.resolve(expiries.upcoming(5, [expiries.LICENSE]))
+    warranties_expiring = expiries.resolve(expiries.upcoming(5, [expiries.WARRANTY]))
+    active_licenses = snapshot.count(kpis.LICENSES_TOTAL)
+    today = date.today()
     
     # Asset status distribution
     status_labels = []
     status_counts = []
-    from sqlalchemy import func
-    status_data = db.session.query(Asset.status, func.count(Asset.id)).group_by(Asset.status).all()
-    for status, count in status_data:
-        status_labels.append(status or 'Unknown')
+    for status, count in snapshot.group(kpis.ASSETS_BY_STATUS):
+        status_labels.append(status)
         status_counts.append(count)
     
     return render_template("dashboards/manager.html", **locals())
@@ -277,8 +371,9 @@ def manager_dashboard():
 @login_required
 @role_required("Admin", "Employee")
 def employee_dashboard():
-    my_assets = Asset.query.filter_by(assigned_to=current_user.id).all()
-    return render_template("dashboards/employee.html", **locals())
+    dashboard = employee_dashboards.for_employee(current_user.employee_id)
+    return render_template("dashboards/employee.html", dashboard=dashboard,
+                           linked=current_user.employee_id is not None)
 
 # -------------------- HR Integration Dashboard --------------------
 
@@ -287,7 +382,7 @@ def employee_dashboard():
 @login_required
 @role_required("Admin", "IT", "Manager")
 def employees():
-    employees = Employee.query.order_by(Employee.id.asc()).all()
+    employees = employee_query().order_by(Employee.id.asc()).all()
     return render_template("employees/list.html", employees=employees)
 
 @main.route("/employees/new", methods=["GET", "POST"])
@@ -334,7 +429,7 @@ def employee_delete(emp_id):
 @login_required
 @role_required("Admin", "IT", "Manager")
 def maintenance_list():
-    maintenances = Maintenance.query.order_by(Maintenance.date.asc()).all()
+    maintenances = maintenance_query().order_by(Maintenance.date.asc()).all()
     return render_template("maintenance/list.html", maintenances=maintenances)
 
 @main.route("/maintenance/new", methods=["GET", "POST"])
@@ -353,7 +448,7 @@ def maintenance_new():
         db.session.commit()
         flash("Maintenance record added", "success")
         return redirect(url_for("main.maintenance_list"))
-    assets = Asset.query.all()
+    assets = Asset.query.options(load_only(Asset.id, Asset.asset_id, Asset.brand)).all()
     return render_template("maintenance/form.html", action="Add", assets=assets)
 
 @main.route("/maintenance/<int:mid>/edit", methods=["GET", "POST"])
@@ -370,7 +465,7 @@ def maintenance_edit(mid):
         db.session.commit()
         flash("Maintenance updated", "success")
         return redirect(url_for("main.maintenance_list"))
-    assets = Asset.query.all()
+    assets = Asset.query.options(load_only(Asset.id, Asset.asset_id, Asset.brand)).all()
     return render_template("maintenance/form.html", action="Edit", assets=assets, m=m)
 
 @main.route("/maintenance/<int:mid>/approve", methods=["POST"])
@@ -402,7 +497,7 @@ def maintenance_delete(mid):
 @login_required
 @role_required("Admin", "IT", "Manager")
 def licenses():
-    licenses = SoftwareLicense.query.order_by(SoftwareLicense.id.asc()).all()
+    licenses = license_query().order_by(SoftwareLicense.id.asc()).all()
     return render_template("licenses/list.html", licenses=licenses)
 
 @main.route("/licenses/new", methods=["GET", "POST"])
@@ -454,8 +549,81 @@ def license_delete(lid):
 @login_required
 @role_required("Admin", "IT", "Manager")
 def assets():
-    assets = Asset.query.order_by(Asset.id.asc()).all()
-    return render_template("assets/list.html", assets=assets)
+    filters = asset_filters_from_args(request.args)
+    page = keyset_page(
+        filtered_assets(filters),
+        Asset.id,
+        after=parse_int(request.args.get("after")),
+        before=parse_int(request.args.get("before")),
+        per_page=page_size(request.args.get("per_page")),
+    )
+    # Only what the filter and bulk-assign dropdowns show
+    employees = db.session.execute(select(Employee.id, Employee.name).order_by(Employee.name.asc())).all()
+    return render_template("assets/list.html", assets=page.items, page=page, filters=filters, employees=employees)
+
+def asset_to_dict(asset):
+    return {
+        "id": asset.id,
+        "asset_id": asset.asset_id,
+        "asset_type": asset.asset_type,
+        "brand": asset.brand,
+        "model": asset.model,
+        "serial_no": asset.serial_no,
+        "purchase_date": asset.purchase_date.isoformat() if asset.purchase_date else None,
+        "warranty_expiry": asset.warranty_expiry.isoformat() if asset.warranty_expiry else None,
+        "status": asset.status,
+        "assigned_to": asset.assigned_to,
+    }
+
+@main.route("/api/assets")
+@login_required
+@role_required("Admin", "IT", "Manager")
+def assets_api():
+    """Cursor-paginated asset list. Pass ``next_cursor`` back as ``after`` to get the next page."""
+    filters = asset_filters_from_args(request.args)
+    page = keyset_page(
+        filtered_assets(filters),
+        Asset.id,
+        after=parse_int(request.args.get("after")),
+        before=parse_int(request.args.get("before")),
+        per_page=page_size(request.args.get("per_page")),
+    )
+    return jsonify({
+        "items": [asset_to_dict(a) for a in page.items],
+        "next_cursor": page.next_cursor,
+        "prev_cursor": page.prev_cursor,
+        "per_page": page.per_page,
+        "filters": filters,
+    })
+
+@main.route("/search")
+@login_required
+@role_required("Admin", "IT", "Manager")
+def search():
+    results = search_assets(
+        request.args.get("q", "").strip(),
+        page=parse_int(request.args.get("page"), 1),
+        per_page=page_size(request.args.get("per_page")),
+    )
+    return render_template("search/results.html", results=results)
+
+@main.route("/api/search")
+@login_required
+@role_required("Admin", "IT", "Manager")
+def search_api():
+    """Ranked asset search; every term matches as a prefix. Page with ``page``/``per_page``."""
+    results = search_assets(
+        request.args.get("q", "").strip(),
+        page=parse_int(request.args.get("page"), 1),
+        per_page=page_size(request.args.get("per_page")),
+    )
+    return jsonify({
+        "query": results.query,
+        "items": [asset_to_dict(a) for a in results.items],
+        "page": results.page,
+        "per_page": results.per_page,
+        "has_next": results.has_next,
+    })
 
 @main.route("/assets/new", methods=["GET", "POST"])
 @login_required
@@ -463,8 +631,8 @@ def assets():
 def asset_new():
     if request.method == "POST":
         data = request.form
-        # Create the asset first without the asset_id
         asset = Asset(
+            asset_id=data.get("asset_id") or next_asset_id(data.get("asset_type")),
             asset_type=data.get("asset_type"),
             brand=data.get("brand"),
             model=data.get("model"),
@@ -474,17 +642,7 @@ def asset_new():
             status=data.get("status"),
             assigned_to=data.get("assigned_to") or None,
         )
-        
-        # Add to session to get the auto-incremented ID
         db.session.add(asset)
-        db.session.flush()  # This will assign an ID to the asset
-        
-        # Generate asset_id if not provided
-        if not data.get("asset_id"):
-            asset.asset_id = f"AST-{asset.id:05d}"  # Format as AST-00001, AST-00002, etc.
-        else:
-            asset.asset_id = data["asset_id"]
-            
         db.session.commit()
         flash("Asset added successfully", "success")
         return redirect(url_for("main.assets"))
@@ -523,244 +681,252 @@ def asset_delete(asset_id):
     flash("Asset deleted", "info")
     return redirect(url_for("main.assets"))
 
+@main.route("/assets/bulk", methods=["POST"])
+@login_required
+@role_required("Admin", "IT")
+def assets_bulk():
+    filters = asset_filters_from_args(request.form)
+    ids = request.form.getlist("ids") if request.form.get("scope") != "filtered" else None
+    try:
+        result = bulk_ops.apply(
+            request.form.get("action"),
+            ids=ids,
+            filters=filters,
+            status=request.form.get("new_status"),
+            assigned_to=request.form.get("bulk_assigned_to"),
+        )
+    except bulk_ops.BulkActionError as e:
+        flash(str(e), "warning")
+    else:
+        flash(f"{result.updated} of {result.matched} selected assets updated", "success")
+    return redirect(url_for("main.assets", **filters))
+
+@main.route("/api/assets/bulk", methods=["POST"])
+@login_required
+@role_required("Admin", "IT")
+def assets_bulk_api():
+    """Bulk reassign/status/retire. Body: ``{"action", "ids" | "filters", "status", "assigned_to"}``."""
+    data = request.get_json(silent=True) or {}
+    try:
+        result = bulk_ops.apply(
+            data.get("action"),
+            ids=data.get("ids"),
+            filters=asset_filters_from_args(data.get("filters") or {}),
+            status=data.get("status"),
+            assigned_to=data.get("assigned_to"),
+        )
+    except bulk_ops.BulkActionError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"action": result.action, "matched": result.matched, "updated": result.updated})
+
 # -------------------- Export Routes --------------------
 @main.route("/export/assets/csv")
 @login_required
 @role_required("Admin", "IT", "Manager")
 def export_assets_csv():
-    assets = Asset.query.all()
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    writer.writerow(['Asset ID', 'Type', 'Brand', 'Model', 'Serial No', 'Purchase Date', 'Warranty Expiry', 'Status', 'Assigned To'])
-    
-    for asset in assets:
-        writer.writerow([
-            asset.asset_id,
-            asset.asset_type,
-            asset.brand,
-            asset.model,
-            asset.serial_no,
-            asset.purchase_date.strftime('%Y-%m-%d') if asset.purchase_date else '',
-            asset.warranty_expiry.strftime('%Y-%m-%d') if asset.warranty_expiry else '',
-            asset.status,
-            asset.assigned_to
-        ])
-    
-    output.seek(0)
-    return Response(
-        output.getvalue(),
-        mimetype='text/csv',
-        headers={'Content-Disposition': 'attachment; filename=assets.csv'}
-    )
+    return csv_response("assets")
 
 @main.route("/export/employees/csv")
 @login_required
 @role_required("Admin", "IT", "Manager")
 def export_employees_csv():
-    employees = Employee.query.all()
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    writer.writerow(['ID', 'Name', 'Department', 'Contact'])
-    
-    for emp in employees:
-        writer.writerow([emp.id, emp.name, emp.department, emp.contact])
-    
-    output.seek(0)
-    return Response(
-        output.getvalue(),
-        mimetype='text/csv',
-        headers={'Content-Disposition': 'attachment; filename=employees.csv'}
-    )
+    return csv_response("employees")
 
 @main.route("/export/maintenance/csv")
 @login_required
 @role_required("Admin", "IT", "Manager")
 def export_maintenance_csv():
-    maintenance_records = Maintenance.query.all()
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    writer.writerow(['ID', 'Asset ID', 'Date', 'Description', 'Cost'])
-    
-    for record in maintenance_records:
-        writer.writerow([
-            record.id,
-            record.asset_id,
-            record.date.strftime('%Y-%m-%d') if record.date else '',
-            record.description,
-            record.cost
-        ])
-    
-    output.seek(0)
-    return Response(
-        output.getvalue(),
-        mimetype='text/csv',
-        headers={'Content-Disposition': 'attachment; filename=maintenance.csv'}
-    )
+    return csv_response("maintenance")
 
 @main.route("/export/licenses/csv")
 @login_required
 @role_required("Admin", "IT", "Manager")
 def export_licenses_csv():
-    licenses = SoftwareLicense.query.all()
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    writer.writerow(['ID', 'Software Name', 'License Key', 'Expiry Date', 'Assigned To'])
-    
-    for lic in licenses:
-        writer.writerow([
-            lic.id,
-            lic.software_name,
-            lic.license_key,
-            lic.expiry_date.strftime('%Y-%m-%d') if lic.expiry_date else '',
-            lic.assigned_to
-        ])
-    
-    output.seek(0)
-    return Response(
-        output.getvalue(),
-        mimetype='text/csv',
-        headers={'Content-Disposition': 'attachment; filename=licenses.csv'}
-    )
+    return csv_response("licenses")
 
 # Excel Export Routes
 @main.route("/export/assets/excel")
 @login_required
 @role_required("Admin", "IT", "Manager")
 def export_assets_excel():
-    if not PANDAS_AVAILABLE:
-        flash("Pandas not available. Please install pandas to enable Excel export.", "warning")
+    if not OPENPYXL_AVAILABLE:
+        flash("openpyxl not available. Please install openpyxl to enable Excel export.", "warning")
         return redirect(url_for("main.assets"))
-    
-    assets = Asset.query.all()
-    data = []
-    
-    for asset in assets:
-        data.append({
-            'Asset ID': asset.asset_id,
-            'Type': asset.asset_type,
-            'Brand': asset.brand,
-            'Model': asset.model,
-            'Serial No': asset.serial_no,
-            'Purchase Date': asset.purchase_date.strftime('%Y-%m-%d') if asset.purchase_date else '',
-            'Warranty Expiry': asset.warranty_expiry.strftime('%Y-%m-%d') if asset.warranty_expiry else '',
-            'Status': asset.status,
-            'Assigned To': asset.assigned_to
-        })
-    
-    df = pd.DataFrame(data)
-    output = BytesIO()
-    df.to_excel(output, index=False, engine='openpyxl')
-    output.seek(0)
-    
-    return Response(
-        output.getvalue(),
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        headers={'Content-Disposition': 'attachment; filename=assets.xlsx'}
-    )
+    return excel_response(["assets"], "assets.xlsx")
 
 @main.route("/export/employees/excel")
 @login_required
 @role_required("Admin", "IT", "Manager")
 def export_employees_excel():
-    if not PANDAS_AVAILABLE:
-        flash("Pandas not available. Please install pandas to enable Excel export.", "warning")
+    if not OPENPYXL_AVAILABLE:
+        flash("openpyxl not available. Please install openpyxl to enable Excel export.", "warning")
         return redirect(url_for("main.employees"))
-    
-    employees = Employee.query.all()
-    data = []
-    
-    for emp in employees:
-        data.append({
-            'ID': emp.id,
-            'Name': emp.name,
-            'Department': emp.department,
-            'Contact': emp.contact
-        })
-    
-    df = pd.DataFrame(data)
-    output = BytesIO()
-    df.to_excel(output, index=False, engine='openpyxl')
-    output.seek(0)
-    
-    return Response(
-        output.getvalue(),
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        headers={'Content-Disposition': 'attachment; filename=employees.xlsx'}
-    )
+    return excel_response(["employees"], "employees.xlsx")
 
 @main.route("/export/maintenance/excel")
 @login_required
 @role_required("Admin", "IT", "Manager")
 def export_maintenance_excel():
-    if not PANDAS_AVAILABLE:
-        flash("Pandas not available. Please install pandas to enable Excel export.", "warning")
+    if not OPENPYXL_AVAILABLE:
+        flash("openpyxl not available. Please install openpyxl to enable Excel export.", "warning")
         return redirect(url_for("main.maintenance_list"))
-    
-    maintenance_records = Maintenance.query.all()
-    data = []
-    
-    for record in maintenance_records:
-        data.append({
-            'ID': record.id,
-            'Asset ID': record.asset_id,
-            'Date': record.date.strftime('%Y-%m-%d') if record.date else '',
-            'Description': record.description,
-            'Cost': record.cost
-        })
-    
-    df = pd.DataFrame(data)
-    output = BytesIO()
-    df.to_excel(output, index=False, engine='openpyxl')
-    output.seek(0)
-    
-    return Response(
-        output.getvalue(),
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        headers={'Content-Disposition': 'attachment; filename=maintenance.xlsx'}
-    )
+    return excel_response(["maintenance"], "maintenance.xlsx")
 
 @main.route("/export/licenses/excel")
 @login_required
 @role_required("Admin", "IT", "Manager")
 def export_licenses_excel():
-    if not PANDAS_AVAILABLE:
-        flash("Pandas not available. Please install pandas to enable Excel export.", "warning")
+    if not OPENPYXL_AVAILABLE:
+        flash("openpyxl not available. Please install openpyxl to enable Excel export.", "warning")
         return redirect(url_for("main.licenses"))
-    
-    licenses = SoftwareLicense.query.all()
-    data = []
-    
-    for lic in licenses:
-        data.append({
-            'ID': lic.id,
-            'Software Name': lic.software_name,
-            'License Key': lic.license_key,
-            'Expiry Date': lic.expiry_date.strftime('%Y-%m-%d') if lic.expiry_date else '',
-            'Assigned To': lic.assigned_to
-        })
-    
-    df = pd.DataFrame(data)
-    output = BytesIO()
-    df.to_excel(output, index=False, engine='openpyxl')
-    output.seek(0)
-    
-    return Response(
-        output.getvalue(),
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        headers={'Content-Disposition': 'attachment; filename=licenses.xlsx'}
-    )
+    return excel_response(["licenses"], "licenses.xlsx")
+
+@main.route("/export/all/excel")
+@login_required
+@role_required("Admin", "IT", "Manager")
+def export_all_excel():
+    """Assets, maintenance, licenses and employees as sheets of one workbook."""
+    if not OPENPYXL_AVAILABLE:
+        flash("openpyxl not available. Please install openpyxl to enable Excel export.", "warning")
+        return redirect(url_for("main.reports"))
+    return excel_response(["assets", "maintenance", "licenses", "employees"], "it-assets.xlsx")
+
+# -------------------- Background Export Jobs --------------------
+@main.route("/exports/jobs", methods=["POST"])
+@login_required
+@role_required("Admin", "IT", "Manager")
+def export_job_submit():
+    """Queue an export; JSON callers get the job status back, the form redirects to reports."""
+    payload = request.get_json(silent=True) if request.is_json else None
+    if payload is not None:
+        fmt = payload.get("format", "xlsx")
+        datasets = payload.get("datasets") or []
+    else:
+        fmt = request.form.get("format", "xlsx")
+        datasets = request.form.getlist("datasets")
+    try:
+        job, reused = export_jobs.submit(fmt, datasets, user_id=current_user.id)
+    except export_jobs.ExportJobError as e:
+        if payload is not None:
+            return jsonify({"error": str(e)}), 400
+        flash(str(e), "warning")
+        return redirect(url_for("main.reports"))
+    if payload is not None:
+        return jsonify(dict(export_jobs.job_to_dict(job), reused=reused)), 200 if reused else 202
+    flash("Reusing a recent identical export" if reused else "Export queued", "info")
+    return redirect(url_for("main.reports"))
+
+@main.route("/exports/jobs/<job_id>")
+@login_required
+@role_required("Admin", "IT", "Manager")
+def export_job_status(job_id):
+    job = ExportJob.query.get_or_404(job_id)
+    return jsonify(export_jobs.job_to_dict(job))
+
+@main.route("/exports/jobs/<job_id>/download")
+@login_required
+@role_required("Admin", "IT", "Manager")
+def export_job_download(job_id):
+    job = ExportJob.query.get_or_404(job_id)
+    if job.status != "Done" or not job.path:
+        flash("Export is not ready yet", "info")
+        return redirect(url_for("main.reports"))
+    try:
+        return send_file(job.path, as_attachment=True, download_name=export_jobs.download_name(job))
+    except FileNotFoundError:
+        abort(404)
+
+# -------------------- Bulk Import --------------------
+@main.route("/import", methods=["GET", "POST"])
+@login_required
+@role_required("Admin", "IT")
+def bulk_import():
+    dataset = request.values.get("dataset", "assets")
+    if dataset not in importer.IMPORTS:
+        dataset = "assets"
+    if request.method == "POST":
+        upload = request.files.get("file")
+        if not upload or not upload.filename:
+            flash("Choose a CSV or Excel file to import", "warning")
+            return redirect(url_for("main.bulk_import", dataset=dataset))
+        try:
+            result = importer.import_file(
+                dataset,
+                upload.stream,
+                importer.format_for(upload.filename),
+                dry_run=bool(request.form.get("dry_run")),
+            )
+        except importer.ImportFileError as e:
+            flash(str(e), "danger")
+            return redirect(url_for("main.bulk_import", dataset=dataset))
+        if request.form.get("report_csv") and result.errors:
+            return Response(
+                result.errors_csv(),
+                mimetype="text/csv",
+                headers={"Content-Disposition": f"attachment; filename={dataset}-import-errors.csv"},
+            )
+        if result.inserted:
+            flash(f"Imported {result.inserted} {dataset} rows", "success")
+        return render_template("imports/form.html", dataset=dataset, datasets=importer.IMPORTS, result=result)
+    return render_template("imports/form.html", dataset=dataset, datasets=importer.IMPORTS, result=None)
 
 # -------------------- Email Notification Functions --------------------
+_standalone_app = None
+
+def _notification_app(app=None):
+    """The app a notification run uses: injected, current, or one shared standalone app."""
+    global _standalone_app
+    if app is not None:
+        return app
+    if has_app_context():
+        return current_app._get_current_object()
+    if _standalone_app is None:
+        from app import create_app
+        _standalone_app = create_app()
+    return _standalone_app
+
+def _app_context(app):
+    """Reuse the active context when it already belongs to ``app``."""
+    if has_app_context() and current_app._get_current_object() is app:
+        return nullcontext()
+    return app.app_context()
+
+SUMMARY_BUCKETS = {
+    'assignee': ('assignee_emails_sent', 'assignee_recipients'),
+    'extra_to': ('extra_to_emails_sent', 'extra_to_recipients'),
+    'fallback': ('fallback_admin_it_emails_sent', 'admin_it_recipients'),
+}
+
+def _deliver_outbox(summary, outbox, ledger):
+    """Send queued ``(bucket, email, Message, items)`` entries and record per-recipient results.
+
+    Items of every message that went out are written to the delivery ledger.
+    """
+    results = mailer.deliver([msg for _, _, msg, _ in outbox])
+    for (bucket, email, _, items), result in zip(outbox, results):
+        count_key, recipients_key = SUMMARY_BUCKETS[bucket]
+        if result['status'] == 'sent':
+            summary[count_key] += 1
+            summary[recipients_key].append(email)
+            ledger.mark_sent(items, email)
+        else:
+            summary['failed_emails'] += 1
+        summary['delivery_results'].append({
+            'recipient': email,
+            'kind': bucket,
+            'status': result['status'],
+            'attempts': result['attempts'],
+            'error': result['error'],
+        })
+
 def send_license_expiry_notifications(
     cc_admin_it: bool = False,
     days_override: int | None = None,
     extra_cc: list[str] | None = None,
     extra_to: list[str] | None = None,
     assignees_only: bool = True,
+    resend: bool = False,
+    app=None,
 ) -> dict:
     """Send email notifications for licenses expiring soon.
 
@@ -769,17 +935,20 @@ def send_license_expiry_notifications(
     - days_override: override window (days) to consider.
     - extra_cc=["cudjoetairo@gmail.com"]: additional emails to CC on each message.
     - assignees_only: if False and no assignees found, fallback to Admin/IT broadcast.
+    - resend: also send items the delivery ledger says a recipient already got
+      at their current threshold (by default only new thresholds go out).
+    - app: application to run in; defaults to the current app (e.g. inside a request).
+      The scheduler passes its own long-lived app so no run bootstraps a new one.
 
-    Returns a summary dict with counts and recipient lists.
+    Returns a summary dict with counts, recipient lists and per-recipient
+    delivery results (messages go out through app.mailer).
     """
     if not MAIL_AVAILABLE:
         print("Flask-Mail not available. Skipping license expiry notifications.")
         return
-        
-    from app import create_app
-    app = create_app()
-    
-    with app.app_context():
+
+    app = _notification_app(app)
+    with _app_context(app):
         summary = {
             'type': 'license',
             'window_days': days_override or app.config['LICENSE_EXPIRY_DAYS'],
@@ -790,16 +959,24 @@ def send_license_expiry_notifications(
             'admin_it_recipients': [],
             'extra_to_emails_sent': 0,
             'extra_to_recipients': [],
+            'skipped_already_notified': 0,
+            'failed_emails': 0,
+            'delivery_results': [],
         }
+        outbox = []
         # Get licenses expiring within the configured days
         window_days = days_override or app.config['LICENSE_EXPIRY_DAYS']
-        expiry_threshold = datetime.now() + timedelta(days=window_days)
-        expiring_licenses = SoftwareLicense.query.filter(
-            SoftwareLicense.expiry_date <= expiry_threshold,
-            SoftwareLicense.expiry_date >= datetime.now()
-        ).all()
+        today = date.today()
+        expiring_licenses = expiries.resolve(
+            expiries.between(today, today + timedelta(days=window_days), [expiries.LICENSE])
+        )
+        ledger = notification_ledger.Ledger(expiries.LICENSE, today, window_days, resend).load(
+            today + timedelta(days=window_days)
+        )
+        renderer = ExpiryMailRenderer('emails/license_expiry.html', 'licenses', window_days)
         
         if not expiring_licenses:
+            ledger.save()
             return summary
         
         # Group expiring licenses by assignee (Employee.id)
@@ -825,47 +1002,35 @@ def send_license_expiry_notifications(
             # Send direct To emails if provided (even when there are no assignees)
             if extra_to:
                 for email in [e.strip() for e in extra_to if e and '@' in e]:
+                    new_items = ledger.unsent(expiring_licenses, email)
+                    if not new_items:
+                        summary['skipped_already_notified'] += 1
+                        continue
                     msg = Message(
-                        subject=f'License Expiry Notifications - {len(expiring_licenses)} licenses expiring soon',
+                        subject=f'License Expiry Notifications - {len(new_items)} licenses expiring soon',
                         recipients=[email],
                         sender=computed_sender,
                         cc=cc_emails if cc_emails else None,
-                        html=render_template(
-                            'emails/license_expiry.html',
-                            licenses=expiring_licenses,
-                            user={'name': email},
-                            days=window_days,
-                            now=datetime.now
-                        )
+                        html=renderer.render(new_items, email)
                     )
-                    try:
-                        mail.send(msg)
-                        summary['extra_to_emails_sent'] += 1
-                        summary['extra_to_recipients'].append(email)
-                    except Exception as e:
-                        print(f"Failed to send email to {email}: {e}")
+                    outbox.append(('extra_to', email, msg, new_items))
 
             if not assignees_only:
                 for user in admin_it_users:
                     if user.email:
+                        new_items = ledger.unsent(expiring_licenses, user.email)
+                        if not new_items:
+                            summary['skipped_already_notified'] += 1
+                            continue
                         msg = Message(
-                            subject=f'License Expiry Notifications - {len(expiring_licenses)} licenses expiring soon',
+                            subject=f'License Expiry Notifications - {len(new_items)} licenses expiring soon',
                             recipients=[user.email],
                             sender=computed_sender,
-                            html=render_template(
-                                'emails/license_expiry.html',
-                                licenses=expiring_licenses,
-                                user=user,
-                                days=window_days,
-                                now=datetime.now
-                            )
+                            html=renderer.render(new_items, user.username)
                         )
-                        try:
-                            mail.send(msg)
-                            summary['fallback_admin_it_emails_sent'] += 1
-                            summary['admin_it_recipients'].append(user.email)
-                        except Exception as e:
-                            print(f"Failed to send email to {user.email}: {e}")
+                        outbox.append(('fallback', user.email, msg, new_items))
+            _deliver_outbox(summary, outbox, ledger)
+            ledger.save()
             return summary
 
         # Build CC list for Admin/IT if requested
@@ -891,27 +1056,21 @@ def send_license_expiry_notifications(
                 summary['skipped_no_email'] += 1
                 continue
 
-            # Minimal user object for template compatibility
-            user_ctx = {'name': emp.name}
+            lic_list = ledger.unsent(lic_list, to_email)
+            if not lic_list:
+                summary['skipped_already_notified'] += 1
+                continue
+
             msg = Message(
                 subject=f'License Expiry Notice - {len(lic_list)} license(s) assigned to you expiring soon',
                 recipients=[to_email],
                 sender=computed_sender,
                 cc=cc_emails if cc_emails else None,
-                html=render_template(
-                    'emails/license_expiry.html',
-                    licenses=lic_list,
-                    user=user_ctx,
-                    days=window_days,
-                    now=datetime.now
-                )
+                html=renderer.render(lic_list, emp.name)
             )
-            try:
-                mail.send(msg)
-                summary['assignee_emails_sent'] += 1
-                summary['assignee_recipients'].append(to_email)
-            except Exception as e:
-                print(f"Failed to send email to {to_email}: {e}")
+            outbox.append(('assignee', to_email, msg, lic_list))
+        _deliver_outbox(summary, outbox, ledger)
+        ledger.save()
         return summary
 
 def send_warranty_expiry_notifications(
@@ -920,6 +1079,8 @@ def send_warranty_expiry_notifications(
     extra_cc: list[str] | None = None,
     extra_to: list[str] | None = None,
     assignees_only: bool = True,
+    resend: bool = False,
+    app=None,
 ) -> dict:
     """Send email notifications for warranties expiring soon.
 
@@ -928,17 +1089,20 @@ def send_warranty_expiry_notifications(
     - days_override: override window (days) to consider.
     - extra_cc: additional emails to CC on each message.
     - assignees_only: if False and no assignees found, fallback to Admin/IT broadcast.
+    - resend: also send items the delivery ledger says a recipient already got
+      at their current threshold (by default only new thresholds go out).
+    - app: application to run in; defaults to the current app (e.g. inside a request).
+      The scheduler passes its own long-lived app so no run bootstraps a new one.
 
-    Returns a summary dict with counts and recipient lists.
+    Returns a summary dict with counts, recipient lists and per-recipient
+    delivery results (messages go out through app.mailer).
     """
     if not MAIL_AVAILABLE:
         print("Flask-Mail not available. Skipping warranty expiry notifications.")
         return
-        
-    from app import create_app
-    app = create_app()
-    
-    with app.app_context():
+
+    app = _notification_app(app)
+    with _app_context(app):
         summary = {
             'type': 'warranty',
             'window_days': days_override or app.config['WARRANTY_EXPIRY_DAYS'],
@@ -949,16 +1113,24 @@ def send_warranty_expiry_notifications(
             'admin_it_recipients': [],
             'extra_to_emails_sent': 0,
             'extra_to_recipients': [],
+            'skipped_already_notified': 0,
+            'failed_emails': 0,
+            'delivery_results': [],
         }
+        outbox = []
         # Get assets with warranties expiring within the configured days
         window_days = days_override or app.config['WARRANTY_EXPIRY_DAYS']
-        expiry_threshold = datetime.now() + timedelta(days=window_days)
-        expiring_warranties = Asset.query.filter(
-            Asset.warranty_expiry <= expiry_threshold,
-            Asset.warranty_expiry >= datetime.now()
-        ).all()
+        today = date.today()
+        expiring_warranties = expiries.resolve(
+            expiries.between(today, today + timedelta(days=window_days), [expiries.WARRANTY])
+        )
+        ledger = notification_ledger.Ledger(expiries.WARRANTY, today, window_days, resend).load(
+            today + timedelta(days=window_days)
+        )
+        renderer = ExpiryMailRenderer('emails/warranty_expiry.html', 'assets', window_days)
         
         if not expiring_warranties:
+            ledger.save()
             return summary
         
         # Group expiring assets by assignee (Employee.id)
@@ -984,47 +1156,35 @@ def send_warranty_expiry_notifications(
             # Send direct To emails if provided (even when there are no assignees)
             if extra_to:
                 for email in [e.strip() for e in extra_to if e and '@' in e]:
+                    new_items = ledger.unsent(expiring_warranties, email)
+                    if not new_items:
+                        summary['skipped_already_notified'] += 1
+                        continue
                     msg = Message(
-                        subject=f'Warranty Expiry Notifications - {len(expiring_warranties)} warranties expiring soon',
+                        subject=f'Warranty Expiry Notifications - {len(new_items)} warranties expiring soon',
                         recipients=[email],
                         sender=computed_sender,
                         cc=cc_emails if cc_emails else None,
-                        html=render_template(
-                            'emails/warranty_expiry.html',
-                            assets=expiring_warranties,
-                            user={'name': email},
-                            days=window_days,
-                            now=datetime.now
-                        )
+                        html=renderer.render(new_items, email)
                     )
-                    try:
-                        mail.send(msg)
-                        summary['extra_to_emails_sent'] += 1
-                        summary['extra_to_recipients'].append(email)
-                    except Exception as e:
-                        print(f"Failed to send email to {email}: {e}")
+                    outbox.append(('extra_to', email, msg, new_items))
 
             if not assignees_only:
                 for user in admin_it_users:
                     if user.email:
+                        new_items = ledger.unsent(expiring_warranties, user.email)
+                        if not new_items:
+                            summary['skipped_already_notified'] += 1
+                            continue
                         msg = Message(
-                            subject=f'Warranty Expiry Notifications - {len(expiring_warranties)} warranties expiring soon',
+                            subject=f'Warranty Expiry Notifications - {len(new_items)} warranties expiring soon',
                             recipients=[user.email],
                             sender=computed_sender,
-                            html=render_template(
-                                'emails/warranty_expiry.html',
-                                assets=expiring_warranties,
-                                user=user,
-                                days=window_days,
-                                now=datetime.now
-                            )
+                            html=renderer.render(new_items, user.username)
                         )
-                        try:
-                            mail.send(msg)
-                            summary['fallback_admin_it_emails_sent'] += 1
-                            summary['admin_it_recipients'].append(user.email)
-                        except Exception as e:
-                            print(f"Failed to send email to {user.email}: {e}")
+                        outbox.append(('fallback', user.email, msg, new_items))
+            _deliver_outbox(summary, outbox, ledger)
+            ledger.save()
             return summary
 
         # Build CC list for Admin/IT if requested
@@ -1049,26 +1209,21 @@ def send_warranty_expiry_notifications(
                 summary['skipped_no_email'] += 1
                 continue
 
-            user_ctx = {'name': emp.name}
+            asset_list = ledger.unsent(asset_list, to_email)
+            if not asset_list:
+                summary['skipped_already_notified'] += 1
+                continue
+
             msg = Message(
                 subject=f'Warranty Expiry Notice - {len(asset_list)} asset(s) assigned to you expiring soon',
                 recipients=[to_email],
                 sender=computed_sender,
                 cc=cc_emails if cc_emails else None,
-                html=render_template(
-                    'emails/warranty_expiry.html',
-                    assets=asset_list,
-                    user=user_ctx,
-                    days=window_days,
-                    now=datetime.now
-                )
+                html=renderer.render(asset_list, emp.name)
             )
-            try:
-                mail.send(msg)
-                summary['assignee_emails_sent'] += 1
-                summary['assignee_recipients'].append(to_email)
-            except Exception as e:
-                print(f"Failed to send email to {to_email}: {e}")
+            outbox.append(('assignee', to_email, msg, asset_list))
+        _deliver_outbox(summary, outbox, ledger)
+        ledger.save()
         return summary
 
 # -------------------- Notification Routes --------------------
@@ -1083,7 +1238,9 @@ def test_license_notifications():
     
     # Optional CC to Admin/IT via query param: /notifications/test-license?cc=1
     cc = str(request.args.get('cc', '0')).lower() in ("1", "true", "yes", "on")
-    send_license_expiry_notifications(cc_admin_it=cc)
+    # ?resend=1 also sends items the delivery ledger already covers
+    resend = str(request.args.get('resend', '0')).lower() in ("1", "true", "yes", "on")
+    send_license_expiry_notifications(cc_admin_it=cc, resend=resend)
     flash("License expiry notifications sent successfully!", "success")
     return redirect(url_for("main.it_dashboard"))
 
@@ -1098,7 +1255,9 @@ def test_warranty_notifications():
     
     # Optional CC to Admin/IT via query param: /notifications/test-warranty?cc=1
     cc = str(request.args.get('cc', '0')).lower() in ("1", "true", "yes", "on")
-    send_warranty_expiry_notifications(cc_admin_it=cc)
+    # ?resend=1 also sends items the delivery ledger already covers
+    resend = str(request.args.get('resend', '0')).lower() in ("1", "true", "yes", "on")
+    send_warranty_expiry_notifications(cc_admin_it=cc, resend=resend)
     flash("Warranty expiry notifications sent successfully!", "success")
     return redirect(url_for("main.it_dashboard"))
 
@@ -1113,6 +1272,7 @@ def notifications_send():
         window_days = request.form.get('days')
         cc_admin_it = bool(request.form.get('cc_admin_it'))
         assignees_only = bool(request.form.get('assignees_only'))
+        resend = bool(request.form.get('resend'))
         extra_raw = request.form.get('additional_recipients', '')
         extra_cc = [e.strip() for e in extra_raw.split(',') if e.strip()]
         extra_to_raw = request.form.get('additional_to_recipients', '')
@@ -1128,6 +1288,7 @@ def notifications_send():
                 extra_cc=extra_cc,
                 extra_to=extra_to,
                 assignees_only=assignees_only,
+                resend=resend,
             )
         else:
             summary = send_warranty_expiry_notifications(
@@ -1136,6 +1297,7 @@ def notifications_send():
                 extra_cc=extra_cc,
                 extra_to=extra_to,
                 assignees_only=assignees_only,
+                resend=resend,
             )
 
         return render_template('notifications/result.html', summary=summary)
@@ -1153,25 +1315,27 @@ def notifications_send():
 @role_required("Admin", "IT", "Manager")
 def reports():
     """Reports overview with quick exports and KPIs."""
-    total_assets = Asset.query.count()
-    total_employees = Employee.query.count()
-    total_licenses = SoftwareLicense.query.count()
-    maintenance_count = Maintenance.query.count()
+    snapshot = kpis.snapshot()
+    total_assets = snapshot.count(kpis.ASSETS_TOTAL)
+    total_employees = snapshot.count(kpis.EMPLOYEES_TOTAL)
+    total_licenses = snapshot.count(kpis.LICENSES_TOTAL)
+    maintenance_count = snapshot.count(kpis.MAINTENANCE_TOTAL)
+    export_job_list = export_jobs.recent_jobs()
     return render_template("reports/overview.html", **locals())
 
+NOTIFICATION_PAGE_SIZE = 20
+
 @main.route("/notifications")
 @login_required
 @role_required("Admin", "IT", "Manager")
 def notifications_center():
-    """Notifications center showing upcoming expirations."""
-    from datetime import date, timedelta
+    """Notifications center showing upcoming expirations, a keyset page per kind."""
     today = date.today()
-    licenses_expiring = SoftwareLicense.query.filter(
-        SoftwareLicense.expiry_date >= today,
-        SoftwareLicense.expiry_date <= today + timedelta(days=30)
-    ).order_by(SoftwareLicense.expiry_date).limit(20).all()
-    warranties_expiring = Asset.query.filter(
-        Asset.warranty_expiry >= today,
-        Asset.warranty_expiry <= today + timedelta(days=30)
-    ).order_by(Asset.warranty_expiry).limit(20).all()
+    window_end = today + timedelta(days=30)
+    licenses_after = request.args.get("licenses_after")
+    warranties_after = request.args.get("warranties_after")
+    license_page = expiries.page(today, window_end, [expiries.LICENSE], after=licenses_after, per_page=NOTIFICATION_PAGE_SIZE)
+    warranty_page = expiries.page(today, window_end, [expiries.WARRANTY], after=warranties_after, per_page=NOTIFICATION_PAGE_SIZE)
+    licenses_expiring = expiries.resolve(license_page.items)
+    warranties_expiring = expiries.resolve(warranty_page.items)
     return render_template("notifications/center.html", **locals())
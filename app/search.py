@@ -0,0 +1,199 @@
+"""Full-text asset search.
+
+On SQLite the ``asset_fts`` FTS5 table indexes each asset's ID, serial number,
+brand, model, notes and type plus the assignee's name, keyed by ``asset.id``.
+Triggers on ``asset`` and ``employee`` keep it current for ORM writes and bulk
+SQL alike. Every search term is matched as a prefix (``"lat"*``), results are
+ordered by bm25 with identifier columns weighted highest, and a page is one
+indexed MATCH plus one primary-key lookup. Ranking is limited to the newest
+``SEARCH_RANK_CANDIDATES`` matches so very broad terms stay fast; the older
+matches follow the ranked ones, newest first, so paging still reaches every
+result. Narrower queries are ranked in full.
+
+Other databases, or SQLite builds without FTS5, fall back to a LIKE search
+over the same columns.
+"""
+import re
+from dataclasses import dataclass, field
+
+from flask import current_app
+from sqlalchemy import or_, text
+
+from . import db
+from .models import Asset, Employee
+from .queries import DEFAULT_PAGE_SIZE, asset_query
+
+FTS_TABLE = "asset_fts"
+
+# Pages past this are clamped, keeping OFFSET inside SQLite's integer range
+MAX_SEARCH_PAGE = 100000
+
+# Indexed columns and their bm25 weights, in table order
+FTS_COLUMNS = [
+    ("asset_id", 10.0),
+    ("serial_no", 8.0),
+    ("brand", 2.0),
+    ("model", 3.0),
+    ("asset_type", 2.0),
+    ("employee_name", 3.0),
+    ("notes", 1.0),
+]
+
+_EMPLOYEE_NAME = "coalesce((SELECT name FROM employee WHERE id = new.assigned_to), '')"
+_INSERT_ROW = (
+    f"INSERT INTO {FTS_TABLE}(rowid, asset_id, serial_no, brand, model, asset_type, employee_name, notes) "
+    f"VALUES (new.id, new.asset_id, new.serial_no, new.brand, new.model, new.asset_type, {_EMPLOYEE_NAME}, new.notes);"
+)
+
+DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    + ", ".join(name for name, _ in FTS_COLUMNS)
+    + ", tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')",
+    "CREATE TRIGGER IF NOT EXISTS asset_fts_ai AFTER INSERT ON asset BEGIN "
+    + _INSERT_ROW + " END",
+    "CREATE TRIGGER IF NOT EXISTS asset_fts_au AFTER UPDATE OF asset_id, serial_no, brand, model, notes, asset_type, assigned_to ON asset BEGIN "
+    f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id; " + _INSERT_ROW + " END",
+    "CREATE TRIGGER IF NOT EXISTS asset_fts_ad AFTER DELETE ON asset BEGIN "
+    f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS asset_fts_employee_au AFTER UPDATE OF name ON employee BEGIN "
+    f"UPDATE {FTS_TABLE} SET employee_name = coalesce(new.name, '') "
+    "WHERE rowid IN (SELECT id FROM asset WHERE assigned_to = new.id); END",
+    "CREATE TRIGGER IF NOT EXISTS asset_fts_employee_ad AFTER DELETE ON employee BEGIN "
+    f"UPDATE {FTS_TABLE} SET employee_name = '' "
+    "WHERE rowid IN (SELECT id FROM asset WHERE assigned_to = old.id); END",
+]
+
+REBUILD = [
+    f"DELETE FROM {FTS_TABLE}",
+    f"INSERT INTO {FTS_TABLE}(rowid, asset_id, serial_no, brand, model, asset_type, employee_name, notes) "
+    "SELECT asset.id, asset.asset_id, asset.serial_no, asset.brand, asset.model, asset.asset_type, "
+    "coalesce(employee.name, ''), asset.notes "
+    "FROM asset LEFT OUTER JOIN employee ON employee.id = asset.assigned_to",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')",
+]
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class SearchPage:
+    """One page of ranked search results."""
+    query: str = ""
+    items: list = field(default_factory=list)
+    page: int = 1
+    per_page: int = DEFAULT_PAGE_SIZE
+    has_next: bool = False
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+
+def search_terms(query):
+    """Words in ``query``; punctuation separates terms, as in the FTS tokenizer."""
+    return _TERM.findall(query or "")
+
+
+def match_expression(terms):
+    """FTS5 MATCH string requiring every term as a prefix: ``"del"* "lat"*``."""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def fts_available(connection=None):
+    """True when the ``asset_fts`` table exists on this database."""
+    conn = connection if connection is not None else db.session.connection()
+    if conn.dialect.name != "sqlite":
+        return False
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+    ).first() is not None
+
+
+def ensure_index(connection):
+    """Create the FTS table and triggers if missing, filling the table on first creation.
+
+    Returns False where FTS5 cannot be used (not SQLite, or no FTS5 module).
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+    tables = {row[0] for row in connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if not {"asset", "employee"} <= tables:
+        return False
+    if FTS_TABLE in tables:
+        for statement in DDL[1:]:
+            connection.exec_driver_sql(statement)
+        return True
+    try:
+        for statement in DDL:
+            connection.exec_driver_sql(statement)
+    except Exception:
+        # SQLite built without FTS5; searches use the LIKE fallback
+        return False
+    rebuild(connection)
+    return True
+
+
+def rebuild(connection):
+    """Re-index every asset from scratch."""
+    for statement in REBUILD:
+        connection.exec_driver_sql(statement)
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Alembic autogenerate filter: keep ``asset_fts`` and its shadow tables out of diffs."""
+    return not (type_ == "table" and name.startswith(FTS_TABLE))
+
+
+def _ranked_ids(terms, limit, offset):
+    # bm25 costs ~1-2us per matching row, so a term like "laptop" that hits a
+    # large share of the table is only ranked over its newest candidates.
+    weights = ", ".join(str(weight) for _, weight in FTS_COLUMNS)
+    candidates = current_app.config.get("SEARCH_RANK_CANDIDATES", 5000)
+    match = match_expression(terms)
+    rows = db.session.execute(
+        text(
+            f"SELECT rowid FROM ("
+            f"SELECT rowid, bm25({FTS_TABLE}, {weights}) AS score FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH :match ORDER BY rowid DESC LIMIT :candidates"
+            f") ORDER BY score, rowid DESC LIMIT :limit OFFSET :offset"
+        ),
+        {"match": match, "candidates": candidates, "limit": limit, "offset": offset},
+    )
+    ids = [row[0] for row in rows]
+    if len(ids) < limit:
+        # Past the ranked candidates: the remaining matches, newest first
+        rows = db.session.execute(
+            text(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match "
+                f"ORDER BY rowid DESC LIMIT :limit OFFSET :offset"
+            ),
+            {"match": match, "limit": limit - len(ids), "offset": candidates + max(0, offset - candidates)},
+        )
+        ids.extend(row[0] for row in rows)
+    return ids
+
+
+def _like_ids(terms, limit, offset):
+    query = db.session.query(Asset.id).outerjoin(Employee, Employee.id == Asset.assigned_to)
+    columns = [Asset.asset_id, Asset.serial_no, Asset.brand, Asset.model, Asset.asset_type, Asset.notes, Employee.name]
+    for term in terms:
+        pattern = f"%{term}%"
+        query = query.filter(or_(*[column.ilike(pattern) for column in columns]))
+    return [row[0] for row in query.order_by(Asset.id).limit(limit).offset(offset)]
+
+
+def search_assets(query, page=1, per_page=DEFAULT_PAGE_SIZE):
+    """Ranked page of assets matching ``query`` (every term, as a prefix)."""
+    terms = search_terms(query)
+    page = max(1, min(page, MAX_SEARCH_PAGE))
+    result = SearchPage(query=query or "", page=page, per_page=per_page)
+    if not terms:
+        return result
+    find = _ranked_ids if fts_available() else _like_ids
+    ids = find(terms, per_page + 1, (page - 1) * per_page)
+    result.has_next = len(ids) > per_page
+    ids = ids[:per_page]
+    if ids:
+        by_id = {asset.id: asset for asset in asset_query().filter(Asset.id.in_(ids))}
+        result.items = [by_id[i] for i in ids if i in by_id]
+    return result
@@ -0,0 +1,155 @@
+"""Per-statement SQL stats and the slow-query log.
+
+Every statement timed by :mod:`app.perf` is reduced to a fingerprint: string
+and numeric literals become ``?``, expanded ``IN (?, ?, ...)`` lists collapse
+to ``IN (?+)`` and whitespace is normalised, so the same query issued with
+different values or list lengths lands in one bucket. Each fingerprint keeps
+its count, total and max time and the endpoints that issued it.
+
+Statements slower than ``SLOW_QUERY_MS`` are logged as warnings together with
+the endpoint (or ``<background>`` outside a request) and kept in a short list
+for /admin/perf. With ``SLOW_QUERY_EXPLAIN`` on, the query plan is captured
+on the same DBAPI connection, so it bypasses the engine events and is never
+itself timed. Stats are in-memory and per process; once ``SQL_FINGERPRINT_LIMIT``
+distinct fingerprints exist, new ones are counted under ``<other>``.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+OTHER = "<other>"
+BACKGROUND = "<background>"
+EXPLAINABLE = {"SELECT", "UPDATE", "DELETE", "INSERT", "WITH"}
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_NAMED_PARAM = re.compile(r"(?::\w+|%\(\w+\)s|%s|\$\d+)")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\bVALUES\s*\(.*?\)(?:\s*,\s*\(.*?\))+", re.IGNORECASE | re.DOTALL)
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement):
+    """``statement`` with literals and placeholder lists normalised away."""
+    text = _STRING.sub("?", statement)
+    text = _NAMED_PARAM.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _IN_LIST.sub("IN (?+)", text)
+    text = _VALUES_LIST.sub("VALUES (...)+", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+class StatementStats:
+    """Totals for one fingerprint."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow = 0
+        self.endpoints = Counter()
+
+    def summary(self, statement):
+        return {
+            "fingerprint": statement,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 2),
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0,
+            "max_ms": round(self.max_ms, 2),
+            "slow": self.slow,
+            "endpoints": [name for name, _ in self.endpoints.most_common(3)],
+        }
+
+
+class SlowQueryLog:
+    """Fingerprint aggregates plus the most recent slow statements."""
+
+    def __init__(self, threshold_ms=100, explain=False, limit=500, recent=50):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.limit = limit
+        self.started_at = time.time()
+        self._stats = {}
+        self._slow = deque(maxlen=recent)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            threshold_ms=config.get("SLOW_QUERY_MS", 100),
+            explain=config.get("SLOW_QUERY_EXPLAIN", False),
+            limit=config.get("SQL_FINGERPRINT_LIMIT", 500),
+            recent=config.get("SLOW_QUERY_RECENT", 50),
+        )
+
+    def observe(self, conn, statement, parameters, executemany, elapsed_ms, endpoint):
+        """Record one executed statement; log it if it crossed the threshold."""
+        key = fingerprint(statement)
+        endpoint = endpoint or BACKGROUND
+        slow = self.threshold_ms is not None and elapsed_ms >= self.threshold_ms
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.limit:
+                    key = OTHER
+                stats = self._stats.setdefault(key, StatementStats())
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.endpoints[endpoint] += 1
+            if slow:
+                stats.slow += 1
+        if not slow:
+            return
+
+        plan = self._plan(conn, statement, parameters) if self.explain and not executemany else None
+        self._slow.append({
+            "at": time.time(),
+            "ms": round(elapsed_ms, 2),
+            "endpoint": endpoint,
+            "fingerprint": key,
+            "plan": plan,
+        })
+        logger.warning("Slow query %.1f ms on %s: %s", elapsed_ms, endpoint, key)
+        if plan:
+            logger.warning("Query plan:\n%s", plan)
+
+    def _plan(self, conn, statement, parameters):
+        """EXPLAIN output as text, or None for statements that cannot be explained."""
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        if verb not in EXPLAINABLE:
+            return None
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters or ())
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception as e:
+            return f"(plan unavailable: {e})"
+        if conn.dialect.name == "sqlite":
+            # (id, parent, notused, detail)
+            return "\n".join(str(row[-1]) for row in rows)
+        return "\n".join(" ".join(str(col) for col in row) for row in rows)
+
+    def snapshot(self, top=50):
+        """Fingerprints by total time, and copies of the recent slow statements newest first."""
+        with self._lock:
+            rows = [stats.summary(key) for key, stats in self._stats.items()]
+            slow = [dict(entry) for entry in self._slow]
+        rows.sort(key=lambda row: -row["total_ms"])
+        return rows[:top], slow[::-1]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+            self.started_at = time.time()
@@ -0,0 +1,113 @@
+"""SQLite engine profile.
+
+Every new DBAPI connection gets the configured PRAGMAs through a ``connect``
+event: WAL journaling (readers never wait for a writer, and a writer waits at
+most ``busy_timeout`` for another writer instead of failing with "database is
+locked"), ``synchronous=NORMAL`` (safe under WAL), a memory-mapped read path,
+a larger page cache and in-memory temp tables. Pool settings come from the
+``DB_POOL_*`` config values. ``diagnostics`` reports the effective values.
+"""
+from sqlalchemy import event
+
+# (pragma, config key, allowed values or None for integers)
+PRAGMAS = [
+    ("journal_mode", "SQLITE_JOURNAL_MODE", ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")),
+    ("synchronous", "SQLITE_SYNCHRONOUS", ("OFF", "NORMAL", "FULL", "EXTRA")),
+    ("busy_timeout", "SQLITE_BUSY_TIMEOUT", None),
+    ("mmap_size", "SQLITE_MMAP_SIZE", None),
+    ("cache_size", "SQLITE_CACHE_SIZE", None),
+    ("temp_store", "SQLITE_TEMP_STORE", ("DEFAULT", "FILE", "MEMORY")),
+]
+
+# PRAGMA synchronous/temp_store read back as numbers
+_READBACK_NAMES = {
+    "synchronous": {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"},
+    "temp_store": {0: "DEFAULT", 1: "FILE", 2: "MEMORY"},
+}
+
+
+def is_sqlite(uri):
+    return str(uri).startswith("sqlite")
+
+
+def _is_memory(uri):
+    uri = str(uri)
+    return uri in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in uri
+
+
+def pragma_statements(config):
+    """``PRAGMA`` statements for the configured profile; blank settings are skipped."""
+    statements = []
+    for pragma, key, allowed in PRAGMAS:
+        value = config.get(key)
+        if value is None or value == "":
+            continue
+        if allowed is None:
+            value = int(value)
+        else:
+            value = str(value).upper()
+            if value not in allowed:
+                raise ValueError(f"{key} must be one of {', '.join(allowed)}, not {value!r}")
+        statements.append(f"PRAGMA {pragma}={value}")
+    return statements
+
+
+def engine_options(config):
+    """Pool options for ``SQLALCHEMY_ENGINE_OPTIONS``; explicit options already set win."""
+    options = dict(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    if _is_memory(config.get("SQLALCHEMY_DATABASE_URI", "")):
+        # In-memory databases use a single shared connection; pool sizing does not apply
+        return options
+    options.setdefault("pool_size", config.get("DB_POOL_SIZE", 5))
+    options.setdefault("max_overflow", config.get("DB_MAX_OVERFLOW", 10))
+    options.setdefault("pool_timeout", config.get("DB_POOL_TIMEOUT", 30))
+    options.setdefault("pool_recycle", config.get("DB_POOL_RECYCLE", -1))
+    options.setdefault("pool_pre_ping", config.get("DB_POOL_PRE_PING", False))
+    return options
+
+
+def install(engine, config):
+    """Apply the PRAGMA profile to every new connection made by ``engine``."""
+    if engine.dialect.name != "sqlite":
+        return
+    statements = pragma_statements(config)
+
+    @event.listens_for(engine, "connect")
+    def _apply_profile(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def _readback(pragma, value):
+    return _READBACK_NAMES.get(pragma, {}).get(value, value)
+
+
+def diagnostics(engine, config):
+    """Configured vs. effective connection settings, for the diagnostics page."""
+    info = {
+        "dialect": engine.dialect.name,
+        "url": engine.url.render_as_string(hide_password=True),
+        "pool_class": type(engine.pool).__name__,
+        "pool_status": engine.pool.status(),
+        "pragmas": [],
+        "sqlite_version": None,
+    }
+    if engine.dialect.name != "sqlite":
+        return info
+    with engine.connect() as conn:
+        info["sqlite_version"] = conn.exec_driver_sql("select sqlite_version()").scalar()
+        for pragma, key, _ in PRAGMAS:
+            effective = _readback(pragma, conn.exec_driver_sql(f"PRAGMA {pragma}").scalar())
+            configured = config.get(key)
+            info["pragmas"].append({
+                "name": pragma,
+                "config_key": key,
+                "configured": configured,
+                "effective": effective,
+                "ok": configured in (None, "") or str(effective).upper() == str(configured).upper(),
+            })
+    return info
@@ -0,0 +1,86 @@
+"""Version stamps shared between worker processes.
+
+A stamp is a named row in ``id_counter`` that only ever goes up. Writers bump
+it in the same transaction as the change it describes; per-process caches
+remember the value they were filled under and drop their contents when a
+periodic read shows it moved. ``StampedLRU`` is that cache (used by
+:mod:`app.user_cache` and :mod:`app.employee_dashboard`).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import select
+
+from . import db
+from .models import IdCounter
+
+_table = IdCounter.__table__
+
+
+def bump(name, connection=None):
+    """Increment stamp ``name`` (creating it) on ``connection`` or the session."""
+    execute = connection.execute if connection is not None else db.session.execute
+    result = execute(_table.update().where(_table.c.name == name).values(last_value=_table.c.last_value + 1))
+    if result.rowcount == 0:
+        execute(_table.insert().values(name=name, last_value=1))
+
+
+def read(name):
+    return db.session.execute(select(_table.c.last_value).where(_table.c.name == name)).scalar() or 0
+
+
+class StampedLRU:
+    """Per-process LRU of ``key -> (value, cached at)``, emptied when stamp ``name`` moves.
+
+    Entries are trusted for ``ttl`` seconds; the stamp is read at most every
+    ``check_interval`` seconds.
+    """
+
+    def __init__(self, name, size=1024, ttl=300, check_interval=5):
+        self.name = name
+        self.size = size
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.version = None
+        self.checked_at = 0.0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _sync_version(self, now):
+        if now - self.checked_at < self.check_interval:
+            return
+        version = read(self.name)
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+            self.checked_at = now
+
+    def get(self, key):
+        """The cached value for ``key``, or None."""
+        now = time.monotonic()
+        self._sync_version(now)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry[1] > self.ttl:
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def evict(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,190 @@
+"""Deterministic synthetic datasets (``SIZES``) for load testing; run it against a scratch database."""
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select
+
+from . import db, employee_dashboard, kpis
+from .asset_ids import asset_ids_for
+from .models import Asset, Employee, Maintenance, SoftwareLicense
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+BATCH_SIZE = 5000
+ASSIGNABLE_STATUSES = ("In Use", "Repair")
+
+FIRST_NAMES = ["Alex", "Sam", "Priya", "Chen", "Maria", "John", "Fatima", "Luca", "Aisha", "Tom",
+               "Nina", "Omar", "Sara", "Ivan", "Mei", "Raj", "Elena", "Kofi", "Anna", "Diego"]
+LAST_NAMES = ["Smith", "Patel", "Garcia", "Nguyen", "Kim", "Müller", "Rossi", "Okafor", "Silva", "Khan",
+              "Brown", "Cohen", "Ivanova", "Tanaka", "Haddad", "Jones", "Novak", "Mensah", "Larsen", "Lopez"]
+DEPARTMENTS = ["Engineering", "Sales", "Finance", "HR", "Operations", "Marketing", "Support", "Legal", "IT"]
+CATALOG = {
+    "Laptop": [("Dell", "Latitude 5440"), ("Lenovo", "ThinkPad T14"), ("Apple", "MacBook Pro 14"), ("HP", "EliteBook 840")],
+    "Monitor": [("Dell", "P2723QE"), ("LG", "27UL850"), ("Samsung", "S27A600")],
+    "Desktop": [("Dell", "OptiPlex 7010"), ("HP", "ProDesk 400"), ("Lenovo", "ThinkCentre M70")],
+    "Phone": [("Apple", "iPhone 14"), ("Samsung", "Galaxy S23"), ("Google", "Pixel 8")],
+    "Printer": [("HP", "LaserJet M404"), ("Brother", "HL-L2350")],
+    "Tablet": [("Apple", "iPad Air"), ("Samsung", "Galaxy Tab S9")],
+}
+SOFTWARE = ["Microsoft 365", "Adobe Acrobat", "Slack", "Zoom", "JetBrains IDE", "Figma", "AutoCAD",
+            "Tableau", "Atlassian Jira", "Salesforce"]
+MAINTENANCE_WORK = ["Battery replacement", "Screen repair", "OS reinstall", "Keyboard replacement",
+                    "Fan cleaning", "Firmware update", "Toner replacement", "Port repair"]
+
+
+@dataclass
+class Profile:
+    """Shape of a generated dataset."""
+    assets: int = SIZES["10k"]
+    employees: int | None = None  # default: one per three assets
+    assigned_ratio: float = 0.95  # of assets in ASSIGNABLE_STATUSES
+    maintenance_per_asset: float = 1.5
+    licenses_per_employee: float = 1.2
+    asset_types: dict = field(default_factory=lambda: {
+        "Laptop": 45, "Monitor": 25, "Desktop": 10, "Phone": 12, "Printer": 3, "Tablet": 5,
+    })
+    statuses: dict = field(default_factory=lambda: {
+        "In Use": 70, "Available": 15, "Repair": 5, "Retired": 10,
+    })
+    seed: int = 42
+
+    @property
+    def employee_count(self):
+        return self.employees if self.employees is not None else max(1, self.assets // 3)
+
+
+@dataclass
+class GenerateResult:
+    employees: int = 0
+    assets: int = 0
+    maintenance: int = 0
+    licenses: int = 0
+
+
+def _next_id(model):
+    return (db.session.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _insert(model, rows):
+    try:
+        db.session.execute(model.__table__.insert(), rows)
+        kpis.mark_stale()
+        employee_dashboard.mark_stale()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def _weighted(rng, weights, k):
+    return rng.choices(list(weights), weights=list(weights.values()), k=k)
+
+
+def _employees(rng, profile, first_id, progress):
+    total = profile.employee_count
+    for start in range(0, total, BATCH_SIZE):
+        rows = []
+        for n in range(start, min(total, start + BATCH_SIZE)):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            rows.append({
+                "id": first_id + n,
+                "name": f"{first} {last}",
+                "department": rng.choice(DEPARTMENTS),
+                "contact": f"{first.lower()}.{last.lower()}{first_id + n}@example.com",
+            })
+        _insert(Employee, rows)
+        progress("employees", start + len(rows), total)
+    return total
+
+
+def _assets(rng, profile, first_id, employee_ids, progress):
+    total = profile.assets
+    today = date.today()
+    for start in range(0, total, BATCH_SIZE):
+        count = min(BATCH_SIZE, total - start)
+        types = _weighted(rng, profile.asset_types, count)
+        statuses = _weighted(rng, profile.statuses, count)
+        tags = asset_ids_for(types)
+        rows = []
+        for n, (asset_type, status, tag) in enumerate(zip(types, statuses, tags)):
+            brand, model = rng.choice(CATALOG.get(asset_type) or [("Generic", asset_type)])
+            purchased = today - timedelta(days=rng.randint(0, 5 * 365))
+            assigned = status in ASSIGNABLE_STATUSES and rng.random() < profile.assigned_ratio
+            rows.append({
+                "id": first_id + start + n,
+                "asset_id": tag,
+                "asset_type": asset_type,
+                "brand": brand,
+                "model": model,
+                "serial_no": f"SN{rng.getrandbits(40):010X}",
+                "purchase_date": purchased,
+                "warranty_expiry": purchased + timedelta(days=rng.choice((365, 730, 1095, 1460))),
+                "status": status,
+                "notes": None if rng.random() < 0.9 else rng.choice(MAINTENANCE_WORK),
+                "assigned_to": rng.choice(employee_ids) if assigned and employee_ids else None,
+            })
+        _insert(Asset, rows)
+        progress("assets", start + count, total)
+    return total
+
+
+def _maintenance(rng, profile, asset_ids, progress):
+    total = int(len(asset_ids) * profile.maintenance_per_asset)
+    today = date.today()
+    done = 0
+    while done < total:
+        rows = []
+        for _ in range(min(BATCH_SIZE, total - done)):
+            when = today - timedelta(days=rng.randint(0, 3 * 365))
+            approved = rng.random() < 0.8
+            rows.append({
+                "asset_id": rng.choice(asset_ids),
+                "date": when,
+                "description": rng.choice(MAINTENANCE_WORK),
+                "cost": round(rng.lognormvariate(4.5, 0.8), 2),
+                "status": "Approved" if approved else "Pending",
+                "approved_by": None,
+                "approved_at": datetime.combine(when, datetime.min.time()) + timedelta(days=rng.randint(0, 14)) if approved else None,
+            })
+        _insert(Maintenance, rows)
+        done += len(rows)
+        progress("maintenance", done, total)
+    return total
+
+
+def _licenses(rng, profile, employee_ids, progress):
+    total = int(len(employee_ids) * profile.licenses_per_employee)
+    today = date.today()
+    done = 0
+    while done < total:
+        rows = []
+        for _ in range(min(BATCH_SIZE, total - done)):
+            rows.append({
+                "software_name": rng.choice(SOFTWARE),
+                "license_key": "-".join(f"{rng.getrandbits(16):04X}" for _ in range(4)),
+                "expiry_date": today + timedelta(days=rng.randint(-365, 2 * 365)),
+                "assigned_to": rng.choice(employee_ids) if rng.random() < 0.9 else None,
+            })
+        _insert(SoftwareLicense, rows)
+        done += len(rows)
+        progress("licenses", done, total)
+    return total
+
+
+def generate(profile, progress=None):
+    """Insert a dataset shaped by ``profile``; returns the row counts."""
+    progress = progress or (lambda label, done, total: None)
+    rng = random.Random(profile.seed)
+    result = GenerateResult()
+
+    first_employee = _next_id(Employee)
+    result.employees = _employees(rng, profile, first_employee, progress)
+    employee_ids = range(first_employee, first_employee + result.employees)
+
+    first_asset = _next_id(Asset)
+    result.assets = _assets(rng, profile, first_asset, employee_ids, progress)
+    asset_ids = range(first_asset, first_asset + result.assets)
+
+    result.maintenance = _maintenance(rng, profile, asset_ids, progress)
+    result.licenses = _licenses(rng, profile, employee_ids, progress)
+    return result
@@ -0,0 +1,75 @@
+"""Per-process cache for the Flask-Login user loader.
+
+``load_user`` runs on every authenticated request. Instead of a SELECT each
+time, the user's column values are kept in a small LRU (``USER_CACHE_SIZE``
+entries, each trusted for ``USER_CACHE_TTL`` seconds) and turned back into a
+session-attached ``User`` with ``merge(load=False)``, which issues no SQL;
+views that change the user (``change_password``) still flush normally.
+
+Invalidation uses a version stamp, the ``users:version`` row of
+``id_counter``. Mapper events on ``User`` bump it inside the same transaction
+as any update or delete (role change, password reset, deletion, password
+change) and evict that user from this process right away. Other processes
+compare their last seen stamp with the row at most every
+``USER_CACHE_CHECK_INTERVAL`` seconds and drop their whole cache when it
+moved, so a change reaches every worker within that interval.
+"""
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from . import db, stamps
+from .models import User
+
+VERSION_KEY = "users:version"
+
+
+def _columns():
+    return [attr.key for attr in inspect(User).column_attrs]
+
+
+def cache():
+    """The user cache for the current app (created on first use): ``user id -> column values``."""
+    ext = current_app.extensions
+    if "user_cache" not in ext:
+        config = current_app.config
+        ext["user_cache"] = stamps.StampedLRU(
+            VERSION_KEY,
+            size=config.get("USER_CACHE_SIZE", 1024),
+            ttl=config.get("USER_CACHE_TTL", 300),
+            check_interval=config.get("USER_CACHE_CHECK_INTERVAL", 5),
+        )
+    return ext["user_cache"]
+
+
+def load(user_id):
+    """``User`` for ``user_id`` attached to the current session, from the cache when possible."""
+    if not current_app.config.get("USER_CACHE_ENABLED", True):
+        return db.session.get(User, user_id)
+    users = cache()
+    values = users.get(user_id)
+    if values is None:
+        user = db.session.get(User, user_id)
+        if user is not None:
+            users.put(user.id, {key: getattr(user, key) for key in _columns()})
+        return user
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+
+# -------------------- Invalidation --------------------
+def _changed(connection, target):
+    stamps.bump(VERSION_KEY, connection)
+    if has_app_context():
+        cache().evict(target.id)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    _changed(connection, target)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    _changed(connection, target)
@@ -1,6 +1,14 @@
 import os
+import tempfile
 BASEDIR = os.path.abspath(os.path.dirname(__file__))
 
+
+def _optional_int(name, default):
+    """Integer env var; set but blank gives None."""
+    value = os.getenv(name, default).strip()
+    return int(value) if value else None
+
+
 class Config:
     """Base configuration."""
 
@@ -12,6 +20,21 @@ class Config:
         f"sqlite:///{os.path.join(BASEDIR, 'instance', 'site.db')}"
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # SQLite connection profile, applied per connection (blank disables a PRAGMA)
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT = _optional_int('SQLITE_BUSY_TIMEOUT', '5000')  # milliseconds
+    SQLITE_MMAP_SIZE = _optional_int('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))  # bytes
+    SQLITE_CACHE_SIZE = _optional_int('SQLITE_CACHE_SIZE', '-20000')  # negative = KiB
+    SQLITE_TEMP_STORE = os.getenv('SQLITE_TEMP_STORE', 'MEMORY')
+    # Connection pool (ignored for in-memory SQLite)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '-1'))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'false').lower() in ['true', 'on', '1']
+    # Make list/export queries raise on any lazy relationship load (use in tests)
+    RAISE_ON_LAZY_LOAD = os.getenv('RAISE_ON_LAZY_LOAD', 'false').lower() in ['true', 'on', '1']
     
     # Email configuration
     MAIL_SERVER = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
@@ -20,10 +43,70 @@ class Config:
     MAIL_USERNAME = os.getenv('MAIL_USERNAME')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.getenv('MAIL_DEFAULT_SENDER')
+    # Parallel delivery: SMTP connections in flight, retries per message, base backoff (seconds)
+    MAIL_MAX_WORKERS = int(os.getenv('MAIL_MAX_WORKERS', '4'))
+    MAIL_SEND_RETRIES = int(os.getenv('MAIL_SEND_RETRIES', '2'))
+    MAIL_RETRY_BACKOFF = float(os.getenv('MAIL_RETRY_BACKOFF', '1.0'))
     
     # Notification settings
     LICENSE_EXPIRY_DAYS = int(os.getenv('LICENSE_EXPIRY_DAYS', '30'))
     WARRANTY_EXPIRY_DAYS = int(os.getenv('WARRANTY_EXPIRY_DAYS', '30'))
+    # Days-left thresholds; each recipient is mailed once per item as it crosses each one
+    NOTIFICATION_THRESHOLDS = [int(d) for d in os.getenv('NOTIFICATION_THRESHOLDS', '30,14,7,1').split(',') if d.strip()]
+
+    # Notification scheduler: one process across all workers/hosts holds the lease and runs the jobs
+    SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'true').lower() in ['true', 'on', '1']
+    SCHEDULER_LEASE_TTL = int(os.getenv('SCHEDULER_LEASE_TTL', '90'))  # seconds before a silent leader is replaced
+    SCHEDULER_HEARTBEAT = int(os.getenv('SCHEDULER_HEARTBEAT', '30'))  # seconds between lease renewals
+
+    # Employee dashboards are cached per process; changes reach other workers within the check interval
+    EMPLOYEE_DASHBOARD_CACHE_SIZE = int(os.getenv('EMPLOYEE_DASHBOARD_CACHE_SIZE', '1024'))
+    EMPLOYEE_DASHBOARD_TTL = int(os.getenv('EMPLOYEE_DASHBOARD_TTL', '60'))  # seconds
+    EMPLOYEE_DASHBOARD_CHECK_INTERVAL = float(os.getenv('EMPLOYEE_DASHBOARD_CHECK_INTERVAL', '5'))  # seconds
+
+    # Password hashing (werkzeug method string); existing hashes are upgraded on the next login
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_SALT_LENGTH = int(os.getenv('PASSWORD_SALT_LENGTH', '16'))
+    # Hashing threads per process, and logins allowed to verify at once before asking users to retry
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+    LOGIN_CONCURRENCY = int(os.getenv('LOGIN_CONCURRENCY', '8'))
+    LOGIN_QUEUE_TIMEOUT = float(os.getenv('LOGIN_QUEUE_TIMEOUT', '5'))  # seconds
+
+    # Logged-in users are cached per process; changes reach other workers within the check interval
+    USER_CACHE_ENABLED = os.getenv('USER_CACHE_ENABLED', 'true').lower() in ['true', 'on', '1']
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', '1024'))
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', '300'))  # seconds
+    USER_CACHE_CHECK_INTERVAL = float(os.getenv('USER_CACHE_CHECK_INTERVAL', '5'))  # seconds
+
+    # Per-request timing on /admin/perf: recent requests kept per endpoint for percentiles
+    PERF_ENABLED = os.getenv('PERF_ENABLED', 'true').lower() in ['true', 'on', '1']
+    PERF_WINDOW = int(os.getenv('PERF_WINDOW', '1000'))
+    # Server-Timing response header with those numbers, only ever sent to Admin sessions
+    PERF_SERVER_TIMING = os.getenv('PERF_SERVER_TIMING', 'false').lower() in ['true', 'on', '1']
+    # Statements at or over this many ms are logged with their endpoint (and plan, if enabled)
+    SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '100'))
+    SLOW_QUERY_EXPLAIN = os.getenv('SLOW_QUERY_EXPLAIN', 'false').lower() in ['true', 'on', '1']
+    SLOW_QUERY_RECENT = int(os.getenv('SLOW_QUERY_RECENT', '50'))
+    SQL_FINGERPRINT_LIMIT = int(os.getenv('SQL_FINGERPRINT_LIMIT', '500'))
+
+    # Asset tags: PREFIX-00001; per-type prefixes as "Laptop:LAP,Monitor:MON"; numbers reserved per process in blocks
+    ASSET_ID_PREFIX = os.getenv('ASSET_ID_PREFIX', 'AST')
+    ASSET_ID_PREFIXES = os.getenv('ASSET_ID_PREFIXES', '')
+    ASSET_ID_DIGITS = int(os.getenv('ASSET_ID_DIGITS', '5'))  # minimum width; longer numbers are not truncated
+    ASSET_ID_BLOCK_SIZE = int(os.getenv('ASSET_ID_BLOCK_SIZE', '20'))
+
+    # Asset search: matches ranked per query (broad terms rank only the newest this many; older matches follow unranked)
+    SEARCH_RANK_CANDIDATES = int(os.getenv('SEARCH_RANK_CANDIDATES', '5000'))
+
+    # Background export jobs
+    EXPORT_DIR = os.getenv('EXPORT_DIR', os.path.join(tempfile.gettempdir(), 'it-asset-exports'))  # outside the source tree
+    EXPORT_JOB_WORKERS = int(os.getenv('EXPORT_JOB_WORKERS', '2'))
+    EXPORT_ARTIFACT_TTL = int(os.getenv('EXPORT_ARTIFACT_TTL', '86400'))  # seconds kept on disk
+    EXPORT_REUSE_SECONDS = int(os.getenv('EXPORT_REUSE_SECONDS', '600'))  # serve identical requests from cache
+    EXPORT_STALE_SECONDS = int(os.getenv('EXPORT_STALE_SECONDS', '1800'))  # unfinished jobs with no worker heartbeat for this long are marked Failed
+
+    # Dashboard KPI snapshot: full recompute after this many seconds (0 = only on demand)
+    KPI_SNAPSHOT_TTL = int(os.getenv('KPI_SNAPSHOT_TTL', '3600'))
     
     # HR Integration settings
     HR_API_KEY = os.getenv('HR_API_KEY', 'hr-integration-key-123')
@@ -0,0 +1,69 @@
+"""add asset full-text search index (SQLite FTS5)
+
+Revision ID: add_asset_search
+Revises: add_scheduler_lease
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_asset_search'
+down_revision = 'add_scheduler_lease'
+branch_labels = None
+depends_on = None
+
+
+INSERT_ROW = (
+    "INSERT INTO asset_fts(rowid, asset_id, serial_no, brand, model, asset_type, employee_name, notes) "
+    "VALUES (new.id, new.asset_id, new.serial_no, new.brand, new.model, new.asset_type, "
+    "coalesce((SELECT name FROM employee WHERE id = new.assigned_to), ''), new.notes);"
+)
+
+TRIGGERS = {
+    'asset_fts_ai': "AFTER INSERT ON asset BEGIN " + INSERT_ROW + " END",
+    'asset_fts_au': (
+        "AFTER UPDATE OF asset_id, serial_no, brand, model, notes, asset_type, assigned_to ON asset BEGIN "
+        "DELETE FROM asset_fts WHERE rowid = old.id; " + INSERT_ROW + " END"
+    ),
+    'asset_fts_ad': "AFTER DELETE ON asset BEGIN DELETE FROM asset_fts WHERE rowid = old.id; END",
+    'asset_fts_employee_au': (
+        "AFTER UPDATE OF name ON employee BEGIN "
+        "UPDATE asset_fts SET employee_name = coalesce(new.name, '') "
+        "WHERE rowid IN (SELECT id FROM asset WHERE assigned_to = new.id); END"
+    ),
+    'asset_fts_employee_ad': (
+        "AFTER DELETE ON employee BEGIN "
+        "UPDATE asset_fts SET employee_name = '' "
+        "WHERE rowid IN (SELECT id FROM asset WHERE assigned_to = old.id); END"
+    ),
+}
+
+
+def upgrade():
+    # FTS5 is SQLite-only; other databases use the LIKE fallback in app/search.py
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS asset_fts USING fts5("
+        "asset_id, serial_no, brand, model, asset_type, employee_name, notes, "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')"
+    )
+    for name, body in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    op.execute("DELETE FROM asset_fts")
+    op.execute(
+        "INSERT INTO asset_fts(rowid, asset_id, serial_no, brand, model, asset_type, employee_name, notes) "
+        "SELECT asset.id, asset.asset_id, asset.serial_no, asset.brand, asset.model, asset.asset_type, "
+        "coalesce(employee.name, ''), asset.notes "
+        "FROM asset LEFT OUTER JOIN employee ON employee.id = asset.assigned_to"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for name in reversed(list(TRIGGERS)):
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS asset_fts")
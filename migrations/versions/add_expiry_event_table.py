@@ -0,0 +1,82 @@
+"""add expiry calendar (licenses and warranties)
+
+Revision ID: add_expiry_event
+Revises: add_user_employee_link
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_expiry_event'
+down_revision = 'add_user_employee_link'
+branch_labels = None
+depends_on = None
+
+
+TRIGGERS = {
+    'license_expiry_ai': (
+        "AFTER INSERT ON software_license WHEN new.expiry_date IS NOT NULL BEGIN "
+        "INSERT INTO expiry_event(kind, ref_id, expires_on) VALUES ('license', new.id, new.expiry_date); END"
+    ),
+    'license_expiry_au': (
+        "AFTER UPDATE OF expiry_date ON software_license BEGIN "
+        "DELETE FROM expiry_event WHERE kind = 'license' AND ref_id = old.id; "
+        "INSERT INTO expiry_event(kind, ref_id, expires_on) "
+        "SELECT 'license', new.id, new.expiry_date WHERE new.expiry_date IS NOT NULL; END"
+    ),
+    'license_expiry_ad': (
+        "AFTER DELETE ON software_license BEGIN "
+        "DELETE FROM expiry_event WHERE kind = 'license' AND ref_id = old.id; END"
+    ),
+    'warranty_expiry_ai': (
+        "AFTER INSERT ON asset WHEN new.warranty_expiry IS NOT NULL BEGIN "
+        "INSERT INTO expiry_event(kind, ref_id, expires_on) VALUES ('warranty', new.id, new.warranty_expiry); END"
+    ),
+    'warranty_expiry_au': (
+        "AFTER UPDATE OF warranty_expiry ON asset BEGIN "
+        "DELETE FROM expiry_event WHERE kind = 'warranty' AND ref_id = old.id; "
+        "INSERT INTO expiry_event(kind, ref_id, expires_on) "
+        "SELECT 'warranty', new.id, new.warranty_expiry WHERE new.warranty_expiry IS NOT NULL; END"
+    ),
+    'warranty_expiry_ad': (
+        "AFTER DELETE ON asset BEGIN "
+        "DELETE FROM expiry_event WHERE kind = 'warranty' AND ref_id = old.id; END"
+    ),
+}
+
+
+def upgrade():
+    op.create_table('expiry_event',
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('ref_id', sa.Integer(), nullable=False),
+    sa.Column('expires_on', sa.Date(), nullable=False),
+    sa.PrimaryKeyConstraint('kind', 'ref_id'),
+    if_not_exists=True
+    )
+    op.create_index('ix_expiry_event_expires_on', 'expiry_event', ['expires_on', 'kind', 'ref_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_expiry_event_kind_expires_on', 'expiry_event', ['kind', 'expires_on', 'ref_id'], unique=False, if_not_exists=True)
+    # Triggers are SQLite-only; other databases read the source columns directly (app/expiries.py)
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for name, body in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    op.execute("DELETE FROM expiry_event")
+    op.execute(
+        "INSERT INTO expiry_event(kind, ref_id, expires_on) "
+        "SELECT 'license', id, expiry_date FROM software_license WHERE expiry_date IS NOT NULL"
+    )
+    op.execute(
+        "INSERT INTO expiry_event(kind, ref_id, expires_on) "
+        "SELECT 'warranty', id, warranty_expiry FROM asset WHERE warranty_expiry IS NOT NULL"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        for name in TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_index('ix_expiry_event_kind_expires_on', table_name='expiry_event')
+    op.drop_index('ix_expiry_event_expires_on', table_name='expiry_event')
+    op.drop_table('expiry_event')
@@ -0,0 +1,29 @@
+"""add export job heartbeat
+
+Revision ID: add_export_job_heartbeat
+Revises: add_notification_delivery
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_export_job_heartbeat'
+down_revision = 'add_notification_delivery'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The SQLite safety block in create_app may already have added the column
+    inspector = sa.inspect(op.get_bind())
+    if 'heartbeat_at' in {c['name'] for c in inspector.get_columns('export_job')}:
+        return
+    with op.batch_alter_table('export_job') as batch_op:
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('export_job') as batch_op:
+        batch_op.drop_column('heartbeat_at')
@@ -0,0 +1,47 @@
+"""add indexes for hot filter and sort columns
+
+Revision ID: add_hot_path_indexes
+Revises: add_export_job
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_hot_path_indexes'
+down_revision = 'add_export_job'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) matched to the queries in app/routes.py and app/queries.py
+INDEXES = [
+    # Asset list filters, status KPIs, warranty expiry scans, assignee lookups
+    ('ix_asset_status', 'asset', ['status']),
+    ('ix_asset_asset_type', 'asset', ['asset_type']),
+    ('ix_asset_brand', 'asset', ['brand']),
+    ('ix_asset_warranty_expiry', 'asset', ['warranty_expiry']),
+    ('ix_asset_assigned_to', 'asset', ['assigned_to']),
+    # License expiry windows and assignee lookups
+    ('ix_software_license_expiry_date', 'software_license', ['expiry_date']),
+    ('ix_software_license_assigned_to', 'software_license', ['assigned_to']),
+    # Maintenance by asset, by date, pending/approved dashboard lists
+    ('ix_maintenance_asset_id', 'maintenance', ['asset_id']),
+    ('ix_maintenance_date', 'maintenance', ['date']),
+    ('ix_maintenance_status_date', 'maintenance', ['status', 'date']),
+    ('ix_maintenance_status_approved_at', 'maintenance', ['status', 'approved_at']),
+    # Admin/IT recipient lookups
+    ('ix_user_role', 'user', ['role']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        # The SQLite safety block in create_app may already have created them
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,28 @@
+"""add id counter table
+
+Revision ID: add_id_counter
+Revises: add_asset_search
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_id_counter'
+down_revision = 'add_asset_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('id_counter',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('last_value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name'),
+    if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('id_counter')
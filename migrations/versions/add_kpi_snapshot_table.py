@@ -0,0 +1,29 @@
+"""add kpi snapshot table
+
+Revision ID: add_kpi_snapshot
+Revises: add_maint_approval
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_kpi_snapshot'
+down_revision = 'add_maint_approval'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('kpi_snapshot',
+    sa.Column('key', sa.String(length=190), nullable=False),
+    sa.Column('value', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('key'),
+    if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('kpi_snapshot')
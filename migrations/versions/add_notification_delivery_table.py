@@ -0,0 +1,34 @@
+"""add notification delivery ledger
+
+Revision ID: add_notification_delivery
+Revises: add_expiry_event
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_notification_delivery'
+down_revision = 'add_expiry_event'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('notification_delivery',
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('ref_id', sa.Integer(), nullable=False),
+    sa.Column('expires_on', sa.Date(), nullable=False),
+    sa.Column('recipient', sa.String(length=120), nullable=False),
+    sa.Column('bucket', sa.Integer(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('kind', 'ref_id', 'expires_on', 'recipient', 'bucket'),
+    if_not_exists=True
+    )
+    op.create_index('ix_notification_delivery_kind_expires_on', 'notification_delivery', ['kind', 'expires_on'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_notification_delivery_kind_expires_on', table_name='notification_delivery')
+    op.drop_table('notification_delivery')
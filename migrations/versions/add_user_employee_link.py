@@ -0,0 +1,35 @@
+"""link user to employee
+
+Revision ID: add_user_employee_link
+Revises: widen_password_hash
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_user_employee_link'
+down_revision = 'widen_password_hash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The SQLite safety block in create_app may already have added the column and its index
+    inspector = sa.inspect(op.get_bind())
+    has_column = 'employee_id' in {c['name'] for c in inspector.get_columns('user')}
+    has_fk = any(fk['constrained_columns'] == ['employee_id'] for fk in inspector.get_foreign_keys('user'))
+    if not (has_column and has_fk):
+        with op.batch_alter_table('user') as batch_op:
+            if not has_column:
+                batch_op.add_column(sa.Column('employee_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_user_employee_id', 'employee', ['employee_id'], ['id'])
+    op.create_index('ix_user_employee_id', 'user', ['employee_id'], unique=True, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_user_employee_id', table_name='user', if_exists=True)
+    with op.batch_alter_table('user') as batch_op:
+        # Dropping the column drops its foreign key, named or not, when the table is rebuilt
+        batch_op.drop_column('employee_id')
@@ -0,0 +1,26 @@
+"""widen user password hash
+
+Revision ID: widen_password_hash
+Revises: add_id_counter
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'widen_password_hash'
+down_revision = 'add_id_counter'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # scrypt hashes (werkzeug's default) are ~160 characters
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.alter_column('password_hash', existing_type=sa.String(length=128), type_=sa.String(length=256), existing_nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.alter_column('password_hash', existing_type=sa.String(length=256), type_=sa.String(length=128), existing_nullable=False)
@@ -9,43 +9,151 @@ except ImportError:
     CronTrigger = None
 
 from app.routes import send_license_expiry_notifications, send_warranty_expiry_notifications
+import atexit
 import logging
+import threading
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def start_scheduler():
-    """Start the background scheduler for notifications."""
-    if not SCHEDULER_AVAILABLE:
-        logger.warning("APScheduler not available. Skipping scheduler startup.")
+LEASE_NAME = 'notification_scheduler'
+
+
+def _run_as_leader(job, app, leader):
+    """Run a notification job only if this process still holds the lease."""
+    if not leader.confirm():
+        logger.info("Skipping %s: scheduler lease is held by another process", job.__name__)
         return None
-    
+    return job(app=app)
+
+
+def _build_scheduler(app, leader):
     scheduler = BackgroundScheduler()
-    
+
     # Schedule license expiry notifications to run daily at 9:00 AM
     scheduler.add_job(
-        func=send_license_expiry_notifications,
+        func=_run_as_leader,
+        args=(send_license_expiry_notifications, app, leader),
         trigger=CronTrigger(hour=9, minute=0),  # 9:00 AM daily
         id='license_expiry_notifications',
         name='License Expiry Notifications',
         replace_existing=True
     )
-    
+
     # Schedule warranty expiry notifications to run daily at 9:30 AM
     scheduler.add_job(
-        func=send_warranty_expiry_notifications,
+        func=_run_as_leader,
+        args=(send_warranty_expiry_notifications, app, leader),
         trigger=CronTrigger(hour=9, minute=30),  # 9:30 AM daily
         id='warranty_expiry_notifications',
         name='Warranty Expiry Notifications',
         replace_existing=True
     )
-    
-    scheduler.start()
-    logger.info("Scheduler started successfully")
-    
     return scheduler
 
+
+class SchedulerLeader:
+    """Run the notification scheduler in exactly one process.
+
+    Every process that calls ``start_scheduler`` gets one of these. A daemon
+    thread renews the ``notification_scheduler`` lease each heartbeat; the
+    process holding it runs the BackgroundScheduler, and the others only wake
+    up to check whether the leader has gone quiet. When the leader stops
+    renewing, another process takes over after ``SCHEDULER_LEASE_TTL``.
+    """
+
+    def __init__(self, app):
+        from app.leases import Lease
+        self.app = app
+        ttl = app.config.get('SCHEDULER_LEASE_TTL', 90)
+        self.heartbeat = max(1, min(app.config.get('SCHEDULER_HEARTBEAT', 30), ttl // 3))
+        self.lease = Lease(LEASE_NAME, ttl)
+        self.scheduler = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='scheduler-lease', daemon=True)
+
+    @property
+    def is_leader(self):
+        return self.scheduler is not None
+
+    def start(self):
+        self._thread.start()
+        atexit.register(self.shutdown)
+        return self
+
+    def _beat(self):
+        """Renew or try to take the lease, and start/stop the scheduler to match."""
+        try:
+            with self.app.app_context():
+                held = self.lease.acquire()
+        except Exception:
+            logger.exception("Scheduler lease heartbeat failed")
+            held = False
+        with self._lock:
+            if self._stop.is_set():
+                return False
+            if held and self.scheduler is None:
+                self.scheduler = _build_scheduler(self.app, self)
+                self.scheduler.start()
+                logger.info("Acquired scheduler lease as %s; notification jobs scheduled", self.lease.holder)
+            elif not held and self.scheduler is not None:
+                self.scheduler.shutdown(wait=False)
+                self.scheduler = None
+                logger.warning("Lost scheduler lease; notification jobs stopped in this process")
+        return held
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._beat()
+            self._stop.wait(self.heartbeat)
+
+    def confirm(self):
+        """Renew the lease right before a job runs; False if it has been lost."""
+        return self._beat()
+
+    def shutdown(self):
+        """Stop the scheduler and hand the lease over immediately."""
+        self._stop.set()
+        with self._lock:
+            was_leader = self.scheduler is not None
+            if was_leader:
+                self.scheduler.shutdown(wait=False)
+                self.scheduler = None
+        if was_leader:
+            try:
+                with self.app.app_context():
+                    self.lease.release()
+            except Exception:
+                logger.exception("Could not release scheduler lease")
+
+
+def start_scheduler(app=None):
+    """Start the background scheduler for notifications.
+
+    The scheduler owns one long-lived app (the caller's, or one created here)
+    and hands it to every job, so runs reuse its engine and connection pool
+    instead of bootstrapping a new app each time. Any number of processes may
+    call this; only the one holding the database lease runs the jobs.
+    """
+    if not SCHEDULER_AVAILABLE:
+        logger.warning("APScheduler not available. Skipping scheduler startup.")
+        return None
+
+    if app is None:
+        from app import create_app
+        app = create_app()
+
+    if not app.config.get('SCHEDULER_ENABLED', True):
+        logger.info("Scheduler disabled by SCHEDULER_ENABLED")
+        return None
+
+    leader = SchedulerLeader(app).start()
+    logger.info("Scheduler started; waiting for lease %r", LEASE_NAME)
+
+    return leader
+
 if __name__ == '__main__':
     # Test the scheduler
     scheduler = start_scheduler()
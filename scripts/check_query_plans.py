@@ -0,0 +1,58 @@
+"""Print SQLite query plans for the hot dashboard/notification queries.
+
+Flags any query whose plan still scans a whole table instead of using an
+index. Run after ``flask db upgrade``:
+
+    PYTHONPATH=. python scripts/check_query_plans.py
+"""
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from app import create_app, db
+from app.models import Asset, Maintenance, SoftwareLicense, User
+
+
+def hot_queries():
+    today = date.today()
+    soon = today + timedelta(days=30)
+    return {
+        "pending maintenance": Maintenance.query.filter_by(status="Pending").order_by(Maintenance.date.desc()).limit(5),
+        "recently approved": Maintenance.query.filter_by(status="Approved").order_by(Maintenance.approved_at.desc()).limit(5),
+        "maintenance by date": Maintenance.query.order_by(Maintenance.date.desc()).limit(5),
+        "maintenance for asset": Maintenance.query.filter_by(asset_id=1),
+        "maintenance cost year": Maintenance.query.filter(Maintenance.date >= date(today.year, 1, 1), Maintenance.date < date(today.year + 1, 1, 1)),
+        "assets by status": Asset.query.filter_by(status="Available"),
+        "assets by assignee": Asset.query.filter_by(assigned_to=1),
+        "warranties expiring": Asset.query.filter(Asset.warranty_expiry >= today, Asset.warranty_expiry <= soon),
+        "licenses expiring": SoftwareLicense.query.filter(SoftwareLicense.expiry_date >= today, SoftwareLicense.expiry_date <= soon),
+        "licenses by assignee": SoftwareLicense.query.filter_by(assigned_to=1),
+        "admin/IT recipients": User.query.filter(User.role.in_(["Admin", "IT"])),
+    }
+
+
+def explain(query):
+    stmt = query.statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {stmt}")).all()
+    return [row[-1] for row in rows]
+
+
+def main() -> None:
+    app = create_app()
+    with app.app_context():
+        if db.engine.dialect.name != "sqlite":
+            print("EXPLAIN QUERY PLAN output is SQLite-specific; skipping.")
+            return
+        scans = 0
+        for name, query in hot_queries().items():
+            plan = explain(query)
+            scanning = any(step.startswith("SCAN") and "USING" not in step for step in plan)
+            scans += scanning
+            print(f"{'SCAN' if scanning else 'ok  '}  {name}")
+            for step in plan:
+                print(f"      {step}")
+        print(f"Done. {scans} full table scan(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Shared fixtures: one app on a temporary SQLite database, scheduler off."""
+import os
+import tempfile
+
+import pytest
+
+_DB_DIR = tempfile.mkdtemp(prefix="itam-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ["EXPORT_DIR"] = os.path.join(_DB_DIR, "exports")
+os.environ["SCHEDULER_ENABLED"] = "false"
+
+from app import create_app, db, expiries, search  # noqa: E402
+from app.models import User  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def reset_database(app):
+    """Recreate every table and the search/expiry indexes, with one Admin user. Returns its id."""
+    # Per-process caches would otherwise outlive the tables they were filled from
+    for name in ("user_cache", "employee_dashboard"):
+        app.extensions.pop(name, None)
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql(f"DROP TABLE IF EXISTS {search.FTS_TABLE}")
+        db.create_all()
+        with db.engine.begin() as connection:
+            search.ensure_index(connection)
+            expiries.ensure_index(connection)
+        admin = User(username="admin", email="admin@example.com", role="Admin")
+        admin.set_password("password1")
+        db.session.add(admin)
+        db.session.commit()
+        return admin.id
+
+
+@pytest.fixture
+def admin_client(app):
+    """A test client whose session is logged in as the Admin from ``reset_database``."""
+    client = app.test_client()
+    with app.app_context():
+        admin = User.query.filter_by(username="admin").one()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(admin.id)
+        session["_fresh"] = True
+    return client
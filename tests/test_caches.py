@@ -0,0 +1,70 @@
+"""Stamped per-process caches (logins, employee dashboards)."""
+import pytest
+
+from app import db, employee_dashboard, stamps
+from app.models import Asset, Employee, User
+
+from conftest import reset_database
+
+
+@pytest.fixture(autouse=True)
+def fresh(app):
+    reset_database(app)
+
+
+def test_stamped_lru_drops_entries_when_the_stamp_moves(app):
+    with app.app_context():
+        lru = stamps.StampedLRU("test:version", size=2, ttl=60, check_interval=0)
+        assert lru.get(1) is None
+        lru.put(1, "one")
+        lru.put(2, "two")
+        assert lru.get(1) == "one"
+        lru.put(3, "three")  # evicts 2, the least recently used
+        assert lru.get(2) is None and lru.get(3) == "three"
+        stamps.bump("test:version")
+        db.session.commit()
+        assert lru.get(1) is None
+
+
+def test_employee_dashboard_is_cached_until_its_assets_change(app):
+    with app.app_context():
+        employee = Employee(name="Ada")
+        db.session.add(employee)
+        db.session.flush()
+        db.session.add(Asset(asset_id="AST-00001", asset_type="Laptop", status="Active", assigned_to=employee.id))
+        db.session.commit()
+        first = employee_dashboard.for_employee(employee.id)
+        assert [a.asset_id for a in first.assets] == ["AST-00001"]
+        assert employee_dashboard.for_employee(employee.id) is first
+        db.session.add(Asset(asset_id="AST-00002", asset_type="Phone", status="Active", assigned_to=employee.id))
+        db.session.commit()
+        assert len(employee_dashboard.for_employee(employee.id).assets) == 2
+
+
+def test_user_loader_reads_role_changes(app, admin_client):
+    assert admin_client.get("/admin/dashboard").status_code == 200
+    with app.app_context():
+        User.query.filter_by(username="admin").one().role = "Employee"
+        db.session.commit()
+    assert admin_client.get("/admin/dashboard").status_code != 200
+
+
+def test_asset_edits_outside_the_dashboard_keep_the_stamp(app):
+    with app.app_context():
+        employee = Employee(name="Ada")
+        db.session.add(employee)
+        db.session.flush()
+        asset = Asset(asset_id="AST-00001", asset_type="Laptop", status="Active", assigned_to=employee.id)
+        db.session.add(asset)
+        db.session.commit()
+        before = stamps.read(employee_dashboard.VERSION_KEY)
+        asset.notes = "Spare charger in the drawer"
+        asset.serial_no = "SN-1"
+        db.session.commit()
+        assert stamps.read(employee_dashboard.VERSION_KEY) == before
+        asset.status = "Repair"
+        db.session.commit()
+        assert stamps.read(employee_dashboard.VERSION_KEY) == before + 1
+        asset.assigned_to = None
+        db.session.commit()
+        assert stamps.read(employee_dashboard.VERSION_KEY) == before + 2
@@ -0,0 +1,35 @@
+"""Dashboard year selector."""
+from datetime import date
+
+import pytest
+
+from app import db
+from app.analytics import selected_cost_year
+from app.models import Asset, Maintenance
+
+from conftest import reset_database
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seeded(app):
+    reset_database(app)
+    with app.app_context():
+        asset = Asset(asset_id="AST-00001", asset_type="Laptop", status="Available")
+        db.session.add(asset)
+        db.session.flush()
+        db.session.add(Maintenance(asset_id=asset.id, date=date(2024, 3, 5), description="Fan", cost=80.0))
+        db.session.commit()
+
+
+def test_selected_cost_year_falls_back_for_years_without_data():
+    assert selected_cost_year("2024", [2024]) == 2024
+    assert selected_cost_year(str(date.today().year), [2024]) == date.today().year
+    for value in ("9999", "0", "-5", "1999", "abc", None):
+        assert selected_cost_year(value, [2024]) == 2024
+
+
+@pytest.mark.parametrize("path", ["/admin/dashboard", "/it/dashboard"])
+@pytest.mark.parametrize("year", ["9999", "0", "10000", "-1", "2024"])
+def test_dashboards_accept_any_year(admin_client, path, year):
+    response = admin_client.get(f"{path}?year={year}")
+    assert response.status_code == 200
@@ -0,0 +1,83 @@
+"""List and export views under ``RAISE_ON_LAZY_LOAD``.
+
+Every relationship these views render must be eager-loaded by
+``app.queries``; with the flag on, a lazy load from a template or an export
+row raises and the request fails.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from app import db
+from app.exports import OPENPYXL_AVAILABLE
+from app.models import Asset, Employee, Maintenance, SoftwareLicense
+
+from conftest import reset_database
+
+# (path, text the page shows when its rows rendered)
+LIST_PAGES = [
+    ("/assets", b"Employee 0"),
+    ("/assets?q=Dell", b"Employee 0"),
+    ("/api/assets", b"AST-00000"),
+    ("/search?q=latitude", b"AST-00000"),
+    ("/api/search?q=latitude", b"AST-00000"),
+    ("/employees", b"Employee 0"),
+    ("/maintenance", b"AST-00000"),
+    ("/licenses", b"Employee 0"),
+    ("/notifications", b"Office"),
+    ("/admin/dashboard", b"Battery"),
+    ("/it/dashboard", b"Pending Maintenance"),
+    ("/maintenance/new", b"AST-00000 (Dell)"),
+    ("/maintenance/1/edit", b"AST-00000 (Dell)"),
+]
+
+CSV_EXPORTS = [f"/export/{name}/csv" for name in ("assets", "employees", "maintenance", "licenses")]
+EXCEL_EXPORTS = [f"/export/{name}/excel" for name in ("assets", "employees", "maintenance", "licenses", "all")]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seeded(app):
+    reset_database(app)
+    app.config["RAISE_ON_LAZY_LOAD"] = True
+    with app.app_context():
+        soon = date.today() + timedelta(days=10)
+        for n in range(3):
+            employee = Employee(name=f"Employee {n}", department="IT", contact=f"e{n}@example.com")
+            db.session.add(employee)
+            db.session.flush()
+            asset = Asset(
+                asset_id=f"AST-{n:05d}", asset_type="Laptop", brand="Dell", model="Latitude",
+                serial_no=f"SN{n}", status="Assigned", warranty_expiry=soon, assigned_to=employee.id,
+            )
+            db.session.add(asset)
+            db.session.flush()
+            db.session.add(Maintenance(asset_id=asset.id, date=date.today(), description="Battery", cost=50.0))
+            db.session.add(SoftwareLicense(
+                software_name="Office", license_key=f"KEY-{n}", expiry_date=soon, assigned_to=employee.id,
+            ))
+        db.session.commit()
+    yield
+    app.config["RAISE_ON_LAZY_LOAD"] = False
+
+
+@pytest.mark.parametrize("path, shown", LIST_PAGES)
+def test_list_views_render_without_lazy_loads(admin_client, path, shown):
+    response = admin_client.get(path)
+    assert response.status_code == 200
+    assert shown in response.data
+
+
+@pytest.mark.parametrize("path", CSV_EXPORTS)
+def test_csv_exports_stream_without_lazy_loads(admin_client, path):
+    response = admin_client.get(path)
+    body = response.get_data()
+    assert response.status_code == 200
+    assert len(body.splitlines()) == 4
+
+
+@pytest.mark.skipif(not OPENPYXL_AVAILABLE, reason="openpyxl not installed")
+@pytest.mark.parametrize("path", EXCEL_EXPORTS)
+def test_excel_exports_build_without_lazy_loads(admin_client, path):
+    response = admin_client.get(path)
+    assert response.status_code == 200
+    assert response.get_data()[:2] == b"PK"
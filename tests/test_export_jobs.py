@@ -0,0 +1,56 @@
+"""Background export jobs: stale detection follows the worker heartbeat."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db, export_jobs
+from app.models import ExportJob
+
+from conftest import reset_database
+
+
+@pytest.fixture(autouse=True)
+def fresh(app):
+    reset_database(app)
+
+
+def _job(job_id, status, created_ago, heartbeat_ago=None):
+    now = datetime.utcnow()
+    job = ExportJob(
+        id=job_id, fmt="csv", datasets="assets", status=status, rows_total=0, rows_done=0,
+        created_at=now - created_ago, expires_at=now + timedelta(days=1),
+        heartbeat_at=now - heartbeat_ago if heartbeat_ago is not None else None,
+    )
+    db.session.add(job)
+    return job
+
+
+def test_fail_stale_spares_long_running_jobs_with_a_live_heartbeat(app):
+    with app.app_context():
+        _job("live", "Running", timedelta(hours=3), heartbeat_ago=timedelta(seconds=5))
+        _job("dead", "Running", timedelta(hours=3), heartbeat_ago=timedelta(hours=1))
+        _job("orphan", "Queued", timedelta(hours=1))
+        db.session.commit()
+        export_jobs.fail_stale()
+        statuses = {job.id: job.status for job in ExportJob.query}
+    assert statuses == {"live": "Running", "dead": "Failed", "orphan": "Failed"}
+
+
+def test_run_job_skips_a_job_that_was_failed_while_queued(app):
+    with app.app_context():
+        job = _job("late", "Failed", timedelta(hours=1))
+        db.session.commit()
+        export_jobs.run_job(app, "late")
+        db.session.expire_all()
+        job = db.session.get(ExportJob, "late")
+        assert job.status == "Failed" and job.path is None
+
+
+def test_run_job_writes_the_artifact(app):
+    with app.app_context():
+        _job("ok", "Queued", timedelta(seconds=1))
+        db.session.commit()
+        export_jobs.run_job(app, "ok")
+        db.session.expire_all()
+        job = db.session.get(ExportJob, "ok")
+        assert job.status == "Done" and job.heartbeat_at is not None
@@ -0,0 +1,53 @@
+"""Bulk import: a good file goes in, unreadable files are rejected cleanly."""
+import io
+
+import pytest
+
+from app import db, importer
+from app.models import Employee
+
+from conftest import reset_database
+
+
+@pytest.fixture(autouse=True)
+def fresh(app):
+    reset_database(app)
+
+
+def _upload(client, filename, data, dataset="employees"):
+    return client.post(
+        "/import",
+        data={"dataset": dataset, "file": (io.BytesIO(data), filename)},
+        content_type="multipart/form-data",
+    )
+
+
+def test_csv_import_inserts_rows(app, admin_client):
+    response = _upload(admin_client, "people.csv", "Name,Department\nAda,IT\nGrace,Ops\n".encode("utf-8"))
+    assert response.status_code == 200
+    with app.app_context():
+        assert sorted(e.name for e in Employee.query) == ["Ada", "Grace"]
+
+
+def test_non_utf8_csv_is_a_file_error(app):
+    with app.app_context(), pytest.raises(importer.ImportFileError, match="UTF-8"):
+        importer.import_file("employees", io.BytesIO("Name\nJosé\n".encode("latin-1")), "csv")
+
+
+def test_non_utf8_csv_upload_is_rejected(app, admin_client):
+    response = _upload(admin_client, "people.csv", "Name\nJosé\n".encode("latin-1"))
+    assert response.status_code == 302
+    with app.app_context():
+        assert db.session.query(Employee).count() == 0
+
+
+@pytest.mark.skipif(not importer.OPENPYXL_AVAILABLE, reason="openpyxl not installed")
+def test_corrupt_xlsx_is_a_file_error(app):
+    with app.app_context(), pytest.raises(importer.ImportFileError, match="Excel"):
+        importer.import_file("employees", io.BytesIO(b"Name\nAda\n"), "xlsx")
+
+
+@pytest.mark.skipif(not importer.OPENPYXL_AVAILABLE, reason="openpyxl not installed")
+def test_corrupt_xlsx_upload_is_rejected(admin_client):
+    response = _upload(admin_client, "people.xlsx", b"PK\x03\x04 not really a zip")
+    assert response.status_code == 302
@@ -0,0 +1,46 @@
+"""SMTP failures are classified by reply code."""
+import smtplib
+
+import pytest
+
+from app import mailer
+
+
+class FlakyWorker:
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.sent = 0
+
+    def send(self, msg):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent += 1
+
+    def reset(self):
+        pass
+
+
+@pytest.mark.parametrize("error, permanent", [
+    (smtplib.SMTPDataError(451, b"Try again later"), False),
+    (smtplib.SMTPDataError(421, b"Closing connection"), False),
+    (smtplib.SMTPDataError(554, b"Rejected"), True),
+    (smtplib.SMTPSenderRefused(450, b"Mailbox busy", "it@example.com"), False),
+    (smtplib.SMTPSenderRefused(550, b"No such sender", "it@example.com"), True),
+    (smtplib.SMTPRecipientsRefused({"a@example.com": (450, b"Busy")}), False),
+    (smtplib.SMTPRecipientsRefused({"a@example.com": (550, b"Unknown user")}), True),
+    (smtplib.SMTPServerDisconnected("gone"), False),
+])
+def test_is_permanent_follows_the_reply_code(error, permanent):
+    assert mailer.is_permanent(error) is permanent
+
+
+def test_transient_data_error_is_retried():
+    worker = FlakyWorker([smtplib.SMTPDataError(451, b"Try again later")])
+    result = mailer._send_with_retry(worker, object(), retries=2, backoff=0)
+    assert result["status"] == "sent" and result["attempts"] == 2
+
+
+def test_permanent_data_error_is_not_retried():
+    worker = FlakyWorker([smtplib.SMTPDataError(554, b"Rejected")] * 3)
+    result = mailer._send_with_retry(worker, object(), retries=2, backoff=0)
+    assert result["status"] == "failed" and result["attempts"] == 1
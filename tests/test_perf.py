@@ -0,0 +1,39 @@
+"""Server-Timing is opt-in and only ever sent to Admin sessions."""
+import pytest
+
+from app import db
+from app.models import User
+
+from conftest import reset_database
+
+
+@pytest.fixture(autouse=True)
+def fresh(app):
+    reset_database(app)
+    yield
+    app.config["PERF_SERVER_TIMING"] = False
+
+
+def test_no_server_timing_by_default(admin_client):
+    assert "Server-Timing" not in admin_client.get("/admin/dashboard").headers
+
+
+def test_server_timing_for_admins_when_enabled(app, admin_client):
+    app.config["PERF_SERVER_TIMING"] = True
+    assert "queries" in admin_client.get("/admin/dashboard").headers["Server-Timing"]
+
+
+def test_no_server_timing_for_anonymous_or_other_roles(app):
+    app.config["PERF_SERVER_TIMING"] = True
+    client = app.test_client()
+    assert "Server-Timing" not in client.get("/login").headers
+    with app.app_context():
+        user = User(username="it", email="it@example.com", role="IT")
+        user.set_password("password1")
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user_id)
+        session["_fresh"] = True
+    assert "Server-Timing" not in client.get("/it/dashboard").headers
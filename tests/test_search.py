@@ -0,0 +1,39 @@
+"""Asset search paging."""
+import pytest
+
+from app import db
+from app.models import Asset
+from app.search import search_assets
+
+from conftest import reset_database
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seeded(app):
+    reset_database(app)
+    with app.app_context():
+        for n in range(12):
+            db.session.add(Asset(asset_id=f"AST-{n:05d}", asset_type="Laptop", brand="Dell", model="Latitude"))
+        db.session.commit()
+
+
+def test_paging_continues_past_the_ranked_candidates(app):
+    app.config["SEARCH_RANK_CANDIDATES"] = 5
+    try:
+        with app.app_context():
+            seen, page = [], 1
+            while True:
+                results = search_assets("latitude", page=page, per_page=4)
+                seen += [asset.id for asset in results.items]
+                if not results.has_next:
+                    break
+                page += 1
+    finally:
+        app.config["SEARCH_RANK_CANDIDATES"] = 5000
+    assert len(seen) == len(set(seen)) == 12
+
+
+@pytest.mark.parametrize("page", ["99999999999999999999", "-3", "0"])
+def test_search_clamps_out_of_range_pages(admin_client, page):
+    response = admin_client.get(f"/api/search?q=latitude&page={page}")
+    assert response.status_code == 200
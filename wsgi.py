@@ -11,7 +11,7 @@ app = create_app()
 
 if __name__ == "__main__":
     # Start the scheduler in a separate thread
-    scheduler_thread = threading.Thread(target=start_scheduler, daemon=True)
+    scheduler_thread = threading.Thread(target=start_scheduler, args=(app,), daemon=True)
     scheduler_thread.start()
     logger.info("Scheduler thread started")
     
@@ -20,7 +20,7 @@ if __name__ == "__main__":
 else:
     # For production deployment (e.g., Gunicorn)
     # Start the scheduler
-    scheduler = start_scheduler()
+    scheduler = start_scheduler(app)
     if scheduler:
         logger.info("Scheduler started for production")
     else: